@@ -0,0 +1,97 @@
+"""Per-quote latency of the pricing API, against the 20 ms p99 target.
+
+Drives the ASGI app in-process, one single-lead ``POST /quote`` at a time
+on one core, so the figures are the app's own time (JSON parsing,
+normalization, the cache and pricing) without the network::
+
+    python benchmarks/api_latency.py --requests 5000
+
+Every lead is distinct unless ``--repeat`` is given, so by default each
+request misses the cache and is priced.
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from sfd_engine.api import create_app  # noqa: E402
+
+TARGET_P99_MS = 20.0
+
+
+def _lead(index: int) -> bytes:
+    return json.dumps({
+        "system_size_kw": 5 + index % 100 / 10,
+        "cost_per_watt": 3.5,
+        "electric_bill": 150 + index / 100,
+        "loan_term": 25,
+        "loan_apr": 5.99,
+        "dealer_fee": 27.49,
+    }).encode()
+
+
+async def _post(app, path: str, body: bytes) -> int:
+    scope = {
+        "type": "http",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "method": "POST",
+        "scheme": "http",
+        "path": path,
+        "raw_path": path.encode(),
+        "query_string": b"",
+        "root_path": "",
+        "headers": [(b"content-type", b"application/json"), (b"content-length", str(len(body)).encode())],
+        "client": ("127.0.0.1", 0),
+        "server": ("127.0.0.1", 8502),
+    }
+    sent = []
+
+    async def receive():
+        return {"type": "http.request", "body": body, "more_body": False}
+
+    async def send(message):
+        sent.append(message)
+
+    await app(scope, receive, send)
+    return sent[0]["status"]
+
+
+async def measure(requests: int, repeat: bool) -> np.ndarray:
+    app = create_app()
+    bodies = [_lead(0 if repeat else index) for index in range(requests)]
+    await _post(app, "/quote", _lead(-1))  # warm up imports and the program tables
+    elapsed = np.empty(requests)
+    for index, body in enumerate(bodies):
+        start = time.perf_counter()
+        status = await _post(app, "/quote", body)
+        elapsed[index] = time.perf_counter() - start
+        if status != 200:
+            raise RuntimeError(f"request {index} returned {status}")
+    return elapsed * 1000
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--requests", type=int, default=2000, help="quotes to time (default: %(default)s)")
+    parser.add_argument("--repeat", action="store_true", help="send the same lead every time (cache hits)")
+    args = parser.parse_args(argv)
+
+    elapsed = asyncio.run(measure(args.requests, args.repeat))
+    p50, p99 = np.percentile(elapsed, [50, 99])
+    print(f"{args.requests} quotes ({'cache hits' if args.repeat else 'cache misses'}): "
+          f"p50 {p50:.2f} ms, p99 {p99:.2f} ms, max {elapsed.max():.2f} ms")
+    if p99 > TARGET_P99_MS:
+        sys.exit(f"p99 {p99:.2f} ms is over the {TARGET_P99_MS:.0f} ms target")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,69 @@
+import time
+
+import pandas as pd
+import streamlit as st
+
+from sfd_ui.memory import byte_size, live_sessions, process_rss, session_artifacts, shared_resources
+
+# ---------------------------
+# Page & Title Configuration
+# ---------------------------
+st.set_page_config(page_title="Server Metrics", layout="wide")
+st.title("Server Metrics")
+st.button("🔄 Refresh")
+
+
+def mb(n_bytes: float) -> float:
+    return n_bytes / 1024 / 1024
+
+
+current = session_artifacts()
+sessions = sorted(live_sessions(), key=lambda store: store.total_bytes, reverse=True)
+shared_sizes = {name: byte_size(resource, count_shared=True) for name, resource in shared_resources().items()}
+rss = process_rss()
+now = time.time()
+
+col1, col2, col3, col4 = st.columns(4)
+col1.metric("Active Sessions", len(sessions))
+col2.metric("Session Artifacts", f"{mb(sum(store.total_bytes for store in sessions)):,.2f} MB")
+col3.metric("Shared Resources", f"{mb(sum(shared_sizes.values())):,.2f} MB")
+col4.metric("Process RSS", f"{mb(rss):,.0f} MB" if rss is not None else "n/a")
+
+# ---------------------------
+# Per-session memory
+# ---------------------------
+st.subheader("Sessions")
+st.dataframe(
+    pd.DataFrame({
+        "Session": [store.session_id[:8] + (" (this session)" if store is current else "") for store in sessions],
+        "Artifacts": [len(store.sizes()) for store in sessions],
+        "Memory (MB)": [mb(store.total_bytes) for store in sessions],
+        "Budget Used": [store.total_bytes / store.budget for store in sessions],
+        "Hits": [store.hits for store in sessions],
+        "Misses": [store.misses for store in sessions],
+        "Evictions": [store.evictions for store in sessions],
+        "Idle (s)": [now - store.last_active for store in sessions],
+    }).style.format({"Memory (MB)": "{:,.3f}", "Budget Used": "{:.1%}", "Idle (s)": "{:,.0f}"}),
+    use_container_width=True,
+    hide_index=True,
+)
+
+with st.expander("This session's artifacts", expanded=False):
+    st.dataframe(
+        pd.DataFrame(
+            [(key, size / 1024) for key, size in current.sizes().items()],
+            columns=["Artifact", "Size (KB)"],
+        ),
+        use_container_width=True,
+        hide_index=True,
+    )
+
+# ---------------------------
+# Shared, loaded once per process
+# ---------------------------
+st.subheader("Shared Resources")
+st.dataframe(
+    pd.DataFrame([(name, size / 1024) for name, size in shared_sizes.items()], columns=["Resource", "Size (KB)"]),
+    use_container_width=True,
+    hide_index=True,
+)
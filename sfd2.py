@@ -1,8 +1,14 @@
 import streamlit as st
 import pandas as pd
-import numpy as np
-import matplotlib.pyplot as plt
-from numpy_financial import pmt, irr, npv
+from sfd_engine import CASH_FLOW_LABELS, ProposalInputs, load_catalog, payment_factor_table
+from sfd_engine.tariffs import tariff_keys, tariff_label
+from sfd_ui.cache import cached_loan_schedule
+from sfd_ui.charts import annual_cash_flow_chart, cash_flow_waterfall_chart, monthly_cash_flow_chart, payment_comparison_chart
+from sfd_ui.dataflow import recompute_panel, session_model
+from sfd_ui.export import export_bundle_button
+from sfd_ui.financing import financing_panel
+from sfd_ui.risk import risk_panel
+from sfd_ui.sensitivity import sensitivity_panel
 
 # ---------------------------
 # Page & Title Configuration
@@ -29,59 +35,21 @@ lease_eligible = st.sidebar.selectbox("Lease Eligible?", ["yes", "no"])
 incentives_toggle = st.sidebar.selectbox("Incentives Applied?", ["yes", "no"])
 scope_of_work = st.sidebar.text_area("Scope of Work", "Roof, Panel Upgrade")
 include_incentives = st.sidebar.checkbox("Include Incentives in Cash Flow", value=True)
+hourly_production = st.sidebar.checkbox("Savings from Hourly Production", value=False)
+tilt = st.sidebar.number_input("Panel Tilt (°)", value=30.0, min_value=0.0, max_value=90.0, step=1.0)
+azimuth = st.sidebar.number_input("Panel Azimuth (° from north)", value=180.0, min_value=0.0, max_value=360.0, step=5.0)
+tariff = st.sidebar.selectbox("Utility Tariff", tariff_keys(state), format_func=tariff_label)
+utility_escalation = st.sidebar.number_input("Utility Escalation (%/yr)", value=0.0, min_value=0.0, max_value=10.0, step=0.5)
+degradation = st.sidebar.number_input("Panel Degradation (%/yr)", value=0.0, min_value=0.0, max_value=2.0, step=0.1)
 
 # ---------------------------
 # Sidebar: Restricted Loan Program Selection for Solar Finance
 # ---------------------------
 st.sidebar.header("Loan Program (Solar Finance)")
 # Allowed loan options (only these exact options are allowed)
-loan_profiles_list = [
-    # 25-Year options
-    (25, 4.49, 35.99),
-    (25, 4.99, 33.49),
-    (25, 5.99, 27.49),
-    (25, 6.99, 23.49),
-    (25, 7.99, 17.49),
-    (25, 8.99, 13.49),
-    (25, 9.99, 8.99),
-    (25, 10.99, 5.99),
-    (25, 11.99, 0.00),
-    # 20-Year options
-    (20, 4.49, 34.49),
-    (20, 4.99, 31.99),
-    (20, 5.99, 25.99),
-    (20, 6.99, 21.74),
-    (20, 7.49, 20.24),
-    (20, 7.99, 17.24),
-    (20, 8.99, 13.24),
-    (20, 9.99, 9.24),
-    (20, 10.99, 5.99),
-    (20, 11.99, 0.00),
-    # 15-Year options
-    (15, 4.49, 32.99),
-    (15, 4.99, 30.75),
-    # 12-Year option
-    (12, 4.49, 31.75),
-    # 10-Year options
-    (10, 4.49, 27.74),
-    (10, 4.99, 26.24),
-    (10, 5.99, 22.49),
-    (10, 6.99, 18.74),
-    (10, 7.99, 15.49),
-    # 7-Year options
-    (7, 4.49, 23.99),
-    (7, 4.99, 22.99),
-    (7, 5.99, 19.99),
-    (7, 6.99, 16.99),
-    (7, 7.99, 14.24),
-]
-# Create a dictionary with descriptive keys:
-loan_profiles = {
-    f"{t} Years | APR: {a:.2f}% | Dealer Fee: {f:.2f}%": (t, a, f)
-    for (t, a, f) in loan_profiles_list
-}
-selected_loan_key = st.sidebar.selectbox("Select Loan Program", list(loan_profiles.keys()))
-loan_term_sfd, loan_apr_sfd, dealer_fee_sfd = loan_profiles[selected_loan_key]
+catalog = load_catalog()
+selected_loan_key = st.sidebar.selectbox("Select Loan Program", catalog.labels)
+loan_term_sfd, loan_apr_sfd, dealer_fee_sfd = catalog.by_label[selected_loan_key]
 
 # ---------------------------
 # Section 1: Solar Financial Scenarios
@@ -94,11 +62,13 @@ nys_incentive = system_size_kw * 1000 * 0.2
 
 # Fixed loan scenarios for display (these remain unchanged)
 loan_scenarios = [
-    {'Term': 25, 'APR': 0.0499, 'Monthly Factor': 0.00669},
-    {'Term': 15, 'APR': 0.0399, 'Monthly Factor': 0.00769},
-    {'Term': 10, 'APR': 0.0299, 'Monthly Factor': 0.00923}
+    {'Term': 25, 'APR': 0.0499},
+    {'Term': 15, 'APR': 0.0399},
+    {'Term': 10, 'APR': 0.0299}
 ]
+factor_table = payment_factor_table()
 for scenario in loan_scenarios:
+    scenario['Monthly Factor'] = factor_table.factor(scenario['Term'], scenario['APR'] * 100)
     scenario['Loan Amount'] = base_price + roof_cost
     scenario['Monthly Payment'] = round(scenario['Loan Amount'] * scenario['Monthly Factor'], 2)
 
@@ -127,7 +97,7 @@ for loan in loan_scenarios:
     output_summary[f"Loan {loan['Term']}yr Payment"] = f"${loan['Monthly Payment']} /mo"
 
 st.subheader("Customer Inputs")
-st.json({
+customer_inputs = {
     "Customer Name": customer_name,
     "System Size (kW)": system_size_kw,
     "Cost per Watt ($)": cost_per_watt,
@@ -135,7 +105,8 @@ st.json({
     "Roof Cost ($)": roof_cost,
     "Lease Rate": lease_rate,
     "Lease Base": lease_base
-})
+}
+st.json(customer_inputs)
 
 st.subheader("Loan Scenarios")
 st.dataframe(pd.DataFrame(loan_scenarios))
@@ -152,11 +123,7 @@ st.dataframe(pd.DataFrame([output_summary]).T, use_container_width=True)
 st.subheader("Monthly Payment Comparison")
 labels = [f"Loan {l['Term']}yr" for l in loan_scenarios] + ["Lease Y1", "Cash"]
 values = [l['Monthly Payment'] for l in loan_scenarios] + [lease['Year 1 Payment'], 0]
-fig1, ax1 = plt.subplots(figsize=(8, 4))
-ax1.bar(labels, values)
-ax1.set_ylabel("USD / month")
-ax1.set_title("Monthly Payment Comparison")
-st.pyplot(fig1)
+st.altair_chart(payment_comparison_chart(tuple(labels), tuple(values)), use_container_width=True)
 
 # ---------------------------
 # Section 2: Solar Finance Dashboard
@@ -164,118 +131,105 @@ st.pyplot(fig1)
 st.markdown("---")
 st.markdown("## Solar Finance Dashboard")
 
-# Calculate base cost and gross cost using the restricted dealer fee from the dropdown.
-base_cost = cost_per_watt * 1000 * system_size_kw - battery_cost
-# Convert the dealer fee percentage from the dropdown to a decimal.
-gross_cost = base_cost / (1 - (dealer_fee_sfd / 100))
-
-if lease_eligible == "no":
-    capped_size = min(system_size_kw, 8)
-    federal_tax_credit = (((cost_per_watt * 1000 * capped_size) - 0) / (1 - (dealer_fee_sfd / 100))) * 0.3
-else:
-    federal_tax_credit = 0
-
-battery_credit = ((gross_cost + battery_cost) * 0.3) * (0 if incentives_toggle == "yes" else 1)
-ny_solar_credit = (min(5000, (gross_cost + battery_cost) * 0.25) if state == "NY" else 0) * (0 if incentives_toggle == "yes" else 1)
-
-# Use the restricted loan program's values for calculations.
-loan_rate_val = loan_apr_sfd / 100
-loan_amount = gross_cost
-loan_base_val = abs(pmt(loan_rate_val / 11.15, loan_term_sfd * 12, loan_amount))
-loan_adj_val = abs(pmt(loan_rate_val / 11, loan_term_sfd * 12, loan_amount - (battery_credit + ny_solar_credit)))
-
-base_bill = electric_bill * 1.15
-lease_discount_7 = base_bill * (1 - 0.07)
-lease_discount_15 = base_bill * (1 - 0.15)
-
-years = loan_term_sfd
-annual_savings = electric_bill * 12
-monthly_savings = electric_bill
-adjusted_system_cost = gross_cost - (federal_tax_credit + battery_credit + ny_solar_credit if include_incentives else 0)
-cash_flows = [-adjusted_system_cost] + [annual_savings] * years
-monthly_cash_flows = [-adjusted_system_cost] + [monthly_savings] * (years * 12)
-npv_value = npv(0.05, cash_flows)
-roi = (sum(cash_flows[1:]) - adjusted_system_cost) / adjusted_system_cost
-irr_val = irr(cash_flows)
-
-def get_payback(cf):
-    cum = np.cumsum(cf)
-    for i, v in enumerate(cum):
-        if v >= 0:
-            return i
-    return f">{years}"
-
-payback_year = get_payback(cash_flows)
+# Price the proposal using the restricted loan program from the dropdown.
+quote_inputs = ProposalInputs(
+    system_size_kw=system_size_kw,
+    cost_per_watt=cost_per_watt,
+    electric_bill=electric_bill,
+    loan_term=loan_term_sfd,
+    loan_apr=loan_apr_sfd,
+    dealer_fee=dealer_fee_sfd,
+    roof_cost=roof_cost,
+    battery_cost=battery_cost,
+    lease_rate=lease_rate,
+    lease_base=lease_base,
+    state=state,
+    lease_eligible=lease_eligible == "yes",
+    # This dashboard applies the battery/NY credits when "Incentives Applied?" is "no"
+    incentives_applied=incentives_toggle == "no",
+    include_incentives=include_incentives,
+    hourly_production=hourly_production,
+    tilt=tilt,
+    azimuth=azimuth,
+    tariff=tariff,
+    utility_escalation=utility_escalation,
+    degradation=degradation,
+)
+pricing_model = session_model()
+quote = pricing_model.price(quote_inputs)
+schedule = cached_loan_schedule(quote_inputs)
+
+cash_flows = quote.cash_flows
+monthly_cash_flows = quote.monthly_cash_flows
 
 col1, col2, col3 = st.columns(3)
 with col1:
-    st.metric("Gross System Cost", f"${gross_cost:,.0f}")
+    st.metric("Gross System Cost", f"${quote.gross_cost:,.0f}")
     st.metric("Battery Add-on", f"${battery_cost:,.0f}")
     st.metric("State", state)
 with col2:
-    st.metric("Base Loan", f"${loan_base_val:,.0f}/mo")
-    st.metric("Adjusted Loan", f"${loan_adj_val:,.0f}/mo")
-    st.metric("Incentive Applied", f"${battery_credit + ny_solar_credit:,.0f}")
+    st.metric("Base Loan", f"${quote.loan_base_payment:,.0f}/mo")
+    st.metric("Adjusted Loan", f"${quote.loan_adj_payment:,.0f}/mo")
+    st.metric("Incentive Applied", f"${quote.incentive_applied:,.0f}")
 with col3:
-    st.metric("Base Monthly Bill", f"${base_bill:,.0f}")
-    st.metric("7% Discounted", f"${lease_discount_7:,.0f}")
-    st.metric("15% Discounted", f"${lease_discount_15:,.0f}")
+    st.metric("Base Monthly Bill", f"${quote.base_bill:,.0f}")
+    st.metric("7% Discounted", f"${quote.lease_discount_7:,.0f}")
+    st.metric("15% Discounted", f"${quote.lease_discount_15:,.0f}")
 
 st.markdown(f"**Scope of Work:** {scope_of_work}")
-st.metric("ROI", f"{roi:.2%}")
-st.metric("NPV (5% rate)", f"${npv_value:,.0f}")
-st.metric("IRR", f"{irr_val:.2%}")
-st.metric("Payback Period", f"{payback_year} years")
+st.metric("ROI", f"{quote.roi:.2%}")
+st.metric("NPV (5% rate)", f"${quote.npv:,.0f}")
+st.metric("IRR", f"{quote.irr:.2%}")
+st.metric("Payback Period", f"{quote.payback_label} years")
+if quote.production_kwh is not None:
+    st.metric("Year 1 Production", f"{quote.production_kwh[0].sum():,.0f} kWh")
+risk_panel(quote)
+sensitivity_panel(quote_inputs)
+recompute_panel(pricing_model)
+
+st.subheader("Cash vs. Loan vs. Lease")
+financing_panel(quote_inputs)
 
 st.subheader("Cash Flow Over Time")
-fig2, ax2 = plt.subplots()
-ax2.plot(range(0, years + 1), np.cumsum(cash_flows), marker="o")
-ax2.set_title("Cumulative Annual Cash Flow")
-ax2.set_xlabel("Year")
-ax2.set_ylabel("$ Cumulative Savings")
-ax2.grid(True)
-st.pyplot(fig2)
+st.altair_chart(annual_cash_flow_chart(cash_flows), use_container_width=True)
 
 st.subheader("Monthly Cash Flow")
-fig3, ax3 = plt.subplots()
-ax3.plot(range(0, len(monthly_cash_flows)), np.cumsum(monthly_cash_flows), linewidth=1)
-ax3.set_title("Cumulative Monthly Cash Flow")
-ax3.set_xlabel("Month")
-ax3.set_ylabel("$ Cumulative Savings")
-ax3.grid(True)
-st.pyplot(fig3)
+st.altair_chart(monthly_cash_flow_chart(monthly_cash_flows, schedule), use_container_width=True)
 
 st.subheader("Cash Flow Waterfall")
-waterfall_df = pd.DataFrame({
-    "Label": ["Upfront Cost"] + [f"Year {i+1}" for i in range(years)],
-    "Value": [-adjusted_system_cost] + [annual_savings] * years
-})
-fig4, ax4 = plt.subplots()
-cumulative = 0
-for i, row in waterfall_df.iterrows():
-    color = 'green' if row['Value'] > 0 else 'red'
-    ax4.bar(i, row['Value'], bottom=cumulative if row['Value'] < 0 else 0, color=color)
-    cumulative += row['Value']
-ax4.set_title("Waterfall: Cash Flow Components")
-ax4.set_xticks(range(len(waterfall_df)))
-ax4.set_xticklabels(waterfall_df['Label'], rotation=45, ha='right')
-ax4.axhline(0, color='black', linewidth=0.8)
-st.pyplot(fig4)
+waterfall_monthly = st.checkbox("Monthly waterfall", value=False)
+st.altair_chart(cash_flow_waterfall_chart(quote, monthly=waterfall_monthly), use_container_width=True)
 
 st.subheader("Monthly Cash Flow Table")
-monthly_df = pd.DataFrame({
-    "Month": list(range(len(monthly_cash_flows))),
-    "Monthly Cash Flow": monthly_cash_flows,
-    "Cumulative": np.cumsum(monthly_cash_flows)
-})
+monthly_df = quote.cash_flow_table.monthly.rename(columns=CASH_FLOW_LABELS)
 st.dataframe(monthly_df, use_container_width=True)
-st.download_button("📥 Download Monthly CSV", data=monthly_df.to_csv(index=False), file_name="monthly_cash_flow.csv")
 
-annual_df = pd.DataFrame({
-    "Year": list(range(years + 1)),
-    "Annual Cash Flow": cash_flows,
-    "Cumulative": np.cumsum(cash_flows)
+st.subheader("Amortization Schedule")
+amortization_df = schedule.rename(columns={
+    "month": "Month",
+    "payment": "Payment",
+    "principal": "Principal",
+    "interest": "Interest",
+    "balance": "Balance",
+    "cumulative_interest": "Cumulative Interest",
 })
+st.dataframe(amortization_df, use_container_width=True, hide_index=True)
+
+annual_df = quote.cash_flow_table.annual.rename(columns=CASH_FLOW_LABELS)
 st.subheader("Annual Cash Flow Table")
 st.dataframe(annual_df, use_container_width=True)
-st.download_button("📥 Download Annual CSV", data=annual_df.to_csv(index=False), file_name="annual_cash_flow.csv")
+
+# ---------------------------
+# Export: every table in one bundle, built only when downloaded
+# ---------------------------
+st.markdown("### Export Data")
+export_bundle_button({
+    "customer_inputs": pd.DataFrame([customer_inputs]),
+    "loan_scenarios": pd.DataFrame(loan_scenarios),
+    "output_summary": pd.DataFrame(list(output_summary.items()), columns=["Field", "Value"]),
+    "cash_purchase": pd.DataFrame([cash]),
+    "lease_option": pd.DataFrame([lease]),
+    "monthly_cash_flow": monthly_df,
+    "amortization_schedule": amortization_df,
+    "annual_cash_flow": annual_df,
+})
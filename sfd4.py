@@ -1,11 +1,29 @@
 import streamlit as st
 import streamlit.components.v1 as components
 import pandas as pd
-import numpy as np
-import matplotlib.pyplot as plt
-from numpy_financial import pmt, irr, npv
 import datetime
-import textwrap
+from dataclasses import replace
+from functools import partial
+
+from sfd_engine import CASH_FLOW_LABELS, ProposalInputs, load_catalog
+from sfd_engine.proposal import OVERVIEW_HTML, overview_fields
+from sfd_engine.tariffs import tariff_keys, tariff_label
+from sfd_engine.templating import IncrementalRenderer
+from sfd_ui.cache import (
+    cached_investment_overview,
+    cached_loan_schedule,
+    cached_overview_pdf,
+    cached_overview_programs,
+    cached_price_proposal,
+)
+from sfd_ui.charts import annual_cash_flow_chart, cash_flow_waterfall_chart, monthly_cash_flow_chart, payment_comparison_chart
+from sfd_ui.dataflow import recompute_panel, session_model
+from sfd_ui.export import export_bundle_button
+from sfd_ui.financing import financing_panel
+from sfd_ui.finder import program_finder
+from sfd_ui.memory import session_artifact
+from sfd_ui.risk import risk_panel
+from sfd_ui.sensitivity import sensitivity_panel
 
 # ---------------------------
 # Page & Title Configuration
@@ -35,6 +53,12 @@ lease_eligible = st.sidebar.selectbox("Lease Eligible?", ["yes", "no"])
 incentives_toggle = st.sidebar.selectbox("Incentives Applied?", ["yes", "no"])
 scope_of_work = st.sidebar.text_area("Scope of Work", "Roof, Panel Upgrade")
 include_incentives = st.sidebar.checkbox("Include Incentives in Cash Flow", value=True)
+hourly_production = st.sidebar.checkbox("Savings from Hourly Production", value=False)
+tilt = st.sidebar.number_input("Panel Tilt (°)", value=30.0, min_value=0.0, max_value=90.0, step=1.0)
+azimuth = st.sidebar.number_input("Panel Azimuth (° from north)", value=180.0, min_value=0.0, max_value=360.0, step=5.0)
+tariff = st.sidebar.selectbox("Utility Tariff", tariff_keys(state), format_func=tariff_label)
+utility_escalation = st.sidebar.number_input("Utility Escalation (%/yr)", value=0.0, min_value=0.0, max_value=10.0, step=0.5)
+degradation = st.sidebar.number_input("Panel Degradation (%/yr)", value=0.0, min_value=0.0, max_value=2.0, step=0.1)
 
 # Discount slider
 project_discount_pct = st.sidebar.slider("Project Discount (%)", min_value=0, max_value=100, value=0, step=1)
@@ -46,328 +70,124 @@ deferral_option = st.sidebar.checkbox("3-Month Payment Deferral", value=True)
 # Sidebar: Customer Loan Program Selection
 # ---------------------------
 st.sidebar.header("Customer Loan Program")
-loan_profiles_list = [
-    (25, 4.49, 35.99),
-    (25, 4.99, 33.49),
-    (25, 5.99, 27.49),
-    (25, 6.99, 23.49),
-    (25, 7.99, 17.49),
-    (25, 8.99, 13.49),
-    (25, 9.99, 8.99),
-    (25, 10.99, 5.99),
-    (25, 11.99, 0.00),
-    (20, 4.49, 34.49),
-    (20, 4.99, 31.99),
-    (20, 5.99, 25.99),
-    (20, 6.99, 21.74),
-    (20, 7.49, 20.24),
-    (20, 7.99, 17.24),
-    (20, 8.99, 13.24),
-    (20, 9.99, 9.24),
-    (20, 10.99, 5.99),
-    (20, 11.99, 0.00),
-    (15, 4.49, 32.99),
-    (15, 4.99, 30.75),
-    (12, 4.49, 31.75),
-    (10, 4.49, 27.74),
-    (10, 4.99, 26.24),
-    (10, 5.99, 22.49),
-    (10, 6.99, 18.74),
-    (10, 7.99, 15.49),
-    (7, 4.49, 23.99),
-    (7, 4.99, 22.99),
-    (7, 5.99, 19.99),
-    (7, 6.99, 16.99),
-    (7, 7.99, 14.24),
-]
-loan_profiles = {
-    f"{t} Years | APR: {a:.2f}% | Dealer Fee: {f:.2f}%": (t, a, f)
-    for (t, a, f) in loan_profiles_list
-}
-selected_loan_key = st.sidebar.selectbox("Select Customer Loan Program", list(loan_profiles.keys()))
-loan_term_cust, loan_apr_cust, dealer_fee_cust = loan_profiles[selected_loan_key]
+catalog = load_catalog()
+selected_loan_key = st.sidebar.selectbox("Select Customer Loan Program", catalog.labels)
+loan_term_cust, loan_apr_cust, dealer_fee_cust = catalog.by_label[selected_loan_key]
+
+proposal_inputs = ProposalInputs(
+    system_size_kw=system_size_kw,
+    cost_per_watt=cost_per_watt,
+    electric_bill=electric_bill,
+    loan_term=loan_term_cust,
+    loan_apr=loan_apr_cust,
+    dealer_fee=dealer_fee_cust,
+    roof_cost=roof_cost,
+    battery_cost=battery_cost,
+    lease_rate=lease_rate,
+    lease_base=lease_base,
+    state=state,
+    lease_eligible=lease_eligible == "yes",
+    incentives_applied=incentives_toggle == "yes",
+    include_incentives=include_incentives,
+    project_discount_pct=project_discount_pct,
+    hourly_production=hourly_production,
+    tilt=tilt,
+    azimuth=azimuth,
+    tariff=tariff,
+    utility_escalation=utility_escalation,
+    degradation=degradation,
+)
 
 # ---------------------------
-# Create Tabs for Outputs
+# Customer figures: sidebar-only, read by both sections
 # ---------------------------
-tab_customer, tab_company = st.tabs(["Customer Outputs", "Company Facing Data"])
+# Use discounted project cost as loan amount
+quote_cust = cached_price_proposal(proposal_inputs)
+monthly_payment_selected = quote_cust.monthly_payment
+
+# Cash purchase calculation (example)
+cash = {
+    'Total Cost': quote_cust.cash_total_cost,
+    'Monthly Savings': round(electric_bill, 2),
+    'Payback Years': quote_cust.cash_payback_years
+}
+lease = {
+    'Year 1 Payment': quote_cust.lease_payments[0],
+    'Escalation Rate': lease_rate,
+    'Year 2 Payment': quote_cust.lease_payments[1],
+    'Year 3 Payment': quote_cust.lease_payments[2]
+}
+output_summary = {
+    'Prepared For': f"Investment Overview prepared for {customer_name}",
+    'Loan Terms': f"{loan_term_cust} Years | APR: {loan_apr_cust:.2f}% | Dealer Fee: {dealer_fee_cust:.2f}%",
+    'Monthly Payment': f"${monthly_payment_selected:,.2f}",
+    'Cash Total': f"${cash['Total Cost']:.2f}",
+    'Project Discount': f"{project_discount_pct}%"
+}
+customer_inputs = {
+    "Customer Name": customer_name,
+    "System Size (kW)": system_size_kw,
+    "Cost per Watt ($)": cost_per_watt,
+    "Monthly Electric Bill ($)": electric_bill,
+    "Roof Cost ($)": roof_cost,
+    "Lease Rate": lease_rate,
+    "Lease Base": lease_base,
+    "Project Discount (%)": project_discount_pct
+}
+customer_tables = {
+    "customer_inputs": pd.DataFrame([customer_inputs]),
+    "output_summary": pd.DataFrame(list(output_summary.items()), columns=["Field", "Value"]),
+    "cash_purchase": pd.DataFrame([cash]),
+    "lease_option": pd.DataFrame([lease]),
+}
+
 
 # =============================================================================
 # Tab 1: Customer Outputs
 # =============================================================================
-with tab_customer:
+@st.fragment
+def customer_section(customer_name, deferral_option, proposal_inputs, quote_cust, cash, lease, output_summary, customer_inputs):
     st.markdown("### Customer Outputs")
-    # Calculate base project cost and apply project discount
-    base_price = system_size_kw * 1000 * cost_per_watt
-    discounted_project_cost = (base_price + roof_cost) * (1 - project_discount_pct / 100)
-    nys_incentive = system_size_kw * 1000 * 0.2
-
-    # Use discounted project cost as loan amount
-    loan_amount_customer = discounted_project_cost
-    monthly_payment_selected = abs(pmt(loan_apr_cust / 100 / 12, loan_term_cust * 12, loan_amount_customer))
-
-    # Cash purchase calculation (example)
-    cash = {
-        'Total Cost': discounted_project_cost - nys_incentive,
-        'Monthly Savings': round(electric_bill, 2),
-        'Payback Years': round((base_price - nys_incentive) / (electric_bill * 12), 1)
-    }
-    lease = {
-        'Year 1 Payment': lease_base,
-        'Escalation Rate': lease_rate,
-        'Year 2 Payment': round(lease_base * (1 + lease_rate), 2),
-        'Year 3 Payment': round(lease_base * (1 + lease_rate) ** 2, 2)
-    }
-    output_summary = {
-        'Prepared For': f"Investment Overview prepared for {customer_name}",
-        'Loan Terms': f"{loan_term_cust} Years | APR: {loan_apr_cust:.2f}% | Dealer Fee: {dealer_fee_cust:.2f}%",
-        'Monthly Payment': f"${monthly_payment_selected:,.2f}",
-        'Cash Total': f"${cash['Total Cost']:.2f}",
-        'Project Discount': f"{project_discount_pct}%"
-    }
+    monthly_payment_selected = quote_cust.monthly_payment
 
     # ---------------------------
-    # Payment Schedule Calculations (using values from the dropdown)
+    # Investment Overview: the template is precompiled, and only the fields
+    # that changed since this session's last rerun are re-escaped. The whole
+    # block is still sent to the browser on every rerun.
     # ---------------------------
-    current_date_str = datetime.date.today().strftime("%b %d, %Y")
-    system_cost = base_price                # System cost (before discount)
-    spring_discount = roof_cost             # "Spring Discount" value
-    itc_val = system_cost * 0.30             # 30% Federal Tax Credit (ITC)
-    nys_credit_val = 5000                   # State Tax Credit
-    nyc_abatement_val = 34356               # NYC Abatement
-
-    # Calculate loan amounts for each scenario:
-    loan_amount_no_incentives = loan_amount_customer
-    loan_amount_itc = loan_amount_customer - itc_val
-    loan_amount_incentives = loan_amount_customer - (itc_val + nys_credit_val + nyc_abatement_val)
-
-    # Loan parameters from the dropdown:
-    r = loan_apr_cust / 100 / 12            # Monthly interest rate
-    n = loan_term_cust * 12                 # Total number of months
-
-    # If deferral is enabled, compound the principal for 3 months and recalc payment
-    if deferral_option:
-        new_principal_no_incentives = loan_amount_no_incentives * (1 + r) ** 3
-        new_principal_itc = loan_amount_itc * (1 + r) ** 3
-        new_principal_incentives = loan_amount_incentives * (1 + r) ** 3
-        remaining_term = n - 3
-        payment_no_incentives = abs(pmt(r, remaining_term, new_principal_no_incentives))
-        payment_itc = abs(pmt(r, remaining_term, new_principal_itc))
-        payment_incentives = abs(pmt(r, remaining_term, new_principal_incentives))
-    else:
-        payment_no_incentives = abs(pmt(r, n, loan_amount_no_incentives))
-        payment_itc = abs(pmt(r, n, loan_amount_itc))
-        payment_incentives = abs(pmt(r, n, loan_amount_incentives))
-
-    # Breakdown of payments by period:
-    # Months 1-3: if deferral is selected, these are 0; else the standard payment.
-    no_incentives_1_3 = 0 if deferral_option else payment_no_incentives
-    itc_1_3 = 0 if deferral_option else payment_itc
-    itc_nys_nyc_1_3 = 0 if deferral_option else payment_incentives
-
-    # For subsequent periods, we assume the payment is uniform.
-    no_incentives_4_18 = payment_no_incentives
-    no_incentives_y2 = payment_no_incentives
-    no_incentives_y3 = payment_no_incentives
-    no_incentives_y4 = payment_no_incentives
-    no_incentives_y5plus = payment_no_incentives
-
-    itc_4_18 = payment_itc
-    itc_y2 = payment_itc
-    itc_y3 = payment_itc
-    itc_y4 = payment_itc
-    itc_y5plus = payment_itc
-
-    itc_nys_nyc_4_18 = payment_incentives
-    itc_nys_nyc_y2 = payment_incentives
-    itc_nys_nyc_y3 = payment_incentives
-    itc_nys_nyc_y4 = payment_incentives
-    itc_nys_nyc_y5plus = payment_incentives
-
-    total_tax_incentives_val = itc_val + nys_credit_val + nyc_abatement_val
-    net_investment_val = loan_amount_customer - total_tax_incentives_val
-
-    annual_savings = electric_bill * 12
-
-    # Dynamically calculate Total 25-Year Net Savings (example formula)
-    total_25yr_net_savings = annual_savings * 25 - loan_amount_customer
-
-    # ---------------------------
-    # Render PDF-like Output using components.html
-    # ---------------------------
-    html_block = textwrap.dedent(f"""
-    <div style="display: flex; flex-direction: column; font-family: Arial, sans-serif; color: #333;">
-      <!-- Header Section -->
-      <div style="display: flex; justify-content: space-between; margin-bottom: 20px;">
-        <div>
-          <h2 style="margin: 0;">MpowerSOLAR</h2>
-          <p style="margin: 0; font-size: 14px;">
-            Investment Overview prepared for <strong>{customer_name}</strong> on {current_date_str}
-          </p>
-        </div>
-        <div style="text-align: right;">
-          <p style="margin: 0;">Loan Term {loan_term_cust} Years</p>
-          <p style="margin: 0;">AUTOPAY</p>
-          <p style="margin: 0;">APR {loan_apr_cust:.2f}%</p>
-        </div>
-      </div>
-      <div style="display: flex; justify-content: space-between;">
-        <!-- Left Column: Investment Details -->
-        <div style="width: 48%;">
-          <h3>Investment Details</h3>
-          <table style="width: 100%; border-collapse: collapse; font-size: 14px;">
-            <tr>
-              <td colspan="2" style="padding: 4px 0;"><strong>BASIC LOAN INFORMATION</strong></td>
-            </tr>
-            <tr>
-              <td style="padding: 4px 0;">System Cost</td>
-              <td style="padding: 4px 0; text-align: right;">${system_cost:,.0f}</td>
-            </tr>
-            <tr>
-              <td style="padding: 4px 0;">Spring Discount</td>
-              <td style="padding: 4px 0; text-align: right;">${spring_discount:,.0f}</td>
-            </tr>
-            <tr>
-              <td colspan="2" style="padding: 8px 0;"><strong>INCENTIVES</strong></td>
-            </tr>
-            <tr>
-              <td style="padding: 4px 0;">30% Federal Tax Credit (ITC)</td>
-              <td style="padding: 4px 0; text-align: right;">${itc_val:,.0f}</td>
-            </tr>
-            <tr>
-              <td style="padding: 4px 0;">State Tax Credit (NYS)</td>
-              <td style="padding: 4px 0; text-align: right;">${nys_credit_val:,.0f}</td>
-            </tr>
-            <tr>
-              <td style="padding: 4px 0;">Property Tax Abatement (NYC)</td>
-              <td style="padding: 4px 0; text-align: right;">${nyc_abatement_val:,.0f}</td>
-            </tr>
-            <tr>
-              <td colspan="2" style="padding: 8px 0;"><strong>TOTAL INVESTMENT</strong></td>
-            </tr>
-            <tr>
-              <td style="padding: 4px 0;">Total Loan Amount</td>
-              <td style="padding: 4px 0; text-align: right;">${loan_amount_customer:,.0f}</td>
-            </tr>
-            <tr>
-              <td style="padding: 4px 0;">Total Tax Incentives</td>
-              <td style="padding: 4px 0; text-align: right;">${total_tax_incentives_val:,.0f}</td>
-            </tr>
-            <tr>
-              <td style="padding: 4px 0;">Net Investment</td>
-              <td style="padding: 4px 0; text-align: right;">${net_investment_val:,.0f}</td>
-            </tr>
-          </table>
-          <br/>
-          <h4 style="margin-bottom: 8px;">Added Benefits</h4>
-          <ul style="margin-top: 0; font-size: 14px;">
-            <li>No up-front fees</li>
-            <li>No payment for first 3 months</li>
-            <li>Referral Bonus: $1,000</li>
-            <li>Roof repairs, minor electric work &amp; construction included</li>
-          </ul>
-        </div>
-        <!-- Right Column: Savings Overview -->
-        <div style="width: 48%;">
-          <h3>Savings Overview</h3>
-          <table style="width: 100%; border-collapse: collapse; font-size: 14px;">
-            <tr>
-              <td style="padding: 4px 0;">Utility w/o Mpower Solar</td>
-              <td style="padding: 4px 0; text-align: right;">${electric_bill}/mo</td>
-            </tr>
-            <tr>
-              <td style="padding: 4px 0;">Utility w/ Mpower Solar</td>
-              <td style="padding: 4px 0; text-align: right;">$41 per meter</td>
-            </tr>
-            <tr>
-              <td style="padding: 4px 0;">All Incentives Applied After 5 Years</td>
-              <td style="padding: 4px 0; text-align: right;">$250/mo</td>
-            </tr>
-          </table>
-          <br/>
-          <p style="font-weight: bold; margin-bottom: 4px;">Est. Monthly Payment with Incentive Paydown</p>
-          <table style="width: 100%; border-collapse: collapse; text-align: center; font-size: 14px;">
-            <thead>
-              <tr style="background-color: #f0f0f0;">
-                <th></th>
-                <th>Months<br/>1-3</th>
-                <th>Months<br/>4-18</th>
-                <th>Year 2<br/>(M 19-24)</th>
-                <th>Year 3<br/>(M 25-36)</th>
-                <th>Year 4<br/>(M 37-48)</th>
-                <th>Year 5+<br/>(M 49+)</th>
-              </tr>
-            </thead>
-            <tbody>
-              <tr>
-                <td>No Incentives</td>
-                <td>${no_incentives_1_3:,.0f}</td>
-                <td>${no_incentives_4_18:,.0f}</td>
-                <td>${no_incentives_y2:,.0f}</td>
-                <td>${no_incentives_y3:,.0f}</td>
-                <td>${no_incentives_y4:,.0f}</td>
-                <td>${no_incentives_y5plus:,.0f}</td>
-              </tr>
-              <tr>
-                <td>ITC</td>
-                <td>${itc_1_3:,.0f}</td>
-                <td>${itc_4_18:,.0f}</td>
-                <td>${itc_y2:,.0f}</td>
-                <td>${itc_y3:,.0f}</td>
-                <td>${itc_y4:,.0f}</td>
-                <td>${itc_y5plus:,.0f}</td>
-              </tr>
-              <tr>
-                <td>ITC + NYS + NYC</td>
-                <td>${itc_nys_nyc_1_3:,.0f}</td>
-                <td>${itc_nys_nyc_4_18:,.0f}</td>
-                <td>${itc_nys_nyc_y2:,.0f}</td>
-                <td>${itc_nys_nyc_y3:,.0f}</td>
-                <td>${itc_nys_nyc_y4:,.0f}</td>
-                <td>${itc_nys_nyc_y5plus:,.0f}</td>
-              </tr>
-            </tbody>
-          </table>
-          <br/>
-          <h4 style="margin-bottom: 4px;">TOTAL 25-YEAR NET SAVINGS</h4>
-          <h2 style="margin-top: 0;">${total_25yr_net_savings:,.0f}</h2>
-          <p style="font-size: 12px;">
-            This proposal expires 15 days from the date generated unless otherwise stipulated by Mpower Solar
-          </p>
-        </div>
-      </div>
-      <br/>
-      <p style="font-size: 12px; line-height: 1.4;">
-        1 Not everyone is qualified for credits, incentives, or rebates. Please consult your tax professional or legal professional for further information.
-        <br/>
-        2 The timing for receipt of the NYC Tax Credit may vary. While we assist with submissions, we cannot guarantee specific timelines; consult your tax advisor for details.
-        <br/>
-        3 The above payment is based on receipt of your timely Incentive Payments and successful enrollment in Autopay/ACH payments as stated in the loan agreement.
-        <br/>
-        4 A minimum of Two Thousand Five Hundred Dollars ($2,500) is required for loan re-amortization or principal pay-down after month 18.
-        <br/>
-        5 The projected total 25-year net savings assumes a 4% annual utility escalator.
-      </p>
-    </div>
-    """).strip()
+    proposal_date = datetime.date.today()
+    overview = cached_investment_overview(proposal_inputs, deferral=deferral_option)
+    renderer = session_artifact("overview_renderer", lambda: IncrementalRenderer(OVERVIEW_HTML))
+    html_block = renderer.render(
+        overview_fields(proposal_inputs, overview, customer_name, proposal_date)
+    )
 
     # Render the HTML content in an iframe
     components.html(html_block, height=800)
 
+    st.download_button(
+        "📄 Download Investment Overview PDF",
+        # Rendered only when clicked, not on every rerun
+        data=partial(cached_overview_pdf, proposal_inputs, customer_name, proposal_date, deferral=deferral_option),
+        file_name=f"investment_overview_{customer_name.strip().replace(' ', '_') or 'customer'}.pdf",
+        mime="application/pdf",
+        on_click="ignore",
+        key="overview_pdf",
+    )
+
+    with st.expander("Incentive Paydown Payments for All Loan Programs"):
+        st.dataframe(
+            cached_overview_programs(proposal_inputs, catalog.programs, deferral=deferral_option),
+            use_container_width=True,
+        )
+
     # ---------------------------
     # Additional Outputs
     # ---------------------------
+    program_finder(proposal_inputs, catalog.programs)
+
     st.subheader("Customer Inputs")
-    st.json({
-        "Customer Name": customer_name,
-        "System Size (kW)": system_size_kw,
-        "Cost per Watt ($)": cost_per_watt,
-        "Monthly Electric Bill ($)": electric_bill,
-        "Roof Cost ($)": roof_cost,
-        "Lease Rate": lease_rate,
-        "Lease Base": lease_base,
-        "Project Discount (%)": project_discount_pct
-    })
+    st.json(customer_inputs)
 
     st.subheader("Output Summary")
     st.dataframe(pd.DataFrame([output_summary]).T, use_container_width=True)
@@ -381,180 +201,106 @@ with tab_customer:
     st.subheader("Monthly Payment Comparison")
     labels = ["Selected Loan Payment", "Lease Y1", "Cash"]
     values = [monthly_payment_selected, lease['Year 1 Payment'], 0]
-    fig_cust, ax_cust = plt.subplots(figsize=(8, 4))
-    ax_cust.bar(labels, values)
-    ax_cust.set_ylabel("USD / month")
-    ax_cust.set_title("Monthly Payment Comparison")
-    st.pyplot(fig_cust)
+    st.altair_chart(payment_comparison_chart(tuple(labels), tuple(values)), use_container_width=True)
+
+    st.subheader("Cash vs. Loan vs. Lease")
+    financing_panel(proposal_inputs)
 
-    st.markdown("### Export Data")
-    csv_output_summary = pd.DataFrame([output_summary]).T.to_csv(index=True)
-    st.download_button("📥 Download Output Summary CSV", data=csv_output_summary, file_name="output_summary.csv")
-    csv_cash = pd.DataFrame([cash]).to_csv(index=False)
-    st.download_button("📥 Download Cash Purchase CSV", data=csv_cash, file_name="cash_purchase.csv")
-    csv_lease = pd.DataFrame([lease]).to_csv(index=False)
-    st.download_button("📥 Download Lease Option CSV", data=csv_lease, file_name="lease_option.csv")
 
 # =============================================================================
 # Tab 2: Company Facing Data
 # =============================================================================
-with tab_company:
+@st.fragment
+def company_section(proposal_inputs, scope_of_work, customer_tables):
     st.markdown("### Company Facing Data")
-    loan_profiles_list_comp = [
-        (25, 4.49, 35.99),
-        (25, 4.99, 33.49),
-        (25, 5.99, 27.49),
-        (25, 6.99, 23.49),
-        (25, 7.99, 17.49),
-        (25, 8.99, 13.49),
-        (25, 9.99, 8.99),
-        (25, 10.99, 5.99),
-        (25, 11.99, 0.00),
-        (20, 4.49, 34.49),
-        (20, 4.99, 31.99),
-        (20, 5.99, 25.99),
-        (20, 6.99, 21.74),
-        (20, 7.49, 20.24),
-        (20, 7.99, 17.24),
-        (20, 8.99, 13.24),
-        (20, 9.99, 9.24),
-        (20, 10.99, 5.99),
-        (20, 11.99, 0.00),
-        (15, 4.49, 32.99),
-        (15, 4.99, 30.75),
-        (12, 4.49, 31.75),
-        (10, 4.49, 27.74),
-        (10, 4.99, 26.24),
-        (10, 5.99, 22.49),
-        (10, 6.99, 18.74),
-        (10, 7.99, 15.49),
-        (7, 4.49, 23.99),
-        (7, 4.99, 22.99),
-        (7, 5.99, 19.99),
-        (7, 6.99, 16.99),
-        (7, 7.99, 14.24),
-    ]
-    loan_profiles_comp = {
-        f"{t} Years | APR: {a:.2f}% | Dealer Fee: {f:.2f}%": (t, a, f)
-        for (t, a, f) in loan_profiles_list_comp
-    }
-    selected_loan_key_comp = st.selectbox("Select Company Loan Program", list(loan_profiles_comp.keys()))
-    loan_term_comp, loan_apr_comp, dealer_fee_comp = loan_profiles_comp[selected_loan_key_comp]
+    selected_loan_key_comp = st.selectbox("Select Company Loan Program", catalog.labels, key="company_program")
+    loan_term_comp, loan_apr_comp, dealer_fee_comp = catalog.by_label[selected_loan_key_comp]
     
-    base_cost = cost_per_watt * 1000 * system_size_kw - battery_cost
-    discounted_base_cost = base_cost * (1 - project_discount_pct / 100)
-    gross_cost = base_cost / (1 - (dealer_fee_comp / 100))
-    discounted_gross_cost = gross_cost * (1 - project_discount_pct / 100)
-    
-    company_revenue = discounted_gross_cost - discounted_base_cost
-
-    if lease_eligible == "no":
-        capped_size = min(system_size_kw, 8)
-        federal_tax_credit = (((cost_per_watt * 1000 * capped_size) - 0) / (1 - (dealer_fee_comp / 100))) * 0.3
-    else:
-        federal_tax_credit = 0
-
-    battery_credit = ((gross_cost + battery_cost) * 0.3) * (1 if incentives_toggle == "yes" else 0)
-    ny_solar_credit = (min(5000, (gross_cost + battery_cost) * 0.25) if state == "NY" else 0) * (1 if incentives_toggle == "yes" else 0)
-    
-    loan_rate_val = loan_apr_comp / 100
-    loan_amount = gross_cost
-    loan_base_val = abs(pmt(loan_rate_val / 11.15, loan_term_comp * 12, loan_amount))
-    loan_adj_val = abs(pmt(loan_rate_val / 11, loan_term_comp * 12, loan_amount - (battery_credit + ny_solar_credit)))
-    
-    base_bill = electric_bill * 1.15
-    lease_discount_7 = base_bill * (1 - 0.07)
-    lease_discount_15 = base_bill * (1 - 0.15)
-    
-    years = loan_term_comp
-    annual_savings = electric_bill * 12
-    monthly_savings = electric_bill
-    adjusted_system_cost = gross_cost - (federal_tax_credit + battery_credit + ny_solar_credit if include_incentives else 0)
-    cash_flows = [-adjusted_system_cost] + [annual_savings] * years
-    monthly_cash_flows = [-adjusted_system_cost] + [monthly_savings] * (years * 12)
-    npv_value = npv(0.05, cash_flows)
-    roi = (sum(cash_flows[1:]) - adjusted_system_cost) / adjusted_system_cost
-    irr_val = irr(cash_flows)
-    
-    def get_payback(cf):
-        cum = np.cumsum(cf)
-        for i, v in enumerate(cum):
-            if v >= 0:
-                return i
-        return f">{years}"
-    payback_year = get_payback(cash_flows)
+    quote_inputs = replace(
+        proposal_inputs,
+        loan_term=loan_term_comp,
+        loan_apr=loan_apr_comp,
+        dealer_fee=dealer_fee_comp,
+    )
+    pricing_model = session_model()
+    quote = pricing_model.price(quote_inputs)
+    schedule = cached_loan_schedule(quote_inputs)
+    cash_flows = quote.cash_flows
+    monthly_cash_flows = quote.monthly_cash_flows
     
     col1, col2, col3, col4 = st.columns(4)
     with col1:
-        st.metric("Gross System Cost", f"${gross_cost:,.0f}")
-        st.metric("Battery Add-on", f"${battery_cost:,.0f}")
-        st.metric("State", state)
+        st.metric("Gross System Cost", f"${quote.gross_cost:,.0f}")
+        st.metric("Battery Add-on", f"${proposal_inputs.battery_cost:,.0f}")
+        st.metric("State", proposal_inputs.state)
     with col2:
-        st.metric("Base Loan", f"${loan_base_val:,.0f}/mo")
-        st.metric("Adjusted Loan", f"${loan_adj_val:,.0f}/mo")
-        st.metric("Incentive Applied", f"${battery_credit + ny_solar_credit:,.0f}")
+        st.metric("Base Loan", f"${quote.loan_base_payment:,.0f}/mo")
+        st.metric("Adjusted Loan", f"${quote.loan_adj_payment:,.0f}/mo")
+        st.metric("Incentive Applied", f"${quote.incentive_applied:,.0f}")
     with col3:
-        st.metric("Base Monthly Bill", f"${base_bill:,.0f}")
-        st.metric("7% Discounted", f"${lease_discount_7:,.0f}")
-        st.metric("15% Discounted", f"${lease_discount_15:,.0f}")
+        st.metric("Base Monthly Bill", f"${quote.base_bill:,.0f}")
+        st.metric("7% Discounted", f"${quote.lease_discount_7:,.0f}")
+        st.metric("15% Discounted", f"${quote.lease_discount_15:,.0f}")
     with col4:
-        st.metric("Revenue", f"${company_revenue:,.0f}")
+        st.metric("Revenue", f"${quote.company_revenue:,.0f}")
     
     st.markdown(f"**Scope of Work:** {scope_of_work}")
-    st.metric("ROI", f"{roi:.2%}")
-    st.metric("NPV (5% rate)", f"${npv_value:,.0f}")
-    st.metric("IRR", f"{irr_val:.2%}")
-    st.metric("Payback Period", f"{payback_year} years")
+    st.metric("ROI", f"{quote.roi:.2%}")
+    st.metric("NPV (5% rate)", f"${quote.npv:,.0f}")
+    st.metric("IRR", f"{quote.irr:.2%}")
+    st.metric("Payback Period", f"{quote.payback_label} years")
+    if quote.production_kwh is not None:
+        st.metric("Year 1 Production", f"{quote.production_kwh[0].sum():,.0f} kWh")
+    risk_panel(quote)
+    sensitivity_panel(quote_inputs)
+    recompute_panel(pricing_model)
     
     st.subheader("Cash Flow Over Time")
-    fig2, ax2 = plt.subplots()
-    ax2.plot(range(0, years + 1), np.cumsum(cash_flows), marker="o")
-    ax2.set_title("Cumulative Annual Cash Flow")
-    ax2.set_xlabel("Year")
-    ax2.set_ylabel("$ Cumulative Savings")
-    ax2.grid(True)
-    st.pyplot(fig2)
+    st.altair_chart(annual_cash_flow_chart(cash_flows), use_container_width=True)
     
     st.subheader("Monthly Cash Flow")
-    fig3, ax3 = plt.subplots()
-    ax3.plot(range(0, len(monthly_cash_flows)), np.cumsum(monthly_cash_flows), linewidth=1)
-    ax3.set_title("Cumulative Monthly Cash Flow")
-    ax3.set_xlabel("Month")
-    ax3.set_ylabel("$ Cumulative Savings")
-    ax3.grid(True)
-    st.pyplot(fig3)
+    st.altair_chart(monthly_cash_flow_chart(monthly_cash_flows, schedule), use_container_width=True)
     
     st.subheader("Cash Flow Waterfall")
-    waterfall_df = pd.DataFrame({
-        "Label": ["Upfront Cost"] + [f"Year {i+1}" for i in range(years)],
-        "Value": [-adjusted_system_cost] + [annual_savings] * years
-    })
-    fig4, ax4 = plt.subplots()
-    cumulative = 0
-    for i, row in waterfall_df.iterrows():
-        color = 'green' if row['Value'] > 0 else 'red'
-        ax4.bar(i, row['Value'], bottom=cumulative if row['Value'] < 0 else 0, color=color)
-        cumulative += row['Value']
-    ax4.set_title("Waterfall: Cash Flow Components")
-    ax4.set_xticks(range(len(waterfall_df)))
-    ax4.set_xticklabels(waterfall_df['Label'], rotation=45, ha='right')
-    ax4.axhline(0, color='black', linewidth=0.8)
-    st.pyplot(fig4)
+    waterfall_monthly = st.checkbox("Monthly waterfall", value=False, key="waterfall_monthly")
+    st.altair_chart(cash_flow_waterfall_chart(quote, monthly=waterfall_monthly), use_container_width=True)
     
     st.subheader("Monthly Cash Flow Table")
-    monthly_df = pd.DataFrame({
-        "Month": list(range(len(monthly_cash_flows))),
-        "Monthly Cash Flow": monthly_cash_flows,
-        "Cumulative": np.cumsum(monthly_cash_flows)
-    })
+    monthly_df = quote.cash_flow_table.monthly.rename(columns=CASH_FLOW_LABELS)
     st.dataframe(monthly_df, use_container_width=True)
-    st.download_button("📥 Download Monthly CSV", data=monthly_df.to_csv(index=False), file_name="monthly_cash_flow.csv")
     
-    annual_df = pd.DataFrame({
-        "Year": list(range(years + 1)),
-        "Annual Cash Flow": cash_flows,
-        "Cumulative": np.cumsum(cash_flows)
+    st.subheader("Amortization Schedule")
+    amortization_df = schedule.rename(columns={
+        "month": "Month",
+        "payment": "Payment",
+        "principal": "Principal",
+        "interest": "Interest",
+        "balance": "Balance",
+        "cumulative_interest": "Cumulative Interest",
     })
+    st.dataframe(amortization_df, use_container_width=True, hide_index=True)
+    
+    annual_df = quote.cash_flow_table.annual.rename(columns=CASH_FLOW_LABELS)
     st.subheader("Annual Cash Flow Table")
     st.dataframe(annual_df, use_container_width=True)
-    st.download_button("📥 Download Annual CSV", data=annual_df.to_csv(index=False), file_name="annual_cash_flow.csv")
+
+    # The bundle includes the company program's tables, so it lives in this section
+    st.markdown("### Export Data")
+    export_bundle_button({
+        **customer_tables,
+        "monthly_cash_flow": monthly_df,
+        "amortization_schedule": amortization_df,
+        "annual_cash_flow": annual_df,
+    })
+
+
+# ---------------------------
+# Create Tabs for Outputs: each tab body is an st.fragment, so a widget inside a tab
+# reruns only that tab. A section takes everything it uses as parameters, never page
+# globals that the other section's widgets could change.
+# ---------------------------
+tab_customer, tab_company = st.tabs(["Customer Outputs", "Company Facing Data"])
+with tab_customer:
+    customer_section(customer_name, deferral_option, proposal_inputs, quote_cust, cash, lease, output_summary, customer_inputs)
+with tab_company:
+    company_section(proposal_inputs, scope_of_work, customer_tables)
@@ -0,0 +1,97 @@
+"""Pure-Python pricing engine behind the Solar Finance dashboards."""
+from .amortization import AMORTIZATION_COLUMNS, amortization_schedule, amortize, loan_schedule, program_schedules
+from .batch import BATCH_COLUMNS, overview_programs, price_batch, price_programs
+from .cashflows import CASH_FLOW_COLUMNS, CASH_FLOW_LABELS, UTILITY_ESCALATION, CashFlowTable, cash_flow_columns
+from .comparison import FINANCING_OPTIONS, FinancingComparison, compare_financing
+from .dataflow import Dataflow, Evaluator, NodeTiming
+from .factors import PaymentFactorTable, deferred_payment_factor, payment_factor_table
+from .finance import get_payback, irr, npv, payment
+from .montecarlo import PERCENTILES, RiskAssumptions, RiskResult, simulate_risk
+from .optimize import DISCOUNT_RANGE, SEARCH_COLUMNS, pareto_mask, search_programs
+from .pricing import (
+    NPV_RATE,
+    NYC_ABATEMENT,
+    NYS_CREDIT,
+    PROPOSAL_FLOW,
+    InvestmentOverview,
+    ProposalInputs,
+    ProposalModel,
+    ProposalResult,
+    investment_overview,
+    loan_amount,
+    price_proposal,
+)
+from .programs import LOAN_PROFILES, ProgramCatalog, fee_band, load_catalog, program_label, read_catalog
+from .reamortization import (
+    MIN_PAYDOWN,
+    OVERVIEW_PERIOD_LABELS,
+    OVERVIEW_SCENARIOS,
+    incentive_paydown_payments,
+    simulate_loan,
+)
+from .sensitivity import SENSITIVITY_LABELS, SENSITIVITY_METRICS, SENSITIVITY_RANGES, sensitivity_grid, tornado
+
+__all__ = [
+    "AMORTIZATION_COLUMNS",
+    "BATCH_COLUMNS",
+    "CASH_FLOW_COLUMNS",
+    "CASH_FLOW_LABELS",
+    "DISCOUNT_RANGE",
+    "FINANCING_OPTIONS",
+    "LOAN_PROFILES",
+    "MIN_PAYDOWN",
+    "NPV_RATE",
+    "NYC_ABATEMENT",
+    "NYS_CREDIT",
+    "OVERVIEW_PERIOD_LABELS",
+    "OVERVIEW_SCENARIOS",
+    "PERCENTILES",
+    "PROPOSAL_FLOW",
+    "SEARCH_COLUMNS",
+    "SENSITIVITY_LABELS",
+    "SENSITIVITY_METRICS",
+    "SENSITIVITY_RANGES",
+    "UTILITY_ESCALATION",
+    "CashFlowTable",
+    "Dataflow",
+    "Evaluator",
+    "FinancingComparison",
+    "InvestmentOverview",
+    "NodeTiming",
+    "PaymentFactorTable",
+    "ProgramCatalog",
+    "ProposalInputs",
+    "ProposalModel",
+    "ProposalResult",
+    "RiskAssumptions",
+    "RiskResult",
+    "amortization_schedule",
+    "amortize",
+    "cash_flow_columns",
+    "compare_financing",
+    "deferred_payment_factor",
+    "fee_band",
+    "get_payback",
+    "incentive_paydown_payments",
+    "investment_overview",
+    "irr",
+    "load_catalog",
+    "loan_amount",
+    "loan_schedule",
+    "npv",
+    "overview_programs",
+    "pareto_mask",
+    "payment",
+    "payment_factor_table",
+    "price_batch",
+    "price_programs",
+    "price_proposal",
+    "program_label",
+    "program_schedules",
+    "read_catalog",
+    "search_programs",
+    "sensitivity_grid",
+    "simulate_loan",
+    "simulate_risk",
+    "tornado",
+]
@@ -0,0 +1,78 @@
+"""Month-by-month loan amortization.
+
+The balance after ``k`` level payments has a closed form,
+``B_k = P (1 + r)**k - A ((1 + r)**k - 1) / r``, so the whole schedule is
+built from one power series per loan rather than a month-by-month loop, and
+every loan program can be amortized in the same array operation.
+"""
+from __future__ import annotations
+
+import numpy as np
+import pandas as pd
+
+from .finance import payment
+from .pricing import ProposalInputs, loan_amount
+from .programs import LOAN_PROFILES, program_label
+
+# Columns of an amortization schedule, in display order.
+AMORTIZATION_COLUMNS = ("month", "payment", "principal", "interest", "balance", "cumulative_interest")
+
+
+def amortize(principal, rate, nper) -> dict[str, np.ndarray]:
+    """Amortization arrays for every loan in the broadcast arguments.
+
+    ``rate`` is the periodic rate and ``nper`` the number of payments, as in
+    :func:`~sfd_engine.finance.payment`. Each returned array has the
+    broadcast shape plus a trailing month axis of length ``max(nper)``;
+    months after a loan's own term are zero.
+    """
+    principal, rate, nper = (
+        a.astype(float) for a in np.broadcast_arrays(*(np.asarray(x) for x in (principal, rate, nper)))
+    )
+    months = np.arange(1, int(nper.max(initial=0)) + 1)
+    level = np.asarray(payment(rate, nper, principal))[..., None]
+    principal, rate, nper = principal[..., None], rate[..., None], nper[..., None]
+
+    growth = (1 + rate) ** months
+    with np.errstate(divide="ignore", invalid="ignore"):
+        balance = np.where(rate == 0, principal - level * months, principal * growth - level * (growth - 1) / rate)
+    balance = np.where(months >= nper, 0.0, balance)  # no rounding residue after the last payment
+    opening = np.concatenate([principal, balance[..., :-1]], axis=-1)
+    interest = opening * rate
+    active = months <= nper
+    interest = np.where(active, interest, 0.0)
+    return {
+        "month": np.broadcast_to(months, balance.shape),
+        "payment": np.where(active, level, 0.0),
+        "principal": np.where(active, opening - balance, 0.0),
+        "interest": interest,
+        "balance": balance,
+        "cumulative_interest": np.cumsum(interest, axis=-1),
+    }
+
+
+def amortization_schedule(principal: float, rate: float, nper: int) -> pd.DataFrame:
+    """Amortization schedule of one loan, one row per payment."""
+    return pd.DataFrame(amortize(principal, rate, nper), columns=list(AMORTIZATION_COLUMNS))
+
+
+def loan_schedule(inputs: ProposalInputs) -> pd.DataFrame:
+    """Schedule of the customer loan behind ``ProposalResult.monthly_payment``."""
+    return amortization_schedule(loan_amount(inputs), inputs.loan_apr / 100 / 12, inputs.loan_term * 12)
+
+
+def program_schedules(
+    inputs: ProposalInputs, programs: list[tuple[int, float, float]] = LOAN_PROFILES
+) -> pd.DataFrame:
+    """Customer loan schedules for every program in one pass.
+
+    Rows are indexed by ``(program, month)``; each program has as many rows
+    as its term has months.
+    """
+    terms, aprs = (np.array(col) for col in list(zip(*programs))[:2])
+    columns = amortize(loan_amount(inputs), aprs / 100 / 12, terms * 12)
+    active = columns["month"] <= (terms * 12)[:, None]
+    labels = np.broadcast_to(np.array([program_label(*p) for p in programs], dtype=object)[:, None], active.shape)
+    frame = pd.DataFrame({name: columns[name][active] for name in AMORTIZATION_COLUMNS})
+    frame.index = pd.MultiIndex.from_arrays([labels[active], frame.pop("month")], names=["program", "month"])
+    return frame
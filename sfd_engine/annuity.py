@@ -0,0 +1,178 @@
+"""Closed-form annuity math: present value, IRR and payback.
+
+Every cash-flow series the dashboards build is an up-front cost followed by
+a level (or geometrically escalating) stream of savings. For that shape the
+NPV is a closed-form annuity factor, the IRR is the root of a monotone
+one-dimensional function, and payback is a logarithm, so none of them need
+``numpy_financial.irr``'s polynomial root solve or a cumulative-sum loop.
+All functions broadcast over NumPy arrays of proposals.
+
+An escalating annuity paying ``1, g, g**2, ...`` discounted at ``r`` equals
+``1/g`` times a level annuity at ``(1 + r) / g - 1``; the functions below
+use that identity to reduce the escalating case to the level one.
+"""
+from __future__ import annotations
+
+import math
+
+import numpy as np
+
+_NEWTON_STEPS = 50
+_BISECT_STEPS = 200
+_TOL = 1e-12
+_SMALL_RATE = 1e-7
+
+
+def _level_factor(rate, n):
+    """Level annuity factor ``sum((1 + rate) ** -t for t in 1..n)`` and its slope."""
+    with np.errstate(divide="ignore", invalid="ignore", over="ignore"):
+        v = (1 + rate) ** -n
+        factor = np.where(np.abs(rate) < _SMALL_RATE, n - n * (n + 1) / 2 * rate, (1 - v) / rate)
+        slope = np.where(
+            np.abs(rate) < _SMALL_RATE,
+            -n * (n + 1) / 2 + n * (n + 1) * (n + 2) / 3 * rate,
+            (n * v / (1 + rate) - factor) / rate,
+        )
+    return factor, slope
+
+
+def _level_factor_scalar(rate: float, n: float) -> tuple[float, float]:
+    """Pure-float :func:`_level_factor`; NumPy overhead dominates for one proposal."""
+    if abs(rate) < _SMALL_RATE:
+        return n - n * (n + 1) / 2 * rate, -n * (n + 1) / 2 + n * (n + 1) * (n + 2) / 3 * rate
+    v = (1 + rate) ** -n
+    factor = (1 - v) / rate
+    return factor, (n * v / (1 + rate) - factor) / rate
+
+
+def annuity_factor(rate, n, growth=0.0):
+    """Present value at ``rate`` of ``n`` end-of-period payments ``1, g, g**2, ...``.
+
+    ``g = 1 + growth``. With ``growth=0`` this is the textbook
+    ``(1 - (1 + rate) ** -n) / rate``.
+    """
+    rate, n, growth = (np.asarray(a, dtype=float) for a in (rate, n, growth))
+    g = 1 + growth
+    factor, _ = _level_factor((1 + rate) / g - 1, n)
+    result = factor / g
+    return result if result.ndim else float(result)
+
+
+def _solve_level(k, n):
+    """Rate ``r`` with ``level annuity factor(r, n) == k``, elementwise."""
+    k, n = (a.astype(float) for a in np.broadcast_arrays(k, n))
+    with np.errstate(all="ignore"):
+        # Seed from the geometric-mean approximation, then Newton; the factor
+        # is convex and decreasing in r, so Newton converges quickly from here.
+        rate = (n / k) ** (2 / (n + 1)) - 1
+        for _ in range(_NEWTON_STEPS):
+            factor, slope = _level_factor(rate, n)
+            step = (factor - k) / slope
+            rate = rate - step
+            if np.all(np.abs(step) <= _TOL * np.maximum(1, np.abs(rate))):
+                break
+        factor, _ = _level_factor(rate, n)
+        bad = ~np.isfinite(rate) | (rate <= -1) | ~(np.abs(factor - k) <= 1e-9 * k)
+    if bad.any():
+        rate[bad] = _bisect_level(k[bad], n[bad])
+    return rate
+
+
+def _bisect_level(k, n):
+    """Bracketed fallback for :func:`_solve_level`; NaN where no root is bracketed."""
+    lo = np.full_like(k, -1 + 1e-9)
+    hi = np.maximum(10.0, 2 / k)
+    with np.errstate(all="ignore"):
+        ok = _level_factor(lo, n)[0] >= k
+        for _ in range(_BISECT_STEPS):
+            mid = (lo + hi) / 2
+            above = _level_factor(mid, n)[0] > k
+            lo = np.where(above, mid, lo)
+            hi = np.where(above, hi, mid)
+    return np.where(ok, (lo + hi) / 2, np.nan)
+
+
+def _annuity_irr_scalar(cost: float, payment: float, n: float, growth: float) -> float:
+    if cost < 0 and payment < 0:
+        cost, payment = -cost, -payment
+    if not (cost > 0 and payment > 0 and n > 0):
+        return math.nan
+    g = 1 + growth
+    k = cost * g / payment
+    rate = (n / k) ** (2 / (n + 1)) - 1
+    try:
+        for _ in range(_NEWTON_STEPS):
+            factor, slope = _level_factor_scalar(rate, n)
+            step = (factor - k) / slope
+            rate -= step
+            if abs(step) <= _TOL * max(1.0, abs(rate)):
+                break
+        ok = rate > -1 and abs(_level_factor_scalar(rate, n)[0] - k) <= 1e-9 * k
+    except (ArithmeticError, TypeError):  # overflow, or a complex power below -100%
+        ok = False
+    if not ok:
+        rate = float(_bisect_level(np.array([k]), np.array([n]))[0])
+    return (1 + rate) * g - 1
+
+
+def annuity_irr(cost, payment, n, growth=0.0):
+    """IRR of ``[-cost, payment, payment * g, ..., payment * g**(n-1)]``.
+
+    Matches ``numpy_financial.irr`` on the same series: NaN unless ``cost``
+    and ``payment`` have the same sign (no sign change in the series, no IRR).
+    """
+    if np.ndim(cost) == np.ndim(payment) == np.ndim(n) == np.ndim(growth) == 0:
+        return _annuity_irr_scalar(float(cost), float(payment), float(n), float(growth))
+    cost, payment, n, growth = (
+        a.astype(float) for a in np.broadcast_arrays(*(np.asarray(x) for x in (cost, payment, n, growth)))
+    )
+    # Negating every cash flow leaves the IRR unchanged
+    flip = (cost < 0) & (payment < 0)
+    cost, payment = np.where(flip, -cost, cost), np.where(flip, -payment, payment)
+    g = 1 + growth
+    valid = (cost > 0) & (payment > 0) & (n > 0)
+    rate = np.full(cost.shape, np.nan)
+    if valid.any():
+        level = _solve_level(cost[valid] * g[valid] / payment[valid], n[valid])
+        rate[valid] = (1 + level) * g[valid] - 1
+    return rate if rate.ndim else float(rate)
+
+
+def annuity_payback(cost, payment, n, growth=0.0):
+    """First period whose cumulative cash flow is non-negative, or NaN if none within ``n``.
+
+    Same answer as scanning ``np.cumsum([-cost, payment, payment * g, ...])``.
+    """
+    cost, payment, n, growth = (
+        a.astype(float) for a in np.broadcast_arrays(*(np.asarray(x) for x in (cost, payment, n, growth)))
+    )
+    with np.errstate(all="ignore"):
+        level = np.ceil(cost / payment)
+        # Cumulative savings P * (g**t - 1) / (g - 1) >= cost  =>  t >= log(1 + cost (g - 1) / P) / log(g)
+        escalating = np.ceil(np.log1p(cost * growth / payment) / np.log1p(growth))
+        periods = np.where(growth == 0, level, escalating)
+    periods = np.where(cost <= 0, 0.0, periods)
+    periods = np.where((periods >= 0) & (periods <= n), periods, np.nan)
+    return periods if periods.ndim else float(periods)
+
+
+def as_annuity(cash_flows) -> tuple[float, float, int, float] | None:
+    """Recognize ``[-cost, P, P*g, ...]`` and return ``(cost, P, n, growth)``.
+
+    Returns ``None`` for any other shape.
+    """
+    values = np.asarray(cash_flows, dtype=float)
+    if values.ndim != 1 or values.size < 2:
+        return None
+    first, rest = values[1], values[1:]
+    n = rest.size
+    if np.all(rest == first):
+        return -values[0], first, n, 0.0
+    if first == 0 or n < 2:
+        return None
+    ratios = rest[1:] / rest[:-1]
+    if np.allclose(ratios, ratios[0], rtol=1e-12, atol=0):
+        growth = float(ratios[0] - 1)
+        if np.allclose(rest, first * (1 + growth) ** np.arange(n), rtol=1e-12, atol=0):
+            return -values[0], first, n, growth
+    return None
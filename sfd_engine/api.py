@@ -0,0 +1,259 @@
+"""HTTP pricing API for the CRM.
+
+Serves the Company Facing Data figures for one lead or a batch of leads,
+priced with :func:`~sfd_engine.batch.price_batch`::
+
+    python -m sfd_engine.api --port 8502
+
+    POST /quote
+    {"program": [25, 5.99, 27.49],
+     "leads": [{"system_size_kw": 7.5, "cost_per_watt": 5.88, "electric_bill": 300}, ...]}
+
+A body may also be a single lead object. Leads use the
+:class:`~sfd_engine.pricing.ProposalInputs` field names and the same
+defaults and yes/no handling as :mod:`sfd_engine.bulk`. Each lead gets
+``monthly_payment``, ``npv``, ``irr``, ``payback_year`` and
+``company_revenue`` back, in request order.
+
+Leads are normalized (defaults filled, types coerced, floats rounded)
+before pricing, so equivalent leads share one cache entry. A request
+looks every lead up in an LRU cache and prices only the misses, all of
+them in one vectorized call. Connections are kept alive between
+requests, so a CRM sending one quote at a time does not pay a new TCP
+handshake per quote. Pricing runs on the event loop: a quote is
+microseconds of NumPy work, less than handing it to a thread would cost.
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import math
+from collections import OrderedDict
+from typing import Any, Hashable, Mapping, Sequence
+
+import numpy as np
+from starlette.applications import Starlette
+from starlette.requests import Request
+from starlette.responses import Response
+from starlette.routing import Route
+
+from .batch import price_batch
+from .bulk import OPTIONAL_COLUMNS, PROGRAM_COLUMNS, REQUIRED_COLUMNS, TRUE_STRINGS
+from .programs import load_catalog
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - depends on environment
+    orjson = None
+
+QUOTE_FIELDS = ("monthly_payment", "npv", "irr", "payback_year", "company_revenue")
+# price_batch's argument order, which is also the layout of a normalized lead
+LEAD_FIELDS = REQUIRED_COLUMNS + PROGRAM_COLUMNS + tuple(OPTIONAL_COLUMNS)
+# Decimal places kept when normalizing numbers for the cache key
+ROUND_DIGITS = 6
+CACHE_MAX_ENTRIES = 100_000
+MAX_LEADS = 10_000
+KEEP_ALIVE_SECONDS = 75
+
+# A normalized lead: LEAD_FIELDS values in order
+Lead = tuple
+
+
+class InvalidLead(ValueError):
+    """A lead that cannot be priced; reported to the client as a 400."""
+
+
+def _number(lead: Mapping[str, Any], name: str, default=None) -> float:
+    value = lead.get(name)
+    if value is None:
+        value = default
+    if value is None or isinstance(value, bool):
+        raise InvalidLead(f"{name} is required" if value is None else f"{name} must be a number")
+    try:
+        number = float(value)
+    except (TypeError, ValueError):
+        raise InvalidLead(f"{name} must be a number, got {value!r}") from None
+    if not math.isfinite(number):
+        raise InvalidLead(f"{name} must be finite")
+    return round(number, ROUND_DIGITS) + 0.0
+
+
+def _flag(value: Any, default: bool) -> bool:
+    if value is None:
+        return default
+    if isinstance(value, str):
+        return value.strip().lower() in TRUE_STRINGS
+    return bool(value)
+
+
+def normalize_lead(lead: Mapping[str, Any], program: Sequence[float] | None = None) -> Lead:
+    """``lead`` as a tuple of :data:`LEAD_FIELDS` values, usable as a cache key.
+
+    ``program`` fills in ``loan_term``/``loan_apr``/``dealer_fee`` where the
+    lead does not carry them. A ``null`` field counts as missing.
+    """
+    if not isinstance(lead, Mapping):
+        raise InvalidLead("each lead must be a JSON object")
+    values: list = [_number(lead, name) for name in REQUIRED_COLUMNS]
+    for name, default in zip(PROGRAM_COLUMNS, program or (None, None, None)):
+        values.append(_number(lead, name, default))
+    if not values[3].is_integer() or values[3] <= 0:
+        raise InvalidLead(f"loan_term must be a positive whole number of years, got {values[3]:g}")
+    values[3] = int(values[3])
+    for name, default in OPTIONAL_COLUMNS.items():
+        value = lead.get(name)
+        if isinstance(default, bool):
+            values.append(_flag(value, default))
+        elif isinstance(default, str):
+            values.append(str(default if value is None else value).strip().upper())
+        else:
+            values.append(_number(lead, name, default))
+    return tuple(values)
+
+
+def price_leads(leads: Sequence[Lead]) -> list[dict[str, Any]]:
+    """Quote every normalized lead with one vectorized :func:`price_batch` call."""
+    columns = [np.asarray(column) for column in zip(*leads)]
+    priced = price_batch(*columns)
+    quotes = [dict(zip(QUOTE_FIELDS, row)) for row in zip(*(priced[name].tolist() for name in QUOTE_FIELDS))]
+    for quote in quotes:
+        # NaN is not valid JSON: no payback within the term, or no IRR
+        for name in ("irr", "payback_year"):
+            if math.isnan(quote[name]):
+                quote[name] = None
+        if quote["payback_year"] is not None:
+            quote["payback_year"] = int(quote["payback_year"])
+    return quotes
+
+
+class QuoteCache:
+    """LRU cache of quotes keyed on normalized leads."""
+
+    def __init__(self, max_entries: int = CACHE_MAX_ENTRIES):
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._quotes: OrderedDict[Hashable, dict] = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._quotes)
+
+    def quote(self, leads: Sequence[Lead]) -> list[dict[str, Any]]:
+        """Quotes for ``leads``, pricing only the ones not cached."""
+        found: dict[Lead, dict] = {}
+        missing: list[Lead] = []
+        for lead in leads:
+            if lead in found:
+                continue
+            cached = self._quotes.get(lead)
+            if cached is None:
+                missing.append(lead)
+                found[lead] = None
+            else:
+                self._quotes.move_to_end(lead)
+                found[lead] = cached
+        self.hits += len(leads) - len(missing)
+        self.misses += len(missing)
+        if missing:
+            for lead, quote in zip(missing, price_leads(missing)):
+                found[lead] = self._quotes[lead] = quote
+            while len(self._quotes) > self.max_entries:
+                self._quotes.popitem(last=False)
+        return [found[lead] for lead in leads]
+
+
+def _dumps(payload) -> bytes:
+    if orjson is not None:
+        return orjson.dumps(payload)
+    return json.dumps(payload, separators=(",", ":")).encode()
+
+
+def _loads(body: bytes):
+    if orjson is not None:
+        return orjson.loads(body)
+    return json.loads(body)
+
+
+def _json(payload, status_code: int = 200) -> Response:
+    return Response(_dumps(payload), status_code=status_code, media_type="application/json")
+
+
+def parse_quote_request(payload) -> tuple[list[Lead], bool]:
+    """Normalized leads from a request body, and whether it was a single lead."""
+    if isinstance(payload, Mapping) and "leads" not in payload:
+        return [normalize_lead(payload)], True
+    if not isinstance(payload, Mapping) or not isinstance(payload["leads"], list):
+        raise InvalidLead('body must be a lead object or {"leads": [...]}')
+    program = payload.get("program")
+    if program is not None and (not isinstance(program, list) or len(program) != 3):
+        raise InvalidLead("program must be [term, apr, dealer_fee]")
+    leads = payload["leads"]
+    if len(leads) > MAX_LEADS:
+        raise InvalidLead(f"at most {MAX_LEADS:,} leads per request")
+    normalized = []
+    for position, lead in enumerate(leads):
+        try:
+            normalized.append(normalize_lead(lead, program))
+        except InvalidLead as exc:
+            raise InvalidLead(f"lead {position}: {exc}") from None
+    return normalized, False
+
+
+def create_app(cache_size: int = CACHE_MAX_ENTRIES) -> Starlette:
+    cache = QuoteCache(cache_size)
+
+    async def quote(request: Request) -> Response:
+        try:
+            payload = _loads(await request.body())
+        except ValueError:
+            return _json({"error": "body must be JSON"}, 400)
+        try:
+            leads, single = parse_quote_request(payload)
+        except InvalidLead as exc:
+            return _json({"error": str(exc)}, 400)
+        quotes = cache.quote(leads)
+        return _json(quotes[0] if single else {"quotes": quotes})
+
+    async def programs(request: Request) -> Response:
+        catalog = load_catalog()
+        return _json({
+            "version": catalog.version,
+            "programs": [
+                {"loan_term": term, "loan_apr": apr, "dealer_fee": fee} for term, apr, fee in catalog.programs
+            ],
+        })
+
+    async def health(request: Request) -> Response:
+        return _json({"status": "ok", "cached_quotes": len(cache), "cache_hits": cache.hits, "cache_misses": cache.misses})
+
+    app = Starlette(routes=[
+        Route("/quote", quote, methods=["POST"]),
+        Route("/programs", programs, methods=["GET"]),
+        Route("/health", health, methods=["GET"]),
+    ])
+    app.state.cache = cache
+    return app
+
+
+def main(argv: list[str] | None = None) -> None:
+    import uvicorn
+
+    parser = argparse.ArgumentParser(prog="python -m sfd_engine.api", description="Serve the pricing API.")
+    parser.add_argument("--host", default="127.0.0.1", help="interface to bind (default: %(default)s)")
+    parser.add_argument("--port", type=int, default=8502, help="port to listen on (default: %(default)s)")
+    parser.add_argument(
+        "--cache-size", type=int, default=CACHE_MAX_ENTRIES, help="quotes kept in the LRU cache (default: %(default)s)"
+    )
+    args = parser.parse_args(argv)
+
+    uvicorn.run(
+        create_app(args.cache_size),
+        host=args.host,
+        port=args.port,
+        timeout_keep_alive=KEEP_ALIVE_SECONDS,
+        access_log=False,
+    )
+
+
+if __name__ == "__main__":
+    main()
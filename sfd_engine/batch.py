@@ -0,0 +1,180 @@
+"""Vectorized pricing over many proposals or loan programs at once.
+
+:func:`price_batch` is :func:`~sfd_engine.pricing.price_proposal` rewritten
+over NumPy arrays: every argument broadcasts, so one customer against the
+whole program list, or a column of customers against one program, is a
+single call with no Python loop over rows. NPV, IRR and payback use the
+closed-form annuity solutions, since each row's cash flows are a level
+annuity.
+"""
+from __future__ import annotations
+
+import numpy as np
+import pandas as pd
+
+from .annuity import annuity_factor, annuity_irr, annuity_payback
+from .finance import payment
+from .pricing import NPV_RATE, NYC_ABATEMENT, NYS_CREDIT, ProposalInputs, loan_amount
+from .programs import LOAN_PROFILES, program_label
+from .reamortization import OVERVIEW_PERIOD_LABELS, OVERVIEW_SCENARIOS, incentive_paydown_payments
+
+# Columns returned by price_batch, in display order.
+BATCH_COLUMNS = (
+    "loan_term",
+    "loan_apr",
+    "dealer_fee",
+    "monthly_payment",
+    "cash_total_cost",
+    "base_cost",
+    "gross_cost",
+    "company_revenue",
+    "federal_tax_credit",
+    "battery_credit",
+    "ny_solar_credit",
+    "loan_base_payment",
+    "loan_adj_payment",
+    "adjusted_system_cost",
+    "npv",
+    "irr",
+    "roi",
+    "payback_year",
+)
+
+
+def price_batch(
+    system_size_kw,
+    cost_per_watt,
+    electric_bill,
+    loan_term,
+    loan_apr,
+    dealer_fee,
+    roof_cost=0.0,
+    battery_cost=0.0,
+    state="NY",
+    lease_eligible=True,
+    incentives_applied=True,
+    include_incentives=True,
+    project_discount_pct=0.0,
+    utility_escalation=0.0,
+    degradation=0.0,
+) -> dict[str, np.ndarray]:
+    """Price every row of the broadcast arguments.
+
+    Arguments take the same units as :class:`ProposalInputs`; savings grow
+    at ``utility_escalation`` less ``degradation`` a year, which keeps each
+    row's cash flows a (geometrically growing) annuity. Returns a dict
+    of 1-D arrays keyed by :data:`BATCH_COLUMNS`; ``payback_year`` is NaN
+    where the cash flows never pay back within the loan term.
+    """
+    (
+        system_size_kw, cost_per_watt, electric_bill, loan_term, loan_apr, dealer_fee,
+        roof_cost, battery_cost, state, lease_eligible, incentives_applied,
+        include_incentives, project_discount_pct, utility_escalation, degradation,
+    ) = (a.ravel() for a in np.broadcast_arrays(*map(np.asarray, (
+        system_size_kw, cost_per_watt, electric_bill, loan_term, loan_apr, dealer_fee,
+        roof_cost, battery_cost, state, lease_eligible, incentives_applied,
+        include_incentives, project_discount_pct, utility_escalation, degradation,
+    ))))
+    loan_term = loan_term.astype(int)
+    discount = 1 - project_discount_pct / 100
+    fee = dealer_fee / 100
+    incentives = incentives_applied.astype(float)
+
+    # Customer Outputs
+    base_price = system_size_kw * 1000 * cost_per_watt
+    discounted_project_cost = (base_price + roof_cost) * discount
+    monthly_payment = payment(loan_apr / 100 / 12, loan_term * 12, discounted_project_cost)
+    cash_total_cost = discounted_project_cost - system_size_kw * 1000 * 0.2
+
+    # Company Facing Data
+    base_cost = cost_per_watt * 1000 * system_size_kw - battery_cost
+    gross_cost = base_cost / (1 - fee)
+    company_revenue = gross_cost * discount - base_cost * discount
+    federal_tax_credit = np.where(
+        lease_eligible, 0.0, cost_per_watt * 1000 * np.minimum(system_size_kw, 8) / (1 - fee) * 0.3
+    )
+    battery_credit = (gross_cost + battery_cost) * 0.3 * incentives
+    ny_solar_credit = np.where(state == "NY", np.minimum(5000, (gross_cost + battery_cost) * 0.25), 0.0) * incentives
+
+    nper = loan_term * 12
+    loan_base_payment = payment(loan_apr / 100 / 11.15, nper, gross_cost)
+    loan_adj_payment = payment(loan_apr / 100 / 11, nper, gross_cost - (battery_credit + ny_solar_credit))
+
+    annual_savings = electric_bill * 12
+    growth = (1 + utility_escalation / 100) * (1 - degradation / 100) - 1
+    credits = np.where(include_incentives, federal_tax_credit + battery_credit + ny_solar_credit, 0.0)
+    adjusted_system_cost = gross_cost - credits
+
+    return {
+        "loan_term": loan_term,
+        "loan_apr": loan_apr.astype(float),
+        "dealer_fee": dealer_fee.astype(float),
+        "monthly_payment": monthly_payment,
+        "cash_total_cost": cash_total_cost,
+        "base_cost": base_cost,
+        "gross_cost": gross_cost,
+        "company_revenue": company_revenue,
+        "federal_tax_credit": federal_tax_credit,
+        "battery_credit": battery_credit,
+        "ny_solar_credit": ny_solar_credit,
+        "loan_base_payment": loan_base_payment,
+        "loan_adj_payment": loan_adj_payment,
+        "adjusted_system_cost": adjusted_system_cost,
+        "npv": annual_savings * annuity_factor(NPV_RATE, loan_term, growth) - adjusted_system_cost,
+        "irr": annuity_irr(adjusted_system_cost, annual_savings, loan_term, growth),
+        "roi": (annual_savings * annuity_factor(0.0, loan_term, growth) - adjusted_system_cost) / adjusted_system_cost,
+        "payback_year": annuity_payback(adjusted_system_cost, annual_savings, loan_term, growth),
+    }
+
+
+def price_programs(
+    inputs: ProposalInputs, programs: list[tuple[int, float, float]] = LOAN_PROFILES
+) -> pd.DataFrame:
+    """Price one customer against every loan program in a single pass.
+
+    The program fields of ``inputs`` are ignored; one row is returned per
+    ``(term, APR, dealer fee)`` entry in ``programs``, indexed by its label.
+    Savings are the flat monthly bill, as in :func:`price_batch`, even when
+    ``inputs`` asks for hourly production.
+    """
+    terms, aprs, fees = (np.array(col) for col in zip(*programs))
+    columns = price_batch(
+        inputs.system_size_kw,
+        inputs.cost_per_watt,
+        inputs.electric_bill,
+        terms,
+        aprs,
+        fees,
+        roof_cost=inputs.roof_cost,
+        battery_cost=inputs.battery_cost,
+        state=inputs.state,
+        lease_eligible=inputs.lease_eligible,
+        incentives_applied=inputs.incentives_applied,
+        include_incentives=inputs.include_incentives,
+        project_discount_pct=inputs.project_discount_pct,
+        utility_escalation=inputs.utility_escalation,
+        degradation=inputs.degradation,
+    )
+    frame = pd.DataFrame(columns, index=[program_label(*p) for p in programs])
+    frame["payback_year"] = frame["payback_year"].astype("Int64")
+    frame.index.name = "program"
+    return frame
+
+
+def overview_programs(
+    inputs: ProposalInputs, programs: list[tuple[int, float, float]] = LOAN_PROFILES, deferral: bool = True
+) -> pd.DataFrame:
+    """Investment Overview paydown payments for every loan program at once.
+
+    Rows are indexed by ``(program, scenario)`` and columns are the overview
+    payment windows (``"Months 1-3"`` ... ``"Year 5+"``).
+    """
+    terms, aprs = (np.array(col) for col in list(zip(*programs))[:2])
+    itc = inputs.system_size_kw * 1000 * inputs.cost_per_watt * 0.30
+    payments = incentive_paydown_payments(
+        loan_amount(inputs), aprs / 100 / 12, terms * 12, itc, NYS_CREDIT, NYC_ABATEMENT, deferral=deferral
+    )
+    index = pd.MultiIndex.from_product(
+        [[program_label(*p) for p in programs], OVERVIEW_SCENARIOS], names=["program", "scenario"]
+    )
+    return pd.DataFrame(payments.reshape(-1, len(OVERVIEW_PERIOD_LABELS)), index=index, columns=OVERVIEW_PERIOD_LABELS)
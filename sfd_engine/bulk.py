@@ -0,0 +1,236 @@
+"""Offline bulk pricing for lead lists.
+
+Prices a CSV or Parquet file of customer rows with the same math as the
+Company Facing Data tab, without holding the whole file in memory::
+
+    python -m sfd_engine.bulk leads.csv priced.csv --workers 8
+    python -m sfd_engine.bulk leads.parquet priced.parquet --program 25 5.99 27.49
+
+The input is read in chunks, each chunk is priced with :func:`price_batch`
+in a process pool, and results are appended to the output as they finish
+(in input order). Input columns use :class:`ProposalInputs` field names;
+only ``system_size_kw``, ``cost_per_watt`` and ``electric_bill`` are
+required, and the loan program may come from ``--program`` instead of the
+``loan_term``/``loan_apr``/``dealer_fee`` columns.
+"""
+from __future__ import annotations
+
+import argparse
+import os
+from collections import deque
+from concurrent.futures import Executor, ProcessPoolExecutor
+from contextlib import ExitStack
+from pathlib import Path
+from typing import Callable, Iterable, Iterator
+
+import numpy as np
+import pandas as pd
+
+from .batch import BATCH_COLUMNS, price_batch
+
+REQUIRED_COLUMNS = ("system_size_kw", "cost_per_watt", "electric_bill")
+PROGRAM_COLUMNS = ("loan_term", "loan_apr", "dealer_fee")
+OPTIONAL_COLUMNS = {
+    "roof_cost": 0.0,
+    "battery_cost": 0.0,
+    "state": "NY",
+    "lease_eligible": True,
+    "incentives_applied": True,
+    "include_incentives": True,
+    "project_discount_pct": 0.0,
+}
+# Strings read as True in the boolean columns, after stripping and lower-casing
+TRUE_STRINGS = {"yes", "y", "true", "t", "1"}
+
+
+def _as_bool(column: pd.Series, default: bool) -> np.ndarray:
+    if column.dtype == bool:
+        return column.to_numpy()
+    return column.fillna(default).astype(str).str.strip().str.lower().isin(TRUE_STRINGS).to_numpy()
+
+
+def _check_terms(terms, index: pd.Index) -> None:
+    # price_batch casts terms to int, so anything but a positive whole number would be mispriced
+    terms = np.asarray(terms, dtype=float)
+    with np.errstate(invalid="ignore"):
+        bad = ~(np.isfinite(terms) & (terms > 0) & (terms == np.round(terms)))
+    if not bad.any():
+        return
+    if terms.ndim == 0:
+        raise ValueError(f"loan_term must be a positive whole number of years, got {terms:g}")
+    rows = ", ".join(f"{label} ({term:g})" for label, term in zip(index[bad][:5], terms[bad][:5]))
+    more = f" and {bad.sum() - 5:,} more" if bad.sum() > 5 else ""
+    raise ValueError(f"loan_term must be a positive whole number of years; bad rows: {rows}{more}")
+
+
+def frame_arguments(leads: pd.DataFrame, program: tuple[int, float, float] | None = None) -> dict:
+    """:class:`ProposalInputs` field values for every row of ``leads``.
+
+    Values are per-row arrays, or scalars where a column is filled from
+    ``program`` or a default. ``program`` fills in ``loan_term``/``loan_apr``/
+    ``dealer_fee`` when the frame does not carry them. Yes/no strings are
+    accepted for the boolean columns, as in the dashboards, and blank
+    cells get the column's :data:`OPTIONAL_COLUMNS` default. Raises
+    ``ValueError`` naming the rows whose ``loan_term`` is not a positive
+    whole number of years.
+    """
+    missing = [c for c in REQUIRED_COLUMNS if c not in leads]
+    if program is None:
+        missing += [c for c in PROGRAM_COLUMNS if c not in leads]
+    if missing:
+        raise ValueError(f"input is missing required columns: {', '.join(missing)}")
+
+    args = {c: leads[c].to_numpy(dtype=float) for c in REQUIRED_COLUMNS}
+    for column, default in zip(PROGRAM_COLUMNS, program or (None, None, None)):
+        args[column] = leads[column].to_numpy(dtype=float) if column in leads else default
+    _check_terms(args["loan_term"], leads.index)
+    for column, default in OPTIONAL_COLUMNS.items():
+        if column not in leads:
+            args[column] = default
+        elif isinstance(default, bool):
+            args[column] = _as_bool(leads[column], default)
+        elif isinstance(default, str):
+            args[column] = leads[column].fillna(default).astype(str).str.strip().str.upper().to_numpy()
+        else:
+            args[column] = leads[column].fillna(default).to_numpy(dtype=float)
+    return args
+
+
+def price_frame(leads: pd.DataFrame, program: tuple[int, float, float] | None = None) -> pd.DataFrame:
+    """Price a frame of lead rows and return it with the pricing columns appended.
+
+    Columns are read as in :func:`frame_arguments`.
+    """
+    args = frame_arguments(leads, program)
+    priced = pd.DataFrame(price_batch(**args), index=leads.index)
+    priced["payback_year"] = priced["payback_year"].astype("Int64")
+    new_columns = [c for c in BATCH_COLUMNS if c not in leads]
+    return pd.concat([leads, priced[new_columns]], axis=1)
+
+
+def _is_parquet(path: str | Path) -> bool:
+    return Path(path).suffix.lower() in (".parquet", ".pq")
+
+
+def require_pyarrow():
+    """The ``pyarrow`` module, with its Parquet support loaded."""
+    try:
+        import pyarrow
+        import pyarrow.parquet
+    except ImportError as exc:  # pragma: no cover - depends on environment
+        raise ImportError("Parquet input/output requires the 'pyarrow' package") from exc
+    return pyarrow
+
+
+def read_chunks(path: str | Path, chunksize: int) -> Iterator[pd.DataFrame]:
+    """Yield the rows of a CSV or Parquet file ``chunksize`` rows at a time."""
+    if _is_parquet(path):
+        pa = require_pyarrow()
+        for batch in pa.parquet.ParquetFile(path).iter_batches(batch_size=chunksize):
+            yield batch.to_pandas()
+    else:
+        yield from pd.read_csv(path, chunksize=chunksize)
+
+
+class ChunkWriter:
+    """Append priced chunks to a CSV or Parquet file."""
+
+    def __init__(self, path: str | Path):
+        self.path = path
+        self._parquet = None
+        self._wrote_header = False
+
+    def write(self, frame: pd.DataFrame) -> None:
+        if _is_parquet(self.path):
+            pa = require_pyarrow()
+            table = pa.Table.from_pandas(frame, preserve_index=False)
+            if self._parquet is None:
+                self._parquet = pa.parquet.ParquetWriter(self.path, table.schema)
+            self._parquet.write_table(table.cast(self._parquet.schema))
+        else:
+            frame.to_csv(self.path, mode="a" if self._wrote_header else "w", header=not self._wrote_header, index=False)
+            self._wrote_header = True
+
+    def close(self) -> None:
+        if self._parquet is not None:
+            self._parquet.close()
+
+    def __enter__(self) -> "ChunkWriter":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+
+def bounded_map(executor: Executor, fn: Callable, items: Iterable, max_pending: int) -> Iterator:
+    """Like ``executor.map`` but keeps at most ``max_pending`` items in flight.
+
+    ``Executor.map`` submits the whole iterable up front, which would read
+    every chunk of the input into memory before the first result is written.
+    """
+    pending = deque()
+    for item in items:
+        pending.append(executor.submit(fn, item))
+        if len(pending) >= max_pending:
+            yield pending.popleft().result()
+    while pending:
+        yield pending.popleft().result()
+
+
+def _price_chunk(job: tuple[pd.DataFrame, tuple[int, float, float] | None]) -> pd.DataFrame:
+    chunk, program = job
+    return price_frame(chunk, program)
+
+
+def run(
+    input_path: str | Path,
+    output_path: str | Path,
+    chunksize: int = 50_000,
+    workers: int | None = None,
+    program: tuple[int, float, float] | None = None,
+) -> int:
+    """Price ``input_path`` into ``output_path`` and return the number of rows.
+
+    ``workers=0`` prices in the calling process; ``None`` uses one worker
+    per CPU.
+    """
+    jobs = ((chunk, program) for chunk in read_chunks(input_path, chunksize))
+    rows = 0
+    with ChunkWriter(output_path) as writer, ExitStack() as stack:
+        if workers == 0:
+            frames = map(_price_chunk, jobs)
+        else:
+            workers = workers or os.cpu_count() or 1
+            executor = stack.enter_context(ProcessPoolExecutor(max_workers=workers))
+            frames = bounded_map(executor, _price_chunk, jobs, max_pending=2 * workers)
+        for frame in frames:
+            writer.write(frame)
+            rows += len(frame)
+    return rows
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(prog="python -m sfd_engine.bulk", description="Price a lead list in bulk.")
+    parser.add_argument("input", help="CSV or Parquet file of customer rows")
+    parser.add_argument("output", help="CSV or Parquet file to write (format follows the extension)")
+    parser.add_argument("--chunksize", type=int, default=50_000, help="rows per chunk (default: %(default)s)")
+    parser.add_argument("--workers", type=int, default=None, help="worker processes; 0 prices inline (default: one per CPU)")
+    parser.add_argument(
+        "--program",
+        nargs=3,
+        type=float,
+        metavar=("TERM", "APR", "DEALER_FEE"),
+        help="loan program for rows without loan_term/loan_apr/dealer_fee columns",
+    )
+    args = parser.parse_args(argv)
+
+    program = tuple(args.program) if args.program else None
+    try:
+        rows = run(args.input, args.output, chunksize=args.chunksize, workers=args.workers, program=program)
+    except ValueError as exc:
+        parser.error(str(exc))
+    print(f"Priced {rows:,} rows -> {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,149 @@
+"""Monthly and annual cash flows of a proposal as columns.
+
+:func:`cash_flow_columns` builds every flow of a proposal month by month,
+month 0 being the install date:
+
+* ``savings``: the bill savings, grown each year by the utility escalator
+  and shrunk by panel degradation.
+* ``system_cost``: the purchase price, paid at install.
+* ``incentives``: credits and cheques on the months they arrive.
+* ``loan_payment``: the level loan payment over the loan term.
+* ``lease_payment``: the lease payment, escalating each year.
+
+Each flow is one NumPy expression over the month axis. ``net`` is their
+sum and ``cumulative`` its running total. A flow that is not given is
+left out, so a cash purchase, a loan and a lease are each one call with
+a different set of flows. :class:`CashFlowTable` holds the columns and
+rolls them up by year. NPV, IRR, payback, the charts and the CSV tables
+all read from it.
+"""
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from functools import cached_property
+from typing import Iterable, Mapping
+
+import numpy as np
+import pandas as pd
+
+# Annual utility rate escalator cited by the Investment Overview footnote
+UTILITY_ESCALATION = 0.04
+
+# Columns of a cash flow table, in display order; flows that were not given are left out.
+CASH_FLOW_COLUMNS = (
+    "month", "year", "savings", "system_cost", "incentives", "loan_payment", "lease_payment", "net", "cumulative",
+)
+# Dashboard and export headings for CASH_FLOW_COLUMNS
+CASH_FLOW_LABELS = {
+    "month": "Month",
+    "year": "Year",
+    "savings": "Utility Savings",
+    "system_cost": "System Cost",
+    "incentives": "Incentives",
+    "loan_payment": "Loan Payment",
+    "lease_payment": "Lease Payment",
+    "net": "Net Cash Flow",
+    "cumulative": "Cumulative",
+}
+_FLOWS = ("savings", "system_cost", "incentives", "loan_payment", "lease_payment")
+
+
+def cash_flow_columns(
+    monthly_savings,
+    years: int,
+    *,
+    utility_escalation: float = 0.0,
+    degradation: float = 0.0,
+    system_cost: float | None = None,
+    incentives: Mapping[int, float] | Iterable[tuple[int, float]] | None = None,
+    loan_payment: float | None = None,
+    loan_months: int | None = None,
+    lease_payment: float | None = None,
+    lease_escalation: float = 0.0,
+) -> dict[str, np.ndarray]:
+    """Cash flow columns over ``years``, one row per month plus month 0.
+
+    ``monthly_savings`` is the first year's savings per month, or a
+    ``(years, 12)`` schedule already laid out by month. Rates are
+    fractions per year. ``incentives`` maps a month to the amount received
+    then. The loan runs ``loan_months`` (default: all ``years``). Costs and
+    payments come out negative.
+    """
+    months = np.arange(years * 12 + 1)
+    # Year of each month: 0 for install, then 1..years
+    year = np.concatenate(([0], np.repeat(np.arange(1, years + 1), 12)))
+    paying = months > 0
+    growth = ((1 + utility_escalation) * (1 - degradation)) ** (year - 1)
+
+    base = np.asarray(monthly_savings, dtype=float)
+    savings = np.zeros(len(months))
+    savings[1:] = base.ravel() if base.ndim else base
+    columns = {"month": months, "year": year, "savings": savings * np.where(paying, growth, 0.0)}
+    if system_cost is not None:
+        columns["system_cost"] = np.where(months == 0, -system_cost, 0.0)
+    if incentives is not None:
+        dated = np.array(list(dict(incentives).items()), dtype=float).reshape(-1, 2)
+        received = np.zeros(len(months))
+        np.add.at(received, dated[:, 0].astype(int), dated[:, 1])
+        columns["incentives"] = received
+    if loan_payment is not None:
+        term = years * 12 if loan_months is None else loan_months
+        columns["loan_payment"] = np.where(paying & (months <= term), -loan_payment, 0.0)
+    if lease_payment is not None:
+        columns["lease_payment"] = np.where(paying, -lease_payment * (1 + lease_escalation) ** (year - 1), 0.0)
+
+    columns["net"] = sum(columns[name] for name in _FLOWS if name in columns)
+    columns["cumulative"] = np.cumsum(columns["net"])
+    for array in columns.values():
+        array.flags.writeable = False
+    return columns
+
+
+@dataclass(frozen=True)
+class CashFlowTable:
+    """Cash flow columns by month (see :func:`cash_flow_columns`) and their yearly roll-up.
+
+    ``annual_columns`` sums each flow over the twelve months of a year;
+    year 0 is the install month on its own.
+    """
+
+    columns: dict[str, np.ndarray] = field(repr=False)
+
+    @classmethod
+    def build(cls, monthly_savings, years: int, **flows) -> "CashFlowTable":
+        return cls(cash_flow_columns(monthly_savings, years, **flows))
+
+    @property
+    def years(self) -> int:
+        return int(self.columns["year"][-1])
+
+    @property
+    def net(self) -> np.ndarray:
+        """Net cash flow by month, install month first."""
+        return self.columns["net"]
+
+    @property
+    def annual_net(self) -> np.ndarray:
+        """Net cash flow by year, install year first."""
+        return self.annual_columns["net"]
+
+    @cached_property
+    def annual_columns(self) -> dict[str, np.ndarray]:
+        years = self.years
+        annual = {"year": np.arange(years + 1)}
+        for name in (*_FLOWS, "net"):
+            if name in self.columns:
+                monthly = self.columns[name]
+                annual[name] = np.concatenate((monthly[:1], monthly[1:].reshape(years, 12).sum(axis=1)))
+        annual["cumulative"] = np.cumsum(annual["net"])
+        for array in annual.values():
+            array.flags.writeable = False
+        return annual
+
+    @property
+    def monthly(self) -> pd.DataFrame:
+        return pd.DataFrame(self.columns)
+
+    @property
+    def annual(self) -> pd.DataFrame:
+        return pd.DataFrame(self.annual_columns)
@@ -0,0 +1,137 @@
+"""Cash purchase, loan and lease side by side over the system's life.
+
+:func:`compare_financing` prices one proposal three ways from the
+customer's side, each path a :class:`~sfd_engine.cashflows.CashFlowTable`
+over the same horizon (the 25-year system life, or the loan term if that
+is longer) with the same utility savings:
+
+* **Cash**: the discounted project cost at install, less the customer
+  incentive.
+* **Loan**: the customer loan's level payment over its term, plus the
+  customer incentive. Savings continue after the loan is paid off.
+* **Lease**: the lease payment every month, escalating by ``lease_rate``
+  each year for the whole horizon. The lessor keeps the incentives.
+
+The paths are stacked into ``(3, months)`` arrays, and cumulative cost,
+cumulative net savings, break-even month and NPV come out of a handful
+of array operations for all three at once.
+"""
+from __future__ import annotations
+
+from dataclasses import dataclass, field, replace
+
+import numpy as np
+import pandas as pd
+
+from .cashflows import CashFlowTable
+from .pricing import NPV_RATE, ProposalInputs, ProposalResult, price_proposal
+
+FINANCING_OPTIONS = ("Cash", "Loan", "Lease")
+# Years every option is compared over, unless the loan runs longer
+SYSTEM_LIFE_YEARS = 25
+
+
+@dataclass(frozen=True)
+class FinancingComparison:
+    """The three financing paths of one proposal, one row per :data:`FINANCING_OPTIONS` entry.
+
+    Month arrays run from install (month 0) to the end of the horizon.
+    ``cumulative_cost`` is everything the customer has paid, net of
+    incentives. ``cumulative_net`` adds the utility savings.
+    ``break_even_month`` is the first month from which ``cumulative_net``
+    stays at or above zero (NaN if it never does). ``npv`` discounts the
+    net flows monthly at ``rate``.
+    """
+
+    rate: float
+    tables: dict[str, CashFlowTable] = field(repr=False)
+    monthly_payment: np.ndarray = field(repr=False)
+    cumulative_cost: np.ndarray = field(repr=False)
+    cumulative_net: np.ndarray = field(repr=False)
+    break_even_month: np.ndarray = field(repr=False)
+    npv: np.ndarray = field(repr=False)
+
+    @property
+    def months(self) -> np.ndarray:
+        return np.arange(self.cumulative_net.shape[-1])
+
+    def summary(self) -> pd.DataFrame:
+        """One row per option: first payment, total cost, net savings, break-even and NPV."""
+        return pd.DataFrame({
+            "Option": FINANCING_OPTIONS,
+            "Monthly Payment (Year 1)": self.monthly_payment,
+            "Total Cost": self.cumulative_cost[:, -1],
+            "Net Savings": self.cumulative_net[:, -1],
+            "Break-even Month": self.break_even_month,
+            f"NPV ({self.rate:.0%} rate)": self.npv,
+        })
+
+    def frame(self) -> pd.DataFrame:
+        """Long format for charts: one row per option and month."""
+        months = self.months
+        return pd.DataFrame({
+            "Option": np.repeat(FINANCING_OPTIONS, len(months)),
+            "Month": np.tile(months, len(FINANCING_OPTIONS)),
+            "Cumulative Cost": self.cumulative_cost.ravel(),
+            "Cumulative Net Savings": self.cumulative_net.ravel(),
+        })
+
+
+def _break_even(cumulative: np.ndarray) -> np.ndarray:
+    # A month counts once the running total never drops below zero again
+    stays_positive = np.minimum.accumulate(cumulative[..., ::-1], axis=-1)[..., ::-1] >= 0
+    first = np.argmax(stays_positive, axis=-1).astype(float)
+    return np.where(stays_positive.any(axis=-1), first, np.nan)
+
+
+def compare_financing(
+    inputs: ProposalInputs,
+    quote: ProposalResult | None = None,
+    rate: float = NPV_RATE,
+    years: int = SYSTEM_LIFE_YEARS,
+) -> FinancingComparison:
+    """Cash, loan and lease paths for ``inputs`` over ``years`` (at least the loan term).
+
+    ``quote`` is ``price_proposal(inputs)``, priced here when not given.
+    Savings are the proposal's, with any escalation and degradation
+    applied, carried on past the loan term to the end of the horizon.
+    """
+    quote = quote or price_proposal(inputs)
+    years = max(years, quote.years)
+    # Savings do not depend on the financing, so price them over the whole horizon
+    horizon = quote if years == quote.years else price_proposal(replace(inputs, loan_term=years))
+    savings = horizon.cash_flow_table.columns["savings"][1:].reshape(years, 12)
+    incentive = quote.nys_incentive if inputs.include_incentives else 0.0
+
+    tables = {
+        "Cash": CashFlowTable.build(
+            savings, years, system_cost=quote.discounted_project_cost, incentives={0: incentive}
+        ),
+        "Loan": CashFlowTable.build(
+            savings,
+            years,
+            loan_payment=quote.monthly_payment,
+            loan_months=quote.years * 12,
+            incentives={0: incentive},
+        ),
+        "Lease": CashFlowTable.build(
+            savings, years, lease_payment=inputs.lease_base, lease_escalation=inputs.lease_rate
+        ),
+    }
+
+    net = np.stack([tables[option].net for option in FINANCING_OPTIONS])
+    savings_by_option = np.stack([tables[option].columns["savings"] for option in FINANCING_OPTIONS])
+    cumulative_net = np.cumsum(net, axis=-1)
+    cumulative_cost = np.cumsum(savings_by_option - net, axis=-1)
+    months = np.arange(net.shape[-1])
+    discount = (1 + rate) ** (-months / 12)
+
+    return FinancingComparison(
+        rate=rate,
+        tables=tables,
+        monthly_payment=np.array([0.0, quote.monthly_payment, inputs.lease_base]),
+        cumulative_cost=cumulative_cost,
+        cumulative_net=cumulative_net,
+        break_even_month=_break_even(cumulative_net),
+        npv=net @ discount,
+    )
@@ -0,0 +1,190 @@
+"""A small reactive dataflow graph with memoized nodes.
+
+A :class:`Dataflow` declares named inputs and derived nodes. Each node is
+a plain function, and its parameter names are the nodes or inputs it
+reads, so the edges cannot drift from the formulas::
+
+    flow = Dataflow(["price", "qty"])
+
+    @flow.node
+    def total(price, qty):
+        return price * qty
+
+An :class:`Evaluator` holds one set of input values and the memoized node
+values. :meth:`Evaluator.set` marks every node downstream of a changed
+input dirty. :meth:`Evaluator.get` recomputes only the dirty nodes a
+result needs. A dirty node whose inputs all came out unchanged is
+verified without recomputing (early cutoff). ``trace`` records what the
+last update recomputed and how long each node took.
+"""
+from __future__ import annotations
+
+import inspect
+from dataclasses import dataclass
+from time import perf_counter
+from typing import Any, Callable, Iterable, Mapping, NamedTuple, Sequence
+
+import numpy as np
+
+
+@dataclass(frozen=True)
+class Node:
+    name: str
+    func: Callable
+    deps: tuple[str, ...]
+
+
+class NodeTiming(NamedTuple):
+    """One node touched by an update: ``recomputed`` is False when it was only verified."""
+
+    name: str
+    recomputed: bool
+    seconds: float
+
+
+def _same(old, new) -> bool:
+    if old is new:
+        return True
+    if isinstance(old, np.ndarray) or isinstance(new, np.ndarray):
+        return isinstance(old, np.ndarray) and isinstance(new, np.ndarray) and np.array_equal(old, new)
+    try:
+        return bool(old == new)
+    except (TypeError, ValueError):
+        return False
+
+
+class Dataflow:
+    """Inputs and derived nodes, kept in dependency order."""
+
+    def __init__(self, inputs: Iterable[str]):
+        self.inputs: tuple[str, ...] = tuple(inputs)
+        self.nodes: dict[str, Node] = {}
+        self._dependents: dict[str, list[str]] = {name: [] for name in self.inputs}
+        self._downstream: dict[str, frozenset[str]] = {}
+        self._upstream: dict[tuple[str, ...], tuple[str, ...]] = {}
+
+    def node(self, func: Callable | None = None, *, name: str | None = None):
+        """Decorator: add ``func`` as a node named ``name`` (default: the function's name)."""
+
+        def register(func: Callable) -> Callable:
+            node_name = name or func.__name__
+            if node_name in self._dependents:
+                raise ValueError(f"duplicate node {node_name!r}")
+            deps = tuple(inspect.signature(func).parameters)
+            unknown = [dep for dep in deps if dep not in self._dependents]
+            if unknown:
+                raise ValueError(f"node {node_name!r} reads undefined {', '.join(unknown)}")
+            self.nodes[node_name] = Node(node_name, func, deps)
+            self._dependents[node_name] = []
+            for dep in deps:
+                self._dependents[dep].append(node_name)
+            self._downstream.clear()
+            self._upstream.clear()
+            return func
+
+        return register if func is None else register(func)
+
+    def downstream(self, names: Iterable[str]) -> set[str]:
+        """Every node that (transitively) reads one of ``names``."""
+        result: set[str] = set()
+        for name in names:
+            if name not in self._downstream:
+                seen: set[str] = set()
+                stack = [name]
+                while stack:
+                    for dependent in self._dependents[stack.pop()]:
+                        if dependent not in seen:
+                            seen.add(dependent)
+                            stack.append(dependent)
+                self._downstream[name] = frozenset(seen)
+            result |= self._downstream[name]
+        return result
+
+    def upstream(self, names: Sequence[str]) -> tuple[str, ...]:
+        """``names`` and every node they (transitively) read, in dependency order."""
+        key = tuple(names)
+        if key not in self._upstream:
+            needed = {name for name in key if name in self.nodes}
+            for node in reversed(self.nodes.values()):
+                if node.name in needed:
+                    needed.update(dep for dep in node.deps if dep in self.nodes)
+            self._upstream[key] = tuple(name for name in self.nodes if name in needed)
+        return self._upstream[key]
+
+    def evaluator(self) -> "Evaluator":
+        return Evaluator(self)
+
+
+class Evaluator:
+    """Input values and memoized node values for one :class:`Dataflow`."""
+
+    def __init__(self, flow: Dataflow):
+        self.flow = flow
+        self.trace: list[NodeTiming] = []
+        # Recomputations per node over the evaluator's lifetime
+        self.recomputed: dict[str, int] = dict.fromkeys(flow.nodes, 0)
+        self._values: dict[str, Any] = {}
+        self._dirty: set[str] = set(flow.nodes)
+        self._revision = 0
+        # Revision at which each value last changed, and each node was last brought up to date
+        self._changed: dict[str, int] = {}
+        self._verified: dict[str, int] = {}
+
+    @property
+    def dirty(self) -> frozenset[str]:
+        return frozenset(self._dirty)
+
+    def set(self, values: Mapping[str, Any]) -> tuple[str, ...]:
+        """Update inputs; returns the names whose value actually changed.
+
+        Starts a new ``trace``.
+        """
+        unknown = [name for name in values if name not in self.flow.inputs]
+        if unknown:
+            raise KeyError(f"not inputs of this dataflow: {', '.join(unknown)}")
+        self._revision += 1
+        changed = tuple(
+            name for name, value in values.items()
+            if name not in self._values or not _same(self._values[name], value)
+        )
+        for name in changed:
+            self._values[name] = values[name]
+            self._changed[name] = self._revision
+        self._dirty |= self.flow.downstream(changed)
+        self.trace = []
+        return changed
+
+    def get(self, name: str):
+        """Value of input or node ``name``, recomputing what is stale."""
+        if self._dirty:
+            self._refresh((name,))
+        return self._values[name]
+
+    def get_many(self, names: Sequence[str]) -> dict[str, Any]:
+        if self._dirty:
+            self._refresh(names)
+        values = self._values
+        return {name: values[name] for name in names}
+
+    def _refresh(self, names: Sequence[str]) -> None:
+        dirty, values, changed, verified_at = self._dirty, self._values, self._changed, self._verified
+        revision = self._revision
+        nodes = self.flow.nodes
+        for name in self.flow.upstream(names):
+            if name not in dirty:
+                continue
+            dirty.discard(name)
+            node = nodes[name]
+            verified = verified_at.get(name)
+            verified_at[name] = revision
+            if verified is not None and all(changed[dep] <= verified for dep in node.deps):
+                self.trace.append(NodeTiming(name, False, 0.0))
+                continue
+            start = perf_counter()
+            value = node.func(*[values[dep] for dep in node.deps])
+            seconds = perf_counter() - start
+            if verified is None or not _same(values[name], value):
+                values[name] = value
+                changed[name] = revision
+            self.recomputed[name] += 1
+            self.trace.append(NodeTiming(name, True, seconds))
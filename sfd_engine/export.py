@@ -0,0 +1,84 @@
+"""One-file export bundle of a proposal's tables.
+
+:func:`export_bundle` writes every table to a single ZIP as CSV and
+Parquet (with ``pyarrow`` installed), plus one XLSX workbook with a sheet
+per table::
+
+    csv/<table>.csv
+    parquet/<table>.parquet
+    <bundle>.xlsx
+
+Tables may be given as zero-argument callables, so a dashboard can hand
+over a recipe on every rerun and the tables are only built when someone
+actually downloads. Output goes to a spooled temporary file. Rows are
+written into the ZIP in slices, and a large bundle spills to disk instead
+of staying in memory.
+"""
+from __future__ import annotations
+
+import io
+import tempfile
+import zipfile
+from typing import BinaryIO, Callable, Mapping, Union
+
+import pandas as pd
+
+from .bulk import require_pyarrow
+from .xlsx import CHUNK_ROWS, write_workbook
+
+EXPORT_FORMATS = ("csv", "parquet", "xlsx")
+# Bundles up to this size stay in memory; larger ones spill to a temp file.
+SPOOL_BYTES = 8 * 1024 * 1024
+
+TableSource = Union[pd.DataFrame, Callable[[], pd.DataFrame]]
+
+
+def flat_table(frame: pd.DataFrame) -> pd.DataFrame:
+    """``frame`` with any meaningful index moved into columns and string column names.
+
+    Every format in the bundle then carries the same columns.
+    """
+    if not isinstance(frame.index, pd.RangeIndex) or frame.index.name is not None:
+        frame = frame.reset_index()
+    return frame.set_axis([str(c) for c in frame.columns], axis=1)
+
+
+def _write_csv(out: BinaryIO, frame: pd.DataFrame, chunk_rows: int) -> None:
+    with io.TextIOWrapper(out, encoding="utf-8", newline="") as text:
+        for start in range(0, max(len(frame), 1), chunk_rows):
+            frame.iloc[start:start + chunk_rows].to_csv(text, header=start == 0, index=False)
+
+
+def _write_parquet(out: BinaryIO, frame: pd.DataFrame) -> None:
+    pa = require_pyarrow()
+    pa.parquet.write_table(pa.Table.from_pandas(frame, preserve_index=False), out)
+
+
+def write_bundle(
+    out: BinaryIO,
+    tables: Mapping[str, TableSource],
+    formats=EXPORT_FORMATS,
+    workbook_name: str = "tables.xlsx",
+    chunk_rows: int = CHUNK_ROWS,
+) -> None:
+    """Write ``tables`` (name -> frame or callable) to ``out`` as a ZIP bundle."""
+    frames = {name: flat_table(table() if callable(table) else table) for name, table in tables.items()}
+    with zipfile.ZipFile(out, "w", compression=zipfile.ZIP_DEFLATED) as bundle:
+        for name, frame in frames.items():
+            if "csv" in formats:
+                with bundle.open(f"csv/{name}.csv", "w") as entry:
+                    _write_csv(entry, frame, chunk_rows)
+            if "parquet" in formats:
+                with bundle.open(f"parquet/{name}.parquet", "w") as entry:
+                    _write_parquet(entry, frame)
+        if "xlsx" in formats:
+            with bundle.open(workbook_name, "w") as entry:
+                write_workbook(entry, frames, chunk_rows)
+
+
+def export_bundle(tables: Mapping[str, TableSource], formats=EXPORT_FORMATS, workbook_name: str = "tables.xlsx") -> BinaryIO:
+    """The bundle for ``tables`` as a file object positioned at the start."""
+    out = tempfile.SpooledTemporaryFile(max_size=SPOOL_BYTES)
+    write_bundle(out, tables, formats, workbook_name)
+    out.seek(0)
+    return out
@@ -0,0 +1,91 @@
+"""Precomputed per-dollar monthly payment factors.
+
+A payment factor is the monthly payment on one dollar financed, so any
+loan payment is ``amount * factor``. :func:`payment_factor_table` builds
+the factors once per process for every catalog term over an APR grid in
+0.01% steps (the precision rate sheets quote APRs to), with and without
+the 3-month payment deferral, and lookups are plain array indexing.
+"""
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from functools import lru_cache
+
+import numpy as np
+
+from .finance import payment
+from .programs import load_catalog
+from .reamortization import DEFERRAL_MONTHS
+
+APR_STEP = 0.01
+MAX_APR = 30.0
+
+
+def deferred_payment_factor(rate, nper, deferral_months: int = DEFERRAL_MONTHS):
+    """Factor when interest capitalizes for ``deferral_months`` before amortizing.
+
+    Same convention as the sfd4 Investment Overview: the balance compounds
+    for the deferral and is then repaid over the remaining ``nper`` months.
+    """
+    rate = np.asarray(rate, dtype=float)
+    return (1 + rate) ** deferral_months * payment(rate, np.asarray(nper) - deferral_months, 1.0)
+
+
+@dataclass(frozen=True)
+class PaymentFactorTable:
+    """Payment factors indexed by ``[deferral, term, APR step]``.
+
+    ``terms`` are loan terms in years; APR column ``j`` is ``j * APR_STEP``
+    percent. Use :meth:`factor` or :meth:`payment` rather than indexing
+    ``factors`` directly.
+    """
+
+    terms: tuple[int, ...]
+    factors: np.ndarray = field(repr=False, compare=False)
+    _term_index: dict[int, int] = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self):
+        object.__setattr__(self, "_term_index", {t: i for i, t in enumerate(self.terms)})
+
+    @classmethod
+    def build(cls, terms) -> "PaymentFactorTable":
+        terms = tuple(sorted({int(t) for t in terms}))
+        rates = np.arange(round(MAX_APR / APR_STEP) + 1) * APR_STEP / 100 / 12
+        nper = np.array(terms)[:, None] * 12
+        factors = np.stack([payment(rates, nper, 1.0), deferred_payment_factor(rates, nper)])
+        factors.setflags(write=False)
+        return cls(terms=terms, factors=factors)
+
+    def factor(self, term, apr, deferral: bool = False):
+        """Monthly payment per dollar for ``term`` years at ``apr`` percent.
+
+        Arguments broadcast. Terms outside the table or APRs off the 0.01%
+        grid fall back to computing the factor directly, so the answer is
+        always exact.
+        """
+        if np.ndim(term) == np.ndim(apr) == 0:
+            row = self._term_index.get(int(term), -1)
+            step = round(apr / APR_STEP)
+            if row >= 0 and 0 <= step < self.factors.shape[-1] and abs(step * APR_STEP - apr) < 1e-9:
+                return float(self.factors[int(deferral), row, step])
+        term, apr = np.broadcast_arrays(np.asarray(term), np.asarray(apr, dtype=float))
+        rows = np.array([self._term_index.get(int(t), -1) for t in term.ravel()]).reshape(term.shape)
+        steps = np.rint(apr / APR_STEP).astype(int)
+        hit = (rows >= 0) & (steps >= 0) & (steps < self.factors.shape[-1]) & np.isclose(steps * APR_STEP, apr)
+        result = self.factors[int(deferral), np.where(hit, rows, 0), np.where(hit, steps, 0)]
+        if not hit.all():
+            rate, nper = apr / 100 / 12, term * 12
+            exact = deferred_payment_factor(rate, nper) if deferral else payment(rate, nper, 1.0)
+            result = np.where(hit, result, exact)
+        return result if result.ndim else float(result)
+
+    def payment(self, amount, term, apr, deferral: bool = False):
+        """Monthly payment on ``amount`` financed; one multiply per loan."""
+        result = np.asarray(amount, dtype=float) * self.factor(term, apr, deferral)
+        return result if result.ndim else float(result)
+
+
+@lru_cache(maxsize=None)
+def payment_factor_table() -> PaymentFactorTable:
+    """Factor table covering every term in the program catalog, built once per process."""
+    return PaymentFactorTable.build(program[0] for program in load_catalog().programs)
@@ -0,0 +1,63 @@
+"""Time-value-of-money helpers shared by the pricing code.
+
+These mirror the ``numpy_financial`` calls the dashboards used (``pmt``,
+``npv``) but broadcast over NumPy arrays so the same function prices one
+proposal or a whole grid of them. :func:`irr` and :func:`get_payback` take
+the closed-form path in :mod:`sfd_engine.annuity` when the series is an
+annuity and only fall back to the general algorithms otherwise.
+"""
+from __future__ import annotations
+
+import numpy as np
+from numpy_financial import irr as _np_irr
+
+from .annuity import annuity_irr, annuity_payback, as_annuity
+
+
+def payment(rate, nper, principal):
+    """Level payment that amortizes ``principal`` over ``nper`` periods.
+
+    Equivalent to ``abs(numpy_financial.pmt(rate, nper, principal))``.
+    Arguments broadcast; scalars in give a float back.
+    """
+    rate = np.asarray(rate, dtype=float)
+    nper = np.asarray(nper, dtype=float)
+    principal = np.asarray(principal, dtype=float)
+    growth = (1 + rate) ** nper
+    with np.errstate(divide="ignore", invalid="ignore"):
+        factor = np.where(rate == 0, 1 / nper, rate * growth / (growth - 1))
+    result = np.abs(principal * factor)
+    return result if result.ndim else float(result)
+
+
+def npv(rate, values):
+    """Net present value with the first value at t=0 (``numpy_financial`` convention).
+
+    ``values`` may be 2-D, in which case each row is discounted separately.
+    """
+    values = np.asarray(values, dtype=float)
+    discount = (1 + np.asarray(rate, dtype=float)[..., None]) ** -np.arange(values.shape[-1])
+    result = (values * discount).sum(axis=-1)
+    return result if result.ndim else float(result)
+
+
+def irr(values):
+    """Internal rate of return of a single cash-flow series."""
+    shape = as_annuity(values)
+    if shape is not None:
+        return annuity_irr(*shape)
+    return float(_np_irr(values))
+
+
+def get_payback(cash_flows):
+    """Index of the first period whose cumulative cash flow is non-negative.
+
+    Returns ``None`` when the series never pays back.
+    """
+    shape = as_annuity(cash_flows)
+    if shape is not None:
+        period = annuity_payback(*shape)
+        return None if np.isnan(period) else int(period)
+    cum = np.cumsum(cash_flows)
+    hits = np.flatnonzero(cum >= 0)
+    return int(hits[0]) if hits.size else None
@@ -0,0 +1,200 @@
+"""Monte Carlo risk mode for a priced proposal.
+
+The deterministic Company tab figures assume the proposal's fixed utility
+escalation and degradation (flat savings of ``electric_bill * 12`` a year
+by default), incentives received at install, and a fixed 5% discount rate. :func:`simulate_risk` instead draws one utility
+escalation rate, panel degradation rate, incentive delay and discount rate
+per path and returns the NPV, IRR and payback of every path.
+
+With a constant escalation ``e`` and degradation ``d`` a path's savings are
+a geometric series growing at ``(1 + e)(1 - d) - 1``, so its NPV is a
+closed-form escalating annuity plus the discounted incentive cheque, and
+its IRR is found by bisection on that closed form for all paths at once.
+Nothing loops over paths; 10,000 paths take a few tens of milliseconds.
+
+A quote priced from hourly production already degrades its simulated
+output at the proposal's degradation rate. Its paths grow the first-year
+savings at that fixed rate instead of a drawn one, so degradation is
+counted once.
+"""
+from __future__ import annotations
+
+import os
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+
+import numpy as np
+import pandas as pd
+
+from .annuity import annuity_factor
+from .pricing import NPV_RATE, ProposalResult
+
+PERCENTILES = (10, 50, 90)
+_IRR_BRACKET = (-0.99, 10.0)
+_BISECT_STEPS = 60
+
+
+@dataclass(frozen=True)
+class RiskAssumptions:
+    """Distributions the simulation draws from; rates are fractions per year.
+
+    Escalation, degradation and discount rate are normal; degradation is
+    floored at zero. The incentive cheque arrives ``incentive_delay_years``
+    after install, drawn with ``incentive_delay_weights``.
+    """
+
+    escalation_mean: float = 0.04
+    escalation_sd: float = 0.015
+    degradation_mean: float = 0.005
+    degradation_sd: float = 0.002
+    discount_mean: float = NPV_RATE
+    discount_sd: float = 0.01
+    incentive_delay_years: tuple[int, ...] = (0, 1, 2)
+    incentive_delay_weights: tuple[float, ...] = (0.25, 0.5, 0.25)
+
+
+@dataclass(frozen=True)
+class RiskResult:
+    """Per-path outcomes of :func:`simulate_risk`."""
+
+    npv: np.ndarray = field(repr=False)
+    irr: np.ndarray = field(repr=False)
+    # NaN where the path never pays back within the term
+    payback_year: np.ndarray = field(repr=False)
+    # Cumulative cash flow per path (rows) and year 0..term (columns)
+    cumulative: np.ndarray = field(repr=False)
+
+    @property
+    def paths(self) -> int:
+        return len(self.npv)
+
+    def percentiles(self) -> pd.DataFrame:
+        """P10/P50/P90 of NPV, IRR and payback, one row per metric."""
+        columns = [f"P{p}" for p in PERCENTILES]
+        return pd.DataFrame(
+            [
+                np.percentile(self.npv, PERCENTILES),
+                np.nanpercentile(self.irr, PERCENTILES),
+                # Paths that never pay back count as the worst outcome
+                np.percentile(np.where(np.isnan(self.payback_year), np.inf, self.payback_year), PERCENTILES),
+            ],
+            index=["NPV", "IRR", "Payback (years)"],
+            columns=columns,
+        )
+
+    def bands(self) -> pd.DataFrame:
+        """P10/P50/P90 cumulative cash flow for each year, for band charts."""
+        bands = np.percentile(self.cumulative, PERCENTILES, axis=0).T
+        frame = pd.DataFrame(bands, columns=[f"P{p}" for p in PERCENTILES])
+        frame.index.name = "Year"
+        return frame.reset_index()
+
+    def probability_of_payback(self) -> float:
+        return float(np.mean(~np.isnan(self.payback_year)))
+
+
+def _draw(
+    assumptions: RiskAssumptions, paths: int, rng: np.random.Generator, degradation: float | None = None
+) -> tuple[np.ndarray, ...]:
+    a = assumptions
+    escalation = rng.normal(a.escalation_mean, a.escalation_sd, paths)
+    # Drawn even when fixed, so the other draws do not depend on the mode
+    drawn = np.maximum(rng.normal(a.degradation_mean, a.degradation_sd, paths), 0.0)
+    degradation = drawn if degradation is None else np.full(paths, degradation)
+    discount = rng.normal(a.discount_mean, a.discount_sd, paths)
+    weights = np.asarray(a.incentive_delay_weights, dtype=float)
+    delay = rng.choice(np.asarray(a.incentive_delay_years), size=paths, p=weights / weights.sum())
+    growth = (1 + escalation) * (1 - degradation) - 1
+    return growth, discount, delay
+
+
+def _path_npv(rate, cost, credits, delay, savings, years, growth):
+    """NPV of ``-cost`` now, ``credits`` at ``delay`` and growing savings, per path."""
+    return -cost + credits * (1 + rate) ** -delay + savings * annuity_factor(rate, years, growth)
+
+
+def _path_irr(cost, credits, delay, savings, years, growth):
+    # Every flow after t=0 is non-negative, so NPV falls monotonically in the
+    # rate and bisection on the closed form finds the single root.
+    lo = np.full(growth.shape, _IRR_BRACKET[0])
+    hi = np.full(growth.shape, _IRR_BRACKET[1])
+    with np.errstate(all="ignore"):
+        ok = (_path_npv(lo, cost, credits, delay, savings, years, growth) >= 0) & (
+            _path_npv(hi, cost, credits, delay, savings, years, growth) <= 0
+        )
+        for _ in range(_BISECT_STEPS):
+            mid = (lo + hi) / 2
+            above = _path_npv(mid, cost, credits, delay, savings, years, growth) > 0
+            lo = np.where(above, mid, lo)
+            hi = np.where(above, hi, mid)
+    return np.where(ok, (lo + hi) / 2, np.nan)
+
+
+def _production_degradation(quote: ProposalResult) -> float | None:
+    """Yearly degradation of an hourly-production quote's output, or None for flat savings."""
+    production = quote.production_kwh
+    if production is None:
+        return None
+    if len(production) < 2:
+        return 0.0
+    return float(1 - production[1].sum() / production[0].sum())
+
+
+def _simulate(quote: ProposalResult, assumptions: RiskAssumptions, paths: int, seed) -> RiskResult:
+    rng = np.random.default_rng(seed)
+    # Hourly production is already degraded at a fixed rate; don't draw another
+    growth, discount, delay = _draw(assumptions, paths, rng, _production_degradation(quote))
+    years = quote.years
+    cost = quote.gross_cost
+    credits = quote.gross_cost - quote.adjusted_system_cost
+    savings = quote.annual_savings
+
+    t = np.arange(years + 1)
+    yearly = savings * (1 + growth[:, None]) ** np.maximum(t - 1, 0)
+    yearly[:, 0] = 0.0
+    cumulative = -cost + np.cumsum(yearly, axis=1) + credits * (t >= delay[:, None])
+    paid = cumulative >= 0
+    payback = np.where(paid.any(axis=1), paid.argmax(axis=1), np.nan)
+
+    return RiskResult(
+        npv=_path_npv(discount, cost, credits, delay, savings, years, growth),
+        irr=_path_irr(cost, credits, delay, savings, years, growth),
+        payback_year=payback.astype(float),
+        cumulative=cumulative,
+    )
+
+
+def _simulate_chunk(job) -> RiskResult:
+    return _simulate(*job)
+
+
+def simulate_risk(
+    quote: ProposalResult,
+    assumptions: RiskAssumptions = RiskAssumptions(),
+    paths: int = 10_000,
+    seed: int | None = 0,
+    workers: int | None = 0,
+) -> RiskResult:
+    """Simulate ``paths`` outcomes of a priced proposal.
+
+    Quotes priced from hourly production keep the production model's
+    degradation instead of drawing one (see the module docstring).
+
+    ``workers=0`` runs in the calling process, which is the right choice
+    for interactive path counts; larger runs can be split across a process
+    pool (``None`` for one worker per CPU), each worker drawing from an
+    independent child of ``seed``.
+    """
+    if workers == 0:
+        return _simulate(quote, assumptions, paths, seed)
+    workers = workers or os.cpu_count() or 1
+    sizes = np.diff(np.linspace(0, paths, workers + 1).astype(int))
+    seeds = np.random.SeedSequence(seed).spawn(workers)
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        parts = list(executor.map(_simulate_chunk, [(quote, assumptions, int(n), s) for n, s in zip(sizes, seeds)]))
+    return RiskResult(
+        npv=np.concatenate([p.npv for p in parts]),
+        irr=np.concatenate([p.irr for p in parts]),
+        payback_year=np.concatenate([p.payback_year for p in parts]),
+        cumulative=np.concatenate([p.cumulative for p in parts]),
+    )
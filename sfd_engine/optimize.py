@@ -0,0 +1,110 @@
+"""Search the program catalog for the loans that fit a customer's targets.
+
+:func:`search_programs` prices every ``(loan program, project discount)``
+combination in one :func:`~sfd_engine.batch.price_batch` call, drops the
+ones that miss the targets, and marks the Pareto frontier of customer
+monthly payment (lower is better) against company revenue (higher is
+better): the programs a rep should actually choose between.
+"""
+from __future__ import annotations
+
+from dataclasses import asdict
+
+import numpy as np
+import pandas as pd
+
+from .annuity import annuity_factor
+from .batch import price_batch
+from .pricing import ProposalInputs
+from .programs import LOAN_PROFILES, program_label
+
+# Project discounts searched by default: the sidebar slider's whole range.
+DISCOUNT_RANGE = tuple(range(0, 101))
+SAVINGS_YEARS = 25
+
+SEARCH_COLUMNS = (
+    "program",
+    "loan_term",
+    "loan_apr",
+    "dealer_fee",
+    "project_discount_pct",
+    "monthly_payment",
+    "company_revenue",
+    "savings_25yr",
+    "npv",
+    "pareto",
+)
+
+
+def pareto_mask(payment: np.ndarray, revenue: np.ndarray) -> np.ndarray:
+    """Rows no other row beats on both lower ``payment`` and higher ``revenue``."""
+    order = np.lexsort((-revenue, payment))
+    best_before = np.maximum.accumulate(np.concatenate([[-np.inf], revenue[order][:-1]]))
+    mask = np.zeros(len(payment), dtype=bool)
+    mask[order] = revenue[order] > best_before
+    return mask
+
+
+def search_programs(
+    inputs: ProposalInputs,
+    max_payment: float | None = None,
+    min_savings: float | None = None,
+    min_revenue: float | None = None,
+    programs: list[tuple[int, float, float]] = LOAN_PROFILES,
+    discounts=DISCOUNT_RANGE,
+) -> pd.DataFrame:
+    """Programs and discounts that meet every target, cheapest payment first.
+
+    ``savings_25yr`` is the customer's 25-year bill savings less everything
+    paid on the loan. The program fields and ``project_discount_pct`` of
+    ``inputs`` are ignored; every ``programs`` x ``discounts`` pair is tried.
+    The ``pareto`` column marks the payment/revenue frontier among the rows
+    that meet the targets. Savings are valued at the flat monthly bill,
+    grown by ``inputs``' utility escalation and degradation, as in
+    :func:`~sfd_engine.batch.price_batch`, even when ``inputs`` asks for
+    hourly production.
+    """
+    terms, aprs, fees = (np.array(col) for col in zip(*programs))
+    discounts = np.asarray(discounts, dtype=float)
+    fields = asdict(inputs)
+    for name in (
+        "loan_term", "loan_apr", "dealer_fee", "project_discount_pct", "lease_rate", "lease_base",
+        "hourly_production", "tilt", "azimuth", "tariff",
+    ):
+        fields.pop(name)
+    priced = price_batch(
+        loan_term=terms[:, None],
+        loan_apr=aprs[:, None],
+        dealer_fee=fees[:, None],
+        project_discount_pct=discounts[None, :],
+        **fields,
+    )
+    payment = priced["monthly_payment"]
+    revenue = priced["company_revenue"]
+    growth = (1 + inputs.utility_escalation / 100) * (1 - inputs.degradation / 100) - 1
+    bill_savings = inputs.electric_bill * 12 * annuity_factor(0.0, SAVINGS_YEARS, growth)
+    savings = bill_savings - payment * priced["loan_term"] * 12
+
+    keep = np.ones(payment.shape, dtype=bool)
+    if max_payment is not None:
+        keep &= payment <= max_payment
+    if min_savings is not None:
+        keep &= savings >= min_savings
+    if min_revenue is not None:
+        keep &= revenue >= min_revenue
+
+    program_index = np.repeat(np.arange(len(programs)), len(discounts))[keep]
+    labels = np.array([program_label(*p) for p in programs], dtype=object)
+    frame = pd.DataFrame({
+        "program": labels[program_index],
+        "loan_term": priced["loan_term"][keep],
+        "loan_apr": priced["loan_apr"][keep],
+        "dealer_fee": priced["dealer_fee"][keep],
+        "project_discount_pct": np.tile(discounts, len(programs))[keep],
+        "monthly_payment": payment[keep],
+        "company_revenue": revenue[keep],
+        "savings_25yr": savings[keep],
+        "npv": priced["npv"][keep],
+        "pareto": pareto_mask(payment[keep], revenue[keep]),
+    })
+    return frame.sort_values(["monthly_payment", "company_revenue"], ascending=[True, False], ignore_index=True)
@@ -0,0 +1,197 @@
+"""A small PDF writer for server-side proposal documents.
+
+Supports only what the proposal layouts need: US Letter pages of text in
+Helvetica and Helvetica-Bold, plus rules and shaded boxes. Both fonts are
+among the PDF standard fonts every viewer ships with, so nothing is
+embedded and a one-page proposal is a few kilobytes. No third-party PDF
+library or browser is needed.
+
+A page is laid out once as a :class:`PageLayout`. Fixed text is plain
+strings and variable text is a :class:`Field`. :meth:`PageLayout.compile`
+turns the fixed part into PDF drawing operators up front. Rendering a
+proposal then only formats the fields and joins bytes.
+"""
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Mapping, Sequence
+
+PAGE_WIDTH = 612.0   # US Letter, in points
+PAGE_HEIGHT = 792.0
+
+# Advance widths (1/1000 em) of characters 32-126, from the Adobe core font metrics.
+_HELVETICA_WIDTHS = (
+    278, 278, 355, 556, 556, 889, 667, 222, 333, 333, 389, 584, 278, 333, 278, 278,
+    556, 556, 556, 556, 556, 556, 556, 556, 556, 556, 278, 278, 584, 584, 584, 556,
+    1015, 667, 667, 722, 722, 667, 611, 778, 722, 278, 500, 667, 556, 833, 722, 778,
+    667, 778, 722, 667, 611, 722, 667, 944, 667, 667, 611, 278, 278, 278, 469, 556,
+    222, 556, 556, 500, 556, 556, 278, 556, 556, 222, 222, 500, 222, 833, 556, 556,
+    556, 556, 333, 500, 278, 556, 500, 722, 500, 500, 500, 334, 260, 334, 584,
+)
+_HELVETICA_BOLD_WIDTHS = (
+    278, 333, 474, 556, 556, 889, 722, 278, 333, 333, 389, 584, 278, 333, 278, 278,
+    556, 556, 556, 556, 556, 556, 556, 556, 556, 556, 333, 333, 584, 584, 584, 611,
+    975, 722, 722, 722, 722, 667, 611, 778, 722, 278, 556, 722, 611, 833, 722, 778,
+    667, 778, 722, 667, 611, 722, 667, 944, 667, 667, 611, 333, 278, 333, 584, 556,
+    278, 556, 611, 556, 611, 556, 333, 611, 611, 278, 278, 556, 278, 889, 611, 611,
+    611, 611, 389, 556, 333, 611, 556, 778, 556, 556, 500, 389, 280, 389, 584,
+)
+_DEFAULT_WIDTH = 556  # characters outside printable ASCII
+
+# font name -> (resource name, PDF base font, widths)
+FONTS = {
+    "regular": ("F1", "Helvetica", _HELVETICA_WIDTHS),
+    "bold": ("F2", "Helvetica-Bold", _HELVETICA_BOLD_WIDTHS),
+}
+TEXT_GRAY = 0.2  # #333, as in the HTML overview
+
+
+def text_width(text: str, font: str = "regular", size: float = 10) -> float:
+    """Width of ``text`` in points when set in ``font`` at ``size``."""
+    widths = FONTS[font][2]
+    total = sum(widths[ord(c) - 32] if 32 <= ord(c) <= 126 else _DEFAULT_WIDTH for c in text)
+    return total * size / 1000
+
+
+def wrap_text(text: str, width: float, font: str = "regular", size: float = 10) -> list[str]:
+    """Break ``text`` into lines no wider than ``width`` points, at spaces."""
+    lines: list[str] = []
+    line = ""
+    for word in text.split():
+        candidate = f"{line} {word}" if line else word
+        if line and text_width(candidate, font, size) > width:
+            lines.append(line)
+            line = word
+        else:
+            line = candidate
+    if line:
+        lines.append(line)
+    return lines
+
+
+def _escape(text: str) -> bytes:
+    encoded = text.encode("cp1252", errors="replace")
+    return encoded.replace(b"\\", b"\\\\").replace(b"(", b"\\(").replace(b")", b"\\)")
+
+
+def _text_op(x: float, top: float, text: str, font: str, size: float, align: str) -> bytes:
+    if align == "right":
+        x -= text_width(text, font, size)
+    elif align == "center":
+        x -= text_width(text, font, size) / 2
+    resource = FONTS[font][0]
+    return b"BT /%s %g Tf %.2f %.2f Td (%s) Tj ET\n" % (
+        resource.encode(), size, x, PAGE_HEIGHT - top, _escape(text)
+    )
+
+
+@dataclass(frozen=True)
+class Field:
+    """A named slot in a layout, filled in when the page is rendered."""
+
+    name: str
+
+
+@dataclass(frozen=True)
+class _Slot:
+    field: str
+    x: float
+    top: float
+    font: str
+    size: float
+    align: str
+
+
+@dataclass(frozen=True)
+class CompiledPage:
+    """A page layout with its fixed content already encoded."""
+
+    static: bytes
+    slots: tuple[_Slot, ...]
+
+    @property
+    def fields(self) -> tuple[str, ...]:
+        return tuple(dict.fromkeys(slot.field for slot in self.slots))
+
+    def render(self, values: Mapping[str, str]) -> bytes:
+        """Content stream with every :class:`Field` replaced by ``values[name]``."""
+        parts = [self.static]
+        parts.extend(
+            _text_op(s.x, s.top, values[s.field], s.font, s.size, s.align) for s in self.slots
+        )
+        return b"".join(parts)
+
+
+class PageLayout:
+    """Records drawing operations for one page.
+
+    Positions are in points; ``top`` is measured down from the top edge of
+    the page, so layouts read top to bottom. ``align`` anchors text at
+    ``x`` by its left edge, right edge or centre.
+    """
+
+    def __init__(self):
+        self._shapes: list[bytes] = []
+        self._text: list[bytes] = []
+        self._slots: list[_Slot] = []
+
+    def text(self, x: float, top: float, text: str | Field, font: str = "regular", size: float = 10, align: str = "left") -> None:
+        if isinstance(text, Field):
+            self._slots.append(_Slot(text.name, x, top, font, size, align))
+        else:
+            self._text.append(_text_op(x, top, text, font, size, align))
+
+    def line(self, x1: float, top1: float, x2: float, top2: float, width: float = 0.5, gray: float = 0.7) -> None:
+        self._shapes.append(
+            b"q %g G %g w %.2f %.2f m %.2f %.2f l S Q\n"
+            % (gray, width, x1, PAGE_HEIGHT - top1, x2, PAGE_HEIGHT - top2)
+        )
+
+    def rect(self, x: float, top: float, width: float, height: float, gray: float = 0.94) -> None:
+        """A filled box; drawn beneath all text."""
+        self._shapes.append(
+            b"q %g g %.2f %.2f %.2f %.2f re f Q\n" % (gray, x, PAGE_HEIGHT - top - height, width, height)
+        )
+
+    def compile(self) -> CompiledPage:
+        static = b"".join([*self._shapes, b"%g g\n" % TEXT_GRAY, *self._text])
+        return CompiledPage(static=static, slots=tuple(self._slots))
+
+
+def _pdf_string(text: str) -> bytes:
+    return b"(" + _escape(text) + b")"
+
+
+def build_pdf(pages: Sequence[bytes], title: str = "") -> bytes:
+    """Assemble page content streams into a complete PDF file."""
+    font_ids = {name: 3 + i for i, name in enumerate(FONTS)}
+    first_page_id = 3 + len(FONTS) + 1
+    page_ids = [first_page_id + 2 * i for i in range(len(pages))]
+    fonts = b" ".join(b"/%s %d 0 R" % (FONTS[name][0].encode(), font_ids[name]) for name in FONTS)
+
+    objects = [
+        b"<< /Type /Catalog /Pages 2 0 R >>",
+        b"<< /Type /Pages /Kids [%s] /Count %d /MediaBox [0 0 %g %g] >>"
+        % (b" ".join(b"%d 0 R" % i for i in page_ids), len(pages), PAGE_WIDTH, PAGE_HEIGHT),
+        *(
+            b"<< /Type /Font /Subtype /Type1 /BaseFont /%s /Encoding /WinAnsiEncoding >>" % base.encode()
+            for _, base, _ in FONTS.values()
+        ),
+        b"<< /Title %s /Producer (sfd_engine) >>" % _pdf_string(title),
+    ]
+    for page_id, content in zip(page_ids, pages):
+        objects.append(b"<< /Type /Page /Parent 2 0 R /Resources << /Font << %s >> >> /Contents %d 0 R >>" % (fonts, page_id + 1))
+        objects.append(b"<< /Length %d >>\nstream\n%s\nendstream" % (len(content), content))
+
+    out = bytearray(b"%PDF-1.4\n%\xe2\xe3\xcf\xd3\n")
+    offsets = []
+    for number, body in enumerate(objects, start=1):
+        offsets.append(len(out))
+        out += b"%d 0 obj\n%s\nendobj\n" % (number, body)
+    xref = len(out)
+    out += b"xref\n0 %d\n0000000000 65535 f \n" % (len(objects) + 1)
+    out += b"".join(b"%010d 00000 n \n" % offset for offset in offsets)
+    out += b"trailer\n<< /Size %d /Root 1 0 R /Info %d 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (
+        len(objects) + 1, first_page_id - 1, xref
+    )
+    return bytes(out)
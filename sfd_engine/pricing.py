@@ -0,0 +1,425 @@
+"""Headless proposal pricing.
+
+Everything the dashboards used to compute at module level under ``st.*``
+widgets lives here as plain functions over a :class:`ProposalInputs`, so the
+same math can run in a batch job, a worker pool or a test without Streamlit.
+"""
+from __future__ import annotations
+
+import threading
+from dataclasses import dataclass, field, fields
+
+import numpy as np
+
+from .cashflows import UTILITY_ESCALATION, CashFlowTable
+from .dataflow import Dataflow, NodeTiming
+from .finance import get_payback, irr, npv, payment
+from .production import DEFAULT_AZIMUTH, DEFAULT_TILT, hourly_production_by_year, monthly_production
+from .reamortization import incentive_paydown_payments
+from .tariffs import solar_bills, solar_savings, tariff_for
+
+# Discount rate used for the Company tab NPV metric.
+NPV_RATE = 0.05
+
+# Fixed incentive amounts shown on the sfd4 Investment Overview.
+NYS_CREDIT = 5000
+NYC_ABATEMENT = 34356
+
+
+@dataclass(frozen=True)
+class ProposalInputs:
+    """Sidebar inputs for one proposal plus the selected loan program.
+
+    ``loan_apr``, ``dealer_fee`` and ``project_discount_pct`` are percentages
+    (``5.99`` means 5.99%), exactly as they appear in the loan program list.
+    """
+
+    system_size_kw: float
+    cost_per_watt: float
+    electric_bill: float
+    loan_term: int
+    loan_apr: float
+    dealer_fee: float
+    roof_cost: float = 0.0
+    battery_cost: float = 0.0
+    lease_rate: float = 0.028
+    lease_base: float = 110.0
+    state: str = "NY"
+    lease_eligible: bool = True
+    incentives_applied: bool = True
+    include_incentives: bool = True
+    project_discount_pct: float = 0.0
+    # Value savings from simulated hourly production instead of the flat bill
+    hourly_production: bool = False
+    tilt: float = DEFAULT_TILT
+    azimuth: float = DEFAULT_AZIMUTH
+    # Key in data/tariffs.json the hourly savings are billed on; "" for the state's default
+    tariff: str = ""
+    # Yearly growth of savings with utility rates, and loss to panel degradation (%/yr).
+    # With hourly production, ``degradation`` degrades the simulated output instead of the savings.
+    utility_escalation: float = 0.0
+    degradation: float = 0.0
+
+
+@dataclass(frozen=True)
+class ProposalResult:
+    """Customer and company figures for one :class:`ProposalInputs`."""
+
+    # Customer Outputs
+    base_price: float
+    discounted_project_cost: float
+    nys_incentive: float
+    loan_amount_customer: float
+    monthly_payment: float
+    cash_total_cost: float
+    cash_payback_years: float
+    lease_payments: tuple[float, float, float]
+
+    # Company Facing Data
+    base_cost: float
+    discounted_base_cost: float
+    gross_cost: float
+    discounted_gross_cost: float
+    company_revenue: float
+    federal_tax_credit: float
+    battery_credit: float
+    ny_solar_credit: float
+    loan_base_payment: float
+    loan_adj_payment: float
+    base_bill: float
+    lease_discount_7: float
+    lease_discount_15: float
+    annual_savings: float
+    monthly_savings: float
+    adjusted_system_cost: float
+    cash_flows: np.ndarray = field(repr=False)
+    monthly_cash_flows: np.ndarray = field(repr=False)
+    cash_flow_table: CashFlowTable = field(repr=False)
+    npv: float
+    roi: float
+    irr: float
+    payback_year: int | None
+    # AC kWh by [year, month] when priced from hourly production
+    production_kwh: np.ndarray | None = field(repr=False)
+
+    @property
+    def years(self) -> int:
+        return len(self.cash_flows) - 1
+
+    @property
+    def incentive_applied(self) -> float:
+        return self.battery_credit + self.ny_solar_credit
+
+    @property
+    def payback_label(self) -> str:
+        """Payback as the dashboards display it, e.g. ``13`` or ``>25``."""
+        return str(self.payback_year) if self.payback_year is not None else f">{self.years}"
+
+
+def loan_amount(inputs: ProposalInputs) -> float:
+    """Amount the customer finances: system plus roof cost, less the project discount."""
+    base_price = inputs.system_size_kw * 1000 * inputs.cost_per_watt
+    return (base_price + inputs.roof_cost) * (1 - inputs.project_discount_pct / 100)
+
+
+def _proposal_flow() -> Dataflow:
+    """One node per :class:`ProposalResult` figure, plus the shared rates."""
+    flow = Dataflow(f.name for f in fields(ProposalInputs))
+    node = flow.node
+
+    @node
+    def discount(project_discount_pct):
+        return 1 - project_discount_pct / 100
+
+    @node
+    def fee(dealer_fee):
+        return dealer_fee / 100
+
+    @node
+    def incentives(incentives_applied):
+        return 1 if incentives_applied else 0
+
+    # Customer Outputs
+    @node
+    def base_price(system_size_kw, cost_per_watt):
+        return system_size_kw * 1000 * cost_per_watt
+
+    @node
+    def discounted_project_cost(base_price, roof_cost, discount):
+        return (base_price + roof_cost) * discount
+
+    @node
+    def nys_incentive(system_size_kw):
+        return system_size_kw * 1000 * 0.2
+
+    @node
+    def loan_amount_customer(discounted_project_cost):
+        return discounted_project_cost
+
+    @node
+    def monthly_payment(loan_apr, loan_term, loan_amount_customer):
+        return payment(loan_apr / 100 / 12, loan_term * 12, loan_amount_customer)
+
+    @node
+    def cash_total_cost(discounted_project_cost, nys_incentive):
+        return discounted_project_cost - nys_incentive
+
+    @node
+    def cash_payback_years(base_price, nys_incentive, electric_bill):
+        return round((base_price - nys_incentive) / (electric_bill * 12), 1)
+
+    @node
+    def lease_payments(lease_base, lease_rate):
+        return (
+            lease_base,
+            round(lease_base * (1 + lease_rate), 2),
+            round(lease_base * (1 + lease_rate) ** 2, 2),
+        )
+
+    # Company Facing Data
+    @node
+    def base_cost(cost_per_watt, system_size_kw, battery_cost):
+        return cost_per_watt * 1000 * system_size_kw - battery_cost
+
+    @node
+    def discounted_base_cost(base_cost, discount):
+        return base_cost * discount
+
+    @node
+    def gross_cost(base_cost, fee):
+        return base_cost / (1 - fee)
+
+    @node
+    def discounted_gross_cost(gross_cost, discount):
+        return gross_cost * discount
+
+    @node
+    def company_revenue(discounted_gross_cost, discounted_base_cost):
+        return discounted_gross_cost - discounted_base_cost
+
+    @node
+    def federal_tax_credit(lease_eligible, cost_per_watt, system_size_kw, fee):
+        if lease_eligible:
+            return 0.0
+        capped_size = min(system_size_kw, 8)
+        return ((cost_per_watt * 1000 * capped_size) / (1 - fee)) * 0.3
+
+    @node
+    def battery_credit(gross_cost, battery_cost, incentives):
+        return ((gross_cost + battery_cost) * 0.3) * incentives
+
+    @node
+    def ny_solar_credit(gross_cost, battery_cost, state, incentives):
+        return (min(5000, (gross_cost + battery_cost) * 0.25) if state == "NY" else 0) * incentives
+
+    @node
+    def loan_base_payment(loan_apr, loan_term, gross_cost):
+        return payment(loan_apr / 100 / 11.15, loan_term * 12, gross_cost)
+
+    @node
+    def loan_adj_payment(loan_apr, loan_term, gross_cost, battery_credit, ny_solar_credit):
+        return payment(loan_apr / 100 / 11, loan_term * 12, gross_cost - (battery_credit + ny_solar_credit))
+
+    @node
+    def base_bill(electric_bill):
+        return electric_bill * 1.15
+
+    @node
+    def lease_discount_7(base_bill):
+        return base_bill * (1 - 0.07)
+
+    @node
+    def lease_discount_15(base_bill):
+        return base_bill * (1 - 0.15)
+
+    @node
+    def production_kwh(hourly_production, system_size_kw, loan_term, state, tilt, azimuth, degradation):
+        if not hourly_production:
+            return None
+        production = monthly_production(system_size_kw, loan_term, state, tilt, azimuth, degradation / 100)
+        production.flags.writeable = False
+        return production
+
+    @node
+    def savings_schedule(
+        hourly_production, system_size_kw, loan_term, state, tilt, azimuth, degradation, electric_bill, tariff
+    ):
+        """Savings by [year, month], or None for the flat ``electric_bill`` every month."""
+        if not hourly_production:
+            return None
+        production = hourly_production_by_year(system_size_kw, loan_term, state, tilt, azimuth, degradation / 100)
+        savings = solar_savings(electric_bill, production, tariff_for(state, tariff))
+        savings.flags.writeable = False
+        return savings
+
+    @node
+    def annual_savings(electric_bill, savings_schedule):
+        if savings_schedule is None:
+            return electric_bill * 12
+        return float(savings_schedule[0].sum())
+
+    @node(name="monthly_savings")
+    def monthly_savings_(electric_bill, savings_schedule):
+        if savings_schedule is None:
+            return electric_bill
+        return float(savings_schedule[0].mean())
+
+    @node
+    def adjusted_system_cost(gross_cost, federal_tax_credit, battery_credit, ny_solar_credit, include_incentives):
+        credits = federal_tax_credit + battery_credit + ny_solar_credit if include_incentives else 0
+        return gross_cost - credits
+
+    @node
+    def cash_flow_table(loan_term, monthly_savings, savings_schedule, adjusted_system_cost, utility_escalation, degradation):
+        hourly = savings_schedule is not None
+        return CashFlowTable.build(
+            savings_schedule if hourly else monthly_savings,
+            loan_term,
+            utility_escalation=utility_escalation / 100,
+            # An hourly schedule is already degraded through its production
+            degradation=0.0 if hourly else degradation / 100,
+            system_cost=adjusted_system_cost,
+        )
+
+    @node
+    def cash_flows(cash_flow_table):
+        return cash_flow_table.annual_net
+
+    @node
+    def monthly_cash_flows(cash_flow_table):
+        return cash_flow_table.net
+
+    @node(name="npv")
+    def npv_(cash_flows):
+        return npv(NPV_RATE, cash_flows)
+
+    @node
+    def roi(cash_flows, adjusted_system_cost):
+        return (cash_flows[1:].sum() - adjusted_system_cost) / adjusted_system_cost
+
+    @node(name="irr")
+    def irr_(cash_flows):
+        return irr(cash_flows)
+
+    @node
+    def payback_year(cash_flows):
+        return get_payback(cash_flows)
+
+    return flow
+
+
+# Dependency graph behind price_proposal and ProposalModel.
+PROPOSAL_FLOW = _proposal_flow()
+_INPUT_FIELDS = PROPOSAL_FLOW.inputs
+_RESULT_FIELDS = tuple(f.name for f in fields(ProposalResult))
+
+
+class ProposalModel:
+    """Prices a sequence of proposals, recomputing only what each change affects.
+
+    Keep one per dashboard session or batch worker. Changing
+    ``battery_cost``, say, recomputes ``base_cost``, ``gross_cost``, the
+    credits, ``adjusted_system_cost`` and the cash-flow metrics; the
+    customer loan payment and lease figures are reused. ``trace`` lists
+    the nodes the last :meth:`price` touched and their timings.
+    """
+
+    def __init__(self):
+        self.evaluator = PROPOSAL_FLOW.evaluator()
+
+    @property
+    def trace(self) -> list[NodeTiming]:
+        """Nodes the last :meth:`price` recomputed or verified, in evaluation order."""
+        return self.evaluator.trace
+
+    def price(self, inputs: ProposalInputs) -> ProposalResult:
+        self.evaluator.set({name: getattr(inputs, name) for name in _INPUT_FIELDS})
+        return ProposalResult(**self.evaluator.get_many(_RESULT_FIELDS))
+
+
+# One ProposalModel per thread behind price_proposal
+_models = threading.local()
+
+
+def price_proposal(inputs: ProposalInputs) -> ProposalResult:
+    """Price one proposal.
+
+    Each thread reuses its own :class:`ProposalModel`, so a run of calls
+    that differ in a few inputs (a batch of leads, a parameter sweep) only
+    recomputes the figures those inputs feed.
+    """
+    model = getattr(_models, "model", None)
+    if model is None:
+        model = _models.model = ProposalModel()
+    return model.price(inputs)
+
+
+@dataclass(frozen=True)
+class InvestmentOverview:
+    """Figures behind the sfd4 Investment Overview (incentive paydown table)."""
+
+    system_cost: float
+    spring_discount: float
+    itc: float
+    nys_credit: float
+    nyc_abatement: float
+    loan_amount: float
+    # Monthly payment per OVERVIEW_SCENARIOS row and OVERVIEW_PERIODS window
+    period_payments: tuple[tuple[float, ...], ...]
+    deferral: bool
+    total_tax_incentives: float
+    net_investment: float
+    total_25yr_net_savings: float
+    # Average first-year monthly utility bill with the system, from the tariff engine
+    utility_bill_with_solar: float
+    # Monthly payment once every incentive has been applied (last row, last period)
+    payment_after_incentives: float
+
+
+def investment_overview(inputs: ProposalInputs, deferral: bool = True) -> InvestmentOverview:
+    """Customer-facing incentive paydown figures for the sfd4 overview.
+
+    With ``deferral`` no payment is due for the first 3 months and the
+    interest capitalizes. Each incentive row is simulated with its dated
+    paydowns and re-amortized after each one (see
+    :func:`~sfd_engine.reamortization.incentive_paydown_payments`). The
+    bill with solar is the customer's tariff applied to simulated
+    production at the proposal's tilt and azimuth.
+    """
+    base_price = inputs.system_size_kw * 1000 * inputs.cost_per_watt
+    financed = loan_amount(inputs)
+    itc = base_price * 0.30
+    payments = incentive_paydown_payments(
+        financed,
+        inputs.loan_apr / 100 / 12,
+        inputs.loan_term * 12,
+        itc,
+        NYS_CREDIT,
+        NYC_ABATEMENT,
+        deferral=deferral,
+    )
+
+    production = hourly_production_by_year(inputs.system_size_kw, 1, inputs.state, inputs.tilt, inputs.azimuth)
+    _, bills_with_solar = solar_bills(inputs.electric_bill, production, tariff_for(inputs.state, inputs.tariff))
+
+    # 25 years of the bill at the footnoted utility escalator, less the amount financed
+    savings_25yr = CashFlowTable.build(
+        inputs.electric_bill, 25, utility_escalation=UTILITY_ESCALATION, system_cost=financed
+    )
+
+    total_tax_incentives = itc + NYS_CREDIT + NYC_ABATEMENT
+    return InvestmentOverview(
+        system_cost=base_price,
+        spring_discount=inputs.roof_cost,
+        itc=itc,
+        nys_credit=NYS_CREDIT,
+        nyc_abatement=NYC_ABATEMENT,
+        loan_amount=financed,
+        period_payments=tuple(tuple(float(p) for p in row) for row in payments),
+        deferral=deferral,
+        total_tax_incentives=total_tax_incentives,
+        net_investment=financed - total_tax_incentives,
+        total_25yr_net_savings=float(savings_25yr.net.sum()),
+        utility_bill_with_solar=float(bills_with_solar[0].mean()),
+        payment_after_incentives=float(payments[-1][-1]),
+    )
@@ -0,0 +1,253 @@
+"""Hourly solar production.
+
+:func:`hourly_production` simulates a typical year of 8,760 hourly AC kWh
+for a system from its size, tilt and azimuth. It uses the bundled
+typical-meteorological-year table for the state, a NOAA solar position
+model, isotropic-sky transposition onto the panel plane, and a cell
+temperature derate. :func:`monthly_production` rolls that up by month
+and applies panel degradation over the years as one ``(years, 12)``
+array; :func:`hourly_production_by_year` keeps the hours. The bill
+savings it earns are worked out in :mod:`sfd_engine.tariffs`.
+
+Output scales linearly with system size, so the per-kW hourly profile of
+each (state, tilt, azimuth) is computed once and cached. Pricing a
+system is then a multiply and a monthly sum.
+
+The bundled tables (``data/tmy_<state>.csv``) are typical years built by
+:func:`typical_year` from the monthly irradiance and temperature normals
+of Central Park (NY) and Newark (NJ). They have the columns of an NSRDB
+TMY file (``month, day, hour, ghi, dni, dhi, temp_air``), and one can be
+swapped in for site-specific work.
+"""
+from __future__ import annotations
+
+from dataclasses import dataclass
+from functools import lru_cache
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+DATA_DIR = Path(__file__).with_name("data")
+HOURS_PER_YEAR = 8760
+# Hours in each month of the (non-leap) typical year
+MONTH_HOURS = np.array([31, 28, 31, 30, 31, 30, 31, 31, 30, 31, 30, 31]) * 24
+
+DEFAULT_TILT = 30.0
+DEFAULT_AZIMUTH = 180.0  # degrees clockwise from north; 180 faces due south
+DEGRADATION = 0.005  # output lost per year
+SYSTEM_LOSSES = 0.14  # soiling, wiring, mismatch, availability
+INVERTER_EFFICIENCY = 0.96
+TEMP_COEFFICIENT = -0.004  # power change per degree C above 25 C
+NOCT = 45.0  # nominal operating cell temperature, C
+ALBEDO = 0.2
+
+
+@dataclass(frozen=True)
+class Site:
+    name: str
+    latitude: float
+    longitude: float
+    utc_offset: float
+    # Monthly normals used to build the bundled typical year
+    ghi_kwh_m2_day: tuple[float, ...]
+    temp_c: tuple[float, ...]
+
+
+SITES = {
+    "NY": Site(
+        "New York, NY", 40.78, -73.97, -5,
+        (1.95, 2.80, 3.90, 4.85, 5.65, 6.05, 6.00, 5.35, 4.35, 3.10, 2.05, 1.70),
+        (0.5, 1.9, 5.8, 11.8, 17.3, 22.4, 25.3, 24.7, 20.8, 14.6, 8.8, 3.3),
+    ),
+    "NJ": Site(
+        "Newark, NJ", 40.72, -74.17, -5,
+        (2.00, 2.85, 3.95, 4.90, 5.70, 6.10, 6.05, 5.40, 4.40, 3.15, 2.10, 1.75),
+        (0.1, 1.5, 5.8, 12.0, 17.6, 22.9, 25.9, 25.0, 20.8, 14.3, 8.5, 2.9),
+    ),
+}
+
+
+def _site(state: str) -> Site:
+    try:
+        return SITES[state]
+    except KeyError:
+        raise ValueError(f"no weather data for state {state!r}; expected one of {', '.join(SITES)}") from None
+
+
+# ---------------------------
+# Solar geometry
+# ---------------------------
+def _day_of_year() -> np.ndarray:
+    return np.repeat(np.arange(1, 366), 24)
+
+
+def extraterrestrial_normal(day_of_year: np.ndarray) -> np.ndarray:
+    """Solar irradiance at the top of the atmosphere, W/m2 normal to the sun."""
+    return 1367.0 * (1 + 0.033 * np.cos(2 * np.pi * day_of_year / 365))
+
+
+@lru_cache(maxsize=None)
+def solar_position(state: str) -> tuple[np.ndarray, np.ndarray]:
+    """Zenith and azimuth (degrees) of the sun at mid-hour, for every hour of the year.
+
+    NOAA's low-precision equations, good to a fraction of a degree, which is
+    far inside the hour-to-hour variation of the weather.
+    """
+    site = _site(state)
+    day = _day_of_year()
+    hour = np.tile(np.arange(24) + 0.5, 365)
+    gamma = 2 * np.pi / 365 * (day - 1 + (hour - 12) / 24)
+    equation_of_time = 229.18 * (
+        0.000075 + 0.001868 * np.cos(gamma) - 0.032077 * np.sin(gamma)
+        - 0.014615 * np.cos(2 * gamma) - 0.040849 * np.sin(2 * gamma)
+    )
+    declination = (
+        0.006918 - 0.399912 * np.cos(gamma) + 0.070257 * np.sin(gamma)
+        - 0.006758 * np.cos(2 * gamma) + 0.000907 * np.sin(2 * gamma)
+        - 0.002697 * np.cos(3 * gamma) + 0.00148 * np.sin(3 * gamma)
+    )
+    solar_minutes = hour * 60 + equation_of_time + 4 * site.longitude - 60 * site.utc_offset
+    hour_angle = np.radians(solar_minutes / 4 - 180)
+    latitude = np.radians(site.latitude)
+
+    cos_zenith = np.sin(latitude) * np.sin(declination) + np.cos(latitude) * np.cos(declination) * np.cos(hour_angle)
+    zenith = np.arccos(np.clip(cos_zenith, -1, 1))
+    # Azimuth clockwise from north: east in the morning, west after solar noon
+    cos_azimuth = (np.sin(declination) - np.sin(latitude) * cos_zenith) / (np.cos(latitude) * np.sin(zenith))
+    azimuth = np.degrees(np.arccos(np.clip(cos_azimuth, -1, 1)))
+    azimuth = np.where(hour_angle > 0, 360 - azimuth, azimuth)
+
+    zenith = np.degrees(zenith)
+    zenith.flags.writeable = False
+    azimuth.flags.writeable = False
+    return zenith, azimuth
+
+
+# ---------------------------
+# Weather
+# ---------------------------
+def typical_year(state: str, seed: int = 0) -> pd.DataFrame:
+    """Build a typical year for ``state`` from its monthly normals.
+
+    Clear-sky irradiance (Haurwitz) is scaled day by day with seeded
+    cloudiness, then rescaled so every month matches its normal GHI.
+    GHI is split into beam and diffuse with the Erbs correlation.
+    Temperature follows the monthly mean with a diurnal swing and
+    day-to-day noise.
+    """
+    site = _site(state)
+    rng = np.random.default_rng(seed)
+    zenith, _ = solar_position(state)
+    cos_zenith = np.cos(np.radians(zenith))
+    up = cos_zenith > 0.01
+    clear_ghi = np.where(up, 1098 * cos_zenith * np.exp(-0.057 / np.where(up, cos_zenith, 1)), 0.0)
+
+    month = np.repeat(np.arange(12), MONTH_HOURS)
+    daily_clearness = np.repeat(rng.beta(4, 2, 365) * 1.2, 24)
+    ghi = clear_ghi * daily_clearness
+    month_starts = np.concatenate(([0], np.cumsum(MONTH_HOURS)[:-1]))
+    monthly_kwh = np.add.reduceat(ghi, month_starts) / 1000
+    target_kwh = np.array(site.ghi_kwh_m2_day) * MONTH_HOURS / 24
+    ghi *= (target_kwh / monthly_kwh)[month]
+
+    horizontal_extraterrestrial = extraterrestrial_normal(_day_of_year()) * cos_zenith
+    kt = np.where(up, np.clip(ghi / np.where(up, horizontal_extraterrestrial, 1), 0, 1), 0.0)
+    diffuse_fraction = np.where(
+        kt <= 0.22, 1 - 0.09 * kt,
+        np.where(kt <= 0.8, 0.9511 - 0.1604 * kt + 4.388 * kt**2 - 16.638 * kt**3 + 12.336 * kt**4, 0.165),
+    )
+    dhi = ghi * diffuse_fraction
+    dni = np.where(up, (ghi - dhi) / np.where(up, cos_zenith, 1), 0.0)
+
+    hour = np.tile(np.arange(24), 365)
+    daily_offset = np.repeat(rng.normal(0, 2.5, 365), 24)
+    temp_air = np.array(site.temp_c)[month] + 4 * np.sin((hour - 9) / 24 * 2 * np.pi) + daily_offset
+
+    dates = pd.date_range("2023-01-01", periods=HOURS_PER_YEAR, freq="h")
+    return pd.DataFrame({
+        "month": dates.month,
+        "day": dates.day,
+        "hour": dates.hour,
+        "ghi": ghi.round().astype(int),
+        "dni": dni.round().astype(int),
+        "dhi": dhi.round().astype(int),
+        "temp_air": temp_air.round(1),
+    })
+
+
+@lru_cache(maxsize=None)
+def load_weather(state: str) -> pd.DataFrame:
+    """The bundled typical year for ``state``, read once per process."""
+    _site(state)
+    weather = pd.read_csv(DATA_DIR / f"tmy_{state.lower()}.csv")
+    if len(weather) != HOURS_PER_YEAR:
+        raise ValueError(f"typical year for {state} has {len(weather)} hours, expected {HOURS_PER_YEAR}")
+    return weather
+
+
+# ---------------------------
+# Production
+# ---------------------------
+@lru_cache(maxsize=256)
+def specific_production(state: str, tilt: float, azimuth: float) -> np.ndarray:
+    """Hourly AC kWh per kW of panels, first year, for a typical year."""
+    weather = load_weather(state)
+    ghi, dni, dhi = (weather[c].to_numpy(dtype=float) for c in ("ghi", "dni", "dhi"))
+    zenith, sun_azimuth = solar_position(state)
+    zenith, sun_azimuth, tilt_r = np.radians(zenith), np.radians(sun_azimuth), np.radians(tilt)
+
+    cos_incidence = np.cos(zenith) * np.cos(tilt_r) + np.sin(zenith) * np.sin(tilt_r) * np.cos(
+        sun_azimuth - np.radians(azimuth)
+    )
+    beam = dni * np.clip(cos_incidence, 0, None)
+    sky = dhi * (1 + np.cos(tilt_r)) / 2
+    ground = ghi * ALBEDO * (1 - np.cos(tilt_r)) / 2
+    poa = beam + sky + ground  # W/m2 on the panel plane
+
+    cell_temp = weather["temp_air"].to_numpy(dtype=float) + poa / 800 * (NOCT - 20)
+    dc = poa / 1000 * (1 + TEMP_COEFFICIENT * (cell_temp - 25))
+    production = np.clip(dc, 0, None) * (1 - SYSTEM_LOSSES) * INVERTER_EFFICIENCY
+    production.flags.writeable = False
+    return production
+
+
+def hourly_production(
+    system_size_kw: float, state: str = "NY", tilt: float = DEFAULT_TILT, azimuth: float = DEFAULT_AZIMUTH
+) -> np.ndarray:
+    """First-year AC kWh for each of the 8,760 hours of a typical year."""
+    return system_size_kw * specific_production(state, float(tilt), float(azimuth))
+
+
+@lru_cache(maxsize=256)
+def _specific_monthly(state: str, tilt: float, azimuth: float) -> np.ndarray:
+    month_starts = np.concatenate(([0], np.cumsum(MONTH_HOURS)[:-1]))
+    monthly = np.add.reduceat(specific_production(state, tilt, azimuth), month_starts)
+    monthly.flags.writeable = False
+    return monthly
+
+
+def monthly_production(
+    system_size_kw: float,
+    years: int,
+    state: str = "NY",
+    tilt: float = DEFAULT_TILT,
+    azimuth: float = DEFAULT_AZIMUTH,
+    degradation: float = DEGRADATION,
+) -> np.ndarray:
+    """AC kWh by ``[year, month]`` over ``years``, with output degrading each year."""
+    yearly = (1 - degradation) ** np.arange(years)
+    return system_size_kw * np.outer(yearly, _specific_monthly(state, float(tilt), float(azimuth)))
+
+
+def hourly_production_by_year(
+    system_size_kw: float,
+    years: int,
+    state: str = "NY",
+    tilt: float = DEFAULT_TILT,
+    azimuth: float = DEFAULT_AZIMUTH,
+    degradation: float = DEGRADATION,
+) -> np.ndarray:
+    """AC kWh by ``[year, hour]`` over ``years``, with output degrading each year."""
+    yearly = (1 - degradation) ** np.arange(years)
+    return np.outer(yearly, hourly_production(system_size_kw, state, tilt, azimuth))
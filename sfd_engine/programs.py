@@ -0,0 +1,116 @@
+"""Loan programs offered to customers: (term in years, APR %, dealer fee %).
+
+The programs live in a versioned catalog file, ``data/loan_programs.json``
+by default, so a lender rate-sheet update is a data change rather than an
+edit to every dashboard. Point ``SFD_PROGRAM_CATALOG`` at another JSON file
+to use a different rate sheet. :func:`load_catalog` reads and indexes the
+file once per process.
+"""
+from __future__ import annotations
+
+import json
+import os
+from dataclasses import dataclass, field
+from functools import lru_cache
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from .finance import payment
+
+DEFAULT_CATALOG_PATH = Path(__file__).with_name("data") / "loan_programs.json"
+CATALOG_ENV_VAR = "SFD_PROGRAM_CATALOG"
+
+# Dealer-fee bands are this many percentage points wide: 0-10%, 10-20%, ...
+FEE_BAND_WIDTH = 10
+
+
+def program_label(term: int, apr: float, dealer_fee: float) -> str:
+    """Dropdown label used by the dashboards for a loan program."""
+    return f"{term} Years | APR: {apr:.2f}% | Dealer Fee: {dealer_fee:.2f}%"
+
+
+def fee_band(dealer_fee: float) -> str:
+    """Band a dealer fee falls in, e.g. ``"20-30%"`` for 27.49."""
+    low = int(dealer_fee // FEE_BAND_WIDTH * FEE_BAND_WIDTH)
+    return f"{low}-{low + FEE_BAND_WIDTH}%"
+
+
+def _group_by(keys, programs) -> dict:
+    groups: dict = {}
+    for key, program in zip(keys, programs):
+        groups.setdefault(key, []).append(program)
+    return {key: tuple(group) for key, group in groups.items()}
+
+
+@dataclass(frozen=True)
+class ProgramCatalog:
+    """An indexed, immutable set of loan programs.
+
+    ``frame`` has one row per program with its label, dealer-fee band and
+    ``payment_factor``, the monthly payment per dollar financed. The
+    ``by_*`` dicts map a key to the programs that match it, in catalog
+    order, so lookups never scan the list.
+    """
+
+    version: str
+    programs: tuple[tuple[int, float, float], ...]
+    frame: pd.DataFrame = field(repr=False, compare=False)
+    by_label: dict[str, tuple[int, float, float]] = field(repr=False, compare=False)
+    by_term: dict[int, tuple[tuple[int, float, float], ...]] = field(repr=False, compare=False)
+    by_apr: dict[float, tuple[tuple[int, float, float], ...]] = field(repr=False, compare=False)
+    by_fee_band: dict[str, tuple[tuple[int, float, float], ...]] = field(repr=False, compare=False)
+
+    @classmethod
+    def from_programs(cls, programs, version: str = "") -> "ProgramCatalog":
+        programs = tuple((int(t), float(a), float(f)) for t, a, f in programs)
+        terms, aprs, fees = (list(col) for col in zip(*programs))
+        labels = [program_label(*p) for p in programs]
+        frame = pd.DataFrame({
+            "term": terms,
+            "apr": aprs,
+            "dealer_fee": fees,
+            "fee_band": [fee_band(f) for f in fees],
+            "payment_factor": payment(np.array(aprs) / 100 / 12, np.array(terms) * 12, 1.0),
+        }, index=pd.Index(labels, name="program"))
+        return cls(
+            version=version,
+            programs=programs,
+            frame=frame,
+            by_label=dict(zip(labels, programs)),
+            by_term=_group_by(terms, programs),
+            by_apr=_group_by(aprs, programs),
+            by_fee_band=_group_by(frame["fee_band"], programs),
+        )
+
+    @property
+    def labels(self) -> list[str]:
+        return list(self.by_label)
+
+    def payment_factor(self, label: str) -> float:
+        """Monthly payment per dollar financed for the program with ``label``."""
+        return float(self.frame.at[label, "payment_factor"])
+
+    def __len__(self) -> int:
+        return len(self.programs)
+
+
+def read_catalog(path: str | Path) -> ProgramCatalog:
+    """Build a :class:`ProgramCatalog` from a catalog JSON file."""
+    with open(path, encoding="utf-8") as fh:
+        document = json.load(fh)
+    programs = [(p["term"], p["apr"], p["dealer_fee"]) for p in document["programs"]]
+    return ProgramCatalog.from_programs(programs, version=str(document.get("version", "")))
+
+
+@lru_cache(maxsize=None)
+def load_catalog(path: str | Path | None = None) -> ProgramCatalog:
+    """The program catalog at ``path`` (default: ``$SFD_PROGRAM_CATALOG`` or the bundled file).
+
+    Cached, so every caller in the process shares one parsed, indexed catalog.
+    """
+    return read_catalog(path or os.environ.get(CATALOG_ENV_VAR) or DEFAULT_CATALOG_PATH)
+
+
+LOAN_PROFILES: list[tuple[int, float, float]] = list(load_catalog().programs)
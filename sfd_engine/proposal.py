@@ -0,0 +1,369 @@
+"""The sfd4 Investment Overview as HTML and as a server-side PDF.
+
+Both documents are rendered from the same fields, built by
+:func:`overview_fields` from an :class:`InvestmentOverview`. Table rows
+come from the data (one payment row per :data:`OVERVIEW_SCENARIOS` entry),
+so an extra incentive scenario needs no layout change.
+
+The HTML layout lives in ``templates/investment_overview.html`` and is
+parsed once at import into :data:`OVERVIEW_HTML`. The PDF is drawn with
+:mod:`sfd_engine.pdf`. A rep can download it from the dashboard, and the
+nightly run can produce PDFs for a whole lead list without a browser::
+
+    python -m sfd_engine.proposal leads.csv proposals/ --program 25 5.99 27.49
+
+The PDF layout is compiled once per process by :func:`overview_template`.
+Every proposal after that only formats its fields. The batch run renders
+chunks of the lead list in a process pool and writes one PDF per row.
+Lead columns are the same as for :mod:`sfd_engine.bulk`, plus an optional
+``customer_name``.
+"""
+from __future__ import annotations
+
+import argparse
+import datetime
+import html
+import os
+import re
+from contextlib import ExitStack
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from .bulk import bounded_map, frame_arguments, read_chunks
+from .pdf import PAGE_WIDTH, CompiledPage, Field, PageLayout, build_pdf, wrap_text
+from .pricing import InvestmentOverview, ProposalInputs, investment_overview
+from .reamortization import OVERVIEW_PERIOD_LABELS, OVERVIEW_PERIODS, OVERVIEW_SCENARIOS
+from .templating import Template
+
+OVERVIEW_HTML_PATH = Path(__file__).with_name("templates") / "investment_overview.html"
+MARGIN = 48.0
+DATE_FORMAT = "%b %d, %Y"
+
+ADDED_BENEFITS = (
+    "No up-front fees",
+    "No payment for first 3 months",
+    "Referral Bonus: $1,000",
+    "Roof repairs, minor electric work & construction included",
+)
+FOOTNOTES = (
+    "Not everyone is qualified for credits, incentives, or rebates. Please consult your tax professional or legal professional for further information.",
+    "The timing for receipt of the NYC Tax Credit may vary. While we assist with submissions, we cannot guarantee specific timelines; consult your tax advisor for details.",
+    "The above payment is based on receipt of your timely Incentive Payments and successful enrollment in Autopay/ACH payments as stated in the loan agreement.",
+    "A minimum of Two Thousand Five Hundred Dollars ($2,500) is required for loan re-amortization or principal pay-down after month 18.",
+    "The projected total 25-year net savings assumes a 4% annual utility escalator.",
+)
+
+# Investment Details rows: a section heading (field None) or a label and field.
+INVESTMENT_DETAILS = (
+    ("BASIC LOAN INFORMATION", None),
+    ("System Cost", "system_cost"),
+    ("Spring Discount", "spring_discount"),
+    ("INCENTIVES", None),
+    ("30% Federal Tax Credit (ITC)", "itc"),
+    ("State Tax Credit (NYS)", "nys_credit"),
+    ("Property Tax Abatement (NYC)", "nyc_abatement"),
+    ("TOTAL INVESTMENT", None),
+    ("Total Loan Amount", "loan_amount"),
+    ("Total Tax Incentives", "total_tax_incentives"),
+    ("Net Investment", "net_investment"),
+)
+
+
+def period_headings() -> list[tuple[str, str]]:
+    """Two-line column headings of the payment table, e.g. ``("Year 2", "(M 19-24)")``."""
+    headings = []
+    for label, (first, last) in zip(OVERVIEW_PERIOD_LABELS, OVERVIEW_PERIODS):
+        months = f"{first}-{last}" if last else f"{first}+"
+        if label.startswith("Months"):
+            headings.append(("Months", months))
+        else:
+            headings.append((label, f"(M {months})"))
+    return headings
+
+
+def payment_field(scenario: int, period: int) -> str:
+    return f"payment_{scenario}_{period}"
+
+
+def _money(value: float) -> str:
+    return f"${value:,.0f}"
+
+
+def overview_fields(
+    inputs: ProposalInputs,
+    overview: InvestmentOverview,
+    customer_name: str = "",
+    date: datetime.date | None = None,
+) -> dict[str, str]:
+    """Formatted text for every field of the overview template."""
+    date = date or datetime.date.today()
+    fields = {
+        "customer_name": customer_name,
+        "date": date.strftime(DATE_FORMAT),
+        "prepared_for": f"Investment Overview prepared for {customer_name} on {date.strftime(DATE_FORMAT)}",
+        "loan_term": f"Loan Term {inputs.loan_term} Years",
+        "loan_apr": f"APR {inputs.loan_apr:.2f}%",
+        "electric_bill": f"${inputs.electric_bill:,.0f}/mo",
+        "utility_bill_with_solar": f"${overview.utility_bill_with_solar:,.0f}/mo",
+        "payment_after_incentives": f"${overview.payment_after_incentives:,.0f}/mo",
+        "total_25yr_net_savings": _money(overview.total_25yr_net_savings),
+    }
+    for _, name in INVESTMENT_DETAILS:
+        if name:
+            fields[name] = _money(getattr(overview, name))
+    for i, row in enumerate(overview.period_payments):
+        for j, value in enumerate(row):
+            fields[payment_field(i, j)] = _money(value)
+    return fields
+
+
+def _fill_block(text: str, marker: str, lines) -> str:
+    """Replace the line holding ``<!-- marker -->`` with ``lines`` at its indentation."""
+    match = re.search(rf"^([ \t]*)<!-- {marker} -->\n", text, re.MULTILINE)
+    indent = match.group(1)
+    block = "".join(f"{indent}{line}\n" for line in lines)
+    return text[:match.start()] + block + text[match.end():]
+
+
+def compile_overview_html(text: str) -> Template:
+    """Expand the generated blocks of the overview layout and parse it."""
+    details = []
+    for label, name in INVESTMENT_DETAILS:
+        if name is None:
+            details.append(f'<tr><td colspan="2" style="padding: 8px 0;"><strong>{html.escape(label)}</strong></td></tr>')
+        else:
+            details.append(
+                f'<tr><td style="padding: 4px 0;">{html.escape(label)}</td>'
+                f'<td style="padding: 4px 0; text-align: right;">{{{{ {name} }}}}</td></tr>'
+            )
+    rows = []
+    for i, scenario in enumerate(OVERVIEW_SCENARIOS):
+        cells = "".join(f"<td>{{{{ {payment_field(i, j)} }}}}</td>" for j in range(len(OVERVIEW_PERIODS)))
+        rows.append(f"<tr><td>{html.escape(scenario)}</td>{cells}</tr>")
+    footnotes = []
+    for n, note in enumerate(FOOTNOTES, start=1):
+        footnotes += ["<br/>"] if footnotes else []
+        footnotes.append(f"{n} {html.escape(note)}")
+
+    text = _fill_block(text, "investment details", details)
+    text = _fill_block(text, "added benefits", [f"<li>{html.escape(b)}</li>" for b in ADDED_BENEFITS])
+    text = _fill_block(text, "payment headings", [f"<th>{a}<br/>{b}</th>" for a, b in period_headings()])
+    text = _fill_block(text, "payment rows", rows)
+    text = _fill_block(text, "footnotes", footnotes)
+    return Template.parse(text)
+
+
+OVERVIEW_HTML = compile_overview_html(OVERVIEW_HTML_PATH.read_text(encoding="utf-8"))
+
+
+def render_overview_html(
+    inputs: ProposalInputs,
+    overview: InvestmentOverview,
+    customer_name: str = "",
+    date: datetime.date | None = None,
+) -> str:
+    """The Investment Overview as an HTML fragment."""
+    return OVERVIEW_HTML.render(overview_fields(inputs, overview, customer_name, date))
+
+
+@lru_cache(maxsize=None)
+def overview_template() -> CompiledPage:
+    """The Investment Overview page layout, compiled once per process."""
+    page = PageLayout()
+    left, right = MARGIN, PAGE_WIDTH - MARGIN
+    middle = PAGE_WIDTH / 2
+
+    # Header
+    page.text(left, 58, "MpowerSOLAR", font="bold", size=20)
+    page.text(left, 76, Field("prepared_for"))
+    page.text(right, 50, Field("loan_term"), align="right")
+    page.text(right, 64, "AUTOPAY", align="right")
+    page.text(right, 78, Field("loan_apr"), align="right")
+    page.line(left, 92, right, 92)
+
+    # Left column: Investment Details
+    column_right = middle - 12
+    page.text(left, 120, "Investment Details", font="bold", size=14)
+    top = 128
+    for label, name in INVESTMENT_DETAILS:
+        if name is None:
+            top += 22
+            page.text(left, top, label, font="bold", size=9)
+        else:
+            top += 16
+            page.text(left, top, label)
+            page.text(column_right, top, Field(name), align="right")
+    top += 30
+    page.text(left, top, "Added Benefits", font="bold", size=12)
+    for benefit in ADDED_BENEFITS:
+        top += 15
+        page.text(left + 4, top, "•")
+        page.text(left + 14, top, benefit)
+    details_bottom = top
+
+    # Right column: Savings Overview
+    column_left = middle + 12
+    page.text(column_left, 120, "Savings Overview", font="bold", size=14)
+    savings_rows = (
+        ("Utility w/o Mpower Solar", Field("electric_bill")),
+        ("Utility w/ Mpower Solar", Field("utility_bill_with_solar")),
+        ("All Incentives Applied After 5 Years", Field("payment_after_incentives")),
+    )
+    top = 128
+    for label, value in savings_rows:
+        top += 16
+        page.text(column_left, top, label)
+        page.text(right, top, value, align="right")
+    top += 40
+    page.text(column_left, top, "TOTAL 25-YEAR NET SAVINGS", font="bold", size=11)
+    top += 30
+    page.text(column_left, top, Field("total_25yr_net_savings"), font="bold", size=26)
+    note = "This proposal expires 15 days from the date generated unless otherwise stipulated by Mpower Solar"
+    top += 6
+    for line in wrap_text(note, right - column_left, size=8):
+        top += 11
+        page.text(column_left, top, line, size=8)
+
+    # Payment table, full width
+    top = max(details_bottom, top) + 40
+    page.text(left, top, "Est. Monthly Payment with Incentive Paydown", font="bold", size=11)
+    label_width = 132
+    column_width = (right - left - label_width) / len(OVERVIEW_PERIODS)
+    centres = [left + label_width + column_width * (j + 0.5) for j in range(len(OVERVIEW_PERIODS))]
+    top += 10
+    page.rect(left, top, right - left, 30)
+    for centre, (first_line, second_line) in zip(centres, period_headings()):
+        page.text(centre, top + 13, first_line, font="bold", size=9, align="center")
+        page.text(centre, top + 24, second_line, font="bold", size=9, align="center")
+    top += 30
+    for i, scenario in enumerate(OVERVIEW_SCENARIOS):
+        top += 18
+        page.text(left + 6, top - 5, scenario)
+        for j, centre in enumerate(centres):
+            page.text(centre, top - 5, Field(payment_field(i, j)), align="center")
+        page.line(left, top, right, top, gray=0.85)
+
+    # Footnotes
+    top += 30
+    for number, footnote in enumerate(FOOTNOTES, start=1):
+        for k, line in enumerate(wrap_text(footnote, right - left - 10, size=8)):
+            top += 11
+            if k == 0:
+                page.text(left, top, str(number), size=8)
+            page.text(left + 10, top, line, size=8)
+        top += 3
+    return page.compile()
+
+
+def render_overview_pdf(
+    inputs: ProposalInputs,
+    customer_name: str = "",
+    date: datetime.date | None = None,
+    deferral: bool = True,
+) -> bytes:
+    """The Investment Overview for ``inputs`` as a PDF file."""
+    overview = investment_overview(inputs, deferral=deferral)
+    fields = overview_fields(inputs, overview, customer_name, date)
+    title = f"Investment Overview - {customer_name}" if customer_name else "Investment Overview"
+    return build_pdf([overview_template().render(fields)], title=title)
+
+
+def proposal_filename(position: int, customer_name: str) -> str:
+    """Output file name for lead ``position``, e.g. ``00042_jane-doe.pdf``."""
+    slug = re.sub(r"[^a-z0-9]+", "-", customer_name.lower()).strip("-")
+    return f"{position:05d}_{slug}.pdf" if slug else f"{position:05d}.pdf"
+
+
+def leads_to_inputs(leads: pd.DataFrame, program: tuple[int, float, float] | None = None) -> list[ProposalInputs]:
+    """One :class:`ProposalInputs` per lead row (columns as in :func:`~sfd_engine.bulk.frame_arguments`)."""
+    args = frame_arguments(leads, program)
+    columns = {name: np.broadcast_to(value, len(leads)) for name, value in args.items()}
+    rows = []
+    for i in range(len(leads)):
+        values = {name: column[i].item() for name, column in columns.items()}
+        values["loan_term"] = int(values["loan_term"])
+        rows.append(ProposalInputs(**values))
+    return rows
+
+
+def _render_chunk(job) -> int:
+    start, chunk, program, out_dir, deferral, date = job
+    names = chunk["customer_name"].fillna("").astype(str) if "customer_name" in chunk else [""] * len(chunk)
+    for position, inputs, name in zip(range(start, start + len(chunk)), leads_to_inputs(chunk, program), names):
+        pdf = render_overview_pdf(inputs, name, date, deferral)
+        Path(out_dir, proposal_filename(position, name)).write_bytes(pdf)
+    return len(chunk)
+
+
+def render_batch(
+    input_path: str | Path,
+    out_dir: str | Path,
+    chunksize: int = 200,
+    workers: int | None = None,
+    program: tuple[int, float, float] | None = None,
+    deferral: bool = True,
+    date: datetime.date | None = None,
+) -> int:
+    """Write one overview PDF per row of ``input_path`` into ``out_dir``.
+
+    Returns the number of PDFs written. ``workers=0`` renders in the
+    calling process; ``None`` uses one worker per CPU.
+    """
+    Path(out_dir).mkdir(parents=True, exist_ok=True)
+    date = date or datetime.date.today()
+
+    def jobs():
+        start = 0
+        for chunk in read_chunks(input_path, chunksize):
+            yield start, chunk, program, out_dir, deferral, date
+            start += len(chunk)
+
+    written = 0
+    with ExitStack() as stack:
+        if workers == 0:
+            counts = map(_render_chunk, jobs())
+        else:
+            workers = workers or os.cpu_count() or 1
+            executor = stack.enter_context(ProcessPoolExecutor(max_workers=workers))
+            counts = bounded_map(executor, _render_chunk, jobs(), max_pending=2 * workers)
+        for count in counts:
+            written += count
+    return written
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(prog="python -m sfd_engine.proposal", description="Render Investment Overview PDFs for a lead list.")
+    parser.add_argument("input", help="CSV or Parquet file of customer rows")
+    parser.add_argument("out_dir", help="directory to write one PDF per row into")
+    parser.add_argument("--chunksize", type=int, default=200, help="rows per worker job (default: %(default)s)")
+    parser.add_argument("--workers", type=int, default=None, help="worker processes; 0 renders inline (default: one per CPU)")
+    parser.add_argument(
+        "--program",
+        nargs=3,
+        type=float,
+        metavar=("TERM", "APR", "DEALER_FEE"),
+        help="loan program for rows without loan_term/loan_apr/dealer_fee columns",
+    )
+    parser.add_argument("--no-deferral", action="store_true", help="price without the 3-month payment deferral")
+    parser.add_argument("--date", type=datetime.date.fromisoformat, default=None, help="proposal date, YYYY-MM-DD (default: today)")
+    args = parser.parse_args(argv)
+
+    program = (int(args.program[0]), args.program[1], args.program[2]) if args.program else None
+    count = render_batch(
+        args.input,
+        args.out_dir,
+        chunksize=args.chunksize,
+        workers=args.workers,
+        program=program,
+        deferral=not args.no_deferral,
+        date=args.date,
+    )
+    print(f"Rendered {count:,} proposals -> {args.out_dir}")
+
+
+if __name__ == "__main__":
+    main()
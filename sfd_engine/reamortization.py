@@ -0,0 +1,164 @@
+"""Event-driven loan simulation: payment deferral, paydowns and re-amortization.
+
+The loans behind the sfd4 Investment Overview start with an optional
+payment deferral (interest capitalizes, no payment due), then take
+lump-sum incentive paydowns on fixed months: the ITC at month 18, the NYS
+credit, and the NYC abatement spread over several years. Each accepted
+paydown re-amortizes the remaining balance over the months left in the
+term, so the payment steps down after every event.
+
+Between two events the payment is level and the balance has the closed
+form ``B_k = B_0 (1 + r)**k - A ((1 + r)**k - 1) / r``, so the simulation
+only loops over the handful of event months; every month inside a segment,
+and every loan in the broadcast arguments (e.g. all loan programs at once),
+is computed in the same array operation.
+"""
+from __future__ import annotations
+
+from typing import Sequence
+
+import numpy as np
+
+from .finance import payment
+
+# Lender minimum for a principal paydown to be accepted and re-amortized.
+MIN_PAYDOWN = 2500.0
+
+# Month windows of the Investment Overview payment table (1-based, inclusive);
+# ``None`` runs to the end of the term.
+OVERVIEW_PERIODS = ((1, 3), (4, 18), (19, 24), (25, 36), (37, 48), (49, None))
+OVERVIEW_PERIOD_LABELS = ("Months 1-3", "Months 4-18", "Year 2", "Year 3", "Year 4", "Year 5+")
+
+# Rows of the Investment Overview table and when each incentive is paid down.
+OVERVIEW_SCENARIOS = ("No Incentives", "ITC", "ITC + NYS + NYC")
+DEFERRAL_MONTHS = 3
+ITC_MONTH = 18
+NYS_MONTH = 18
+NYC_ABATEMENT_MONTHS = (24, 36, 48)
+
+
+def simulate_loan(
+    principal,
+    rate,
+    nper,
+    paydowns: Sequence[tuple[int, object]] = (),
+    deferral_months: int = 0,
+    min_paydown: float = MIN_PAYDOWN,
+) -> dict[str, np.ndarray]:
+    """Month-by-month payments of loans with a deferral and dated paydowns.
+
+    ``rate`` is the monthly rate and ``nper`` the term in months; both
+    broadcast against ``principal``. ``paydowns`` is a list of
+    ``(month, amount)`` events applied right after that month's payment;
+    amounts broadcast too, so one event list can carry a different amount
+    per loan. A paydown below ``min_paydown`` is not accepted by the lender
+    and is carried forward into the next event; an accepted paydown
+    re-amortizes the balance over the months left.
+
+    Returns arrays with the broadcast shape plus a trailing month axis of
+    length ``max(nper)``: ``month``, ``payment``, ``interest``, ``principal``
+    (scheduled principal), ``paydown`` and ``balance``.
+    """
+    events: dict[int, np.ndarray] = {}
+    for month, amount in paydowns:
+        events[int(month)] = events.get(int(month), 0) + np.asarray(amount, dtype=float)
+    principal, rate, nper, *amounts = (
+        a.astype(float)
+        for a in np.broadcast_arrays(*(np.asarray(x) for x in (principal, rate, nper, *events.values())))
+    )
+    events = dict(zip(events, amounts))
+
+    horizon = int(nper.max(initial=0))
+    months = np.arange(1, horizon + 1)
+    shape = principal.shape + (horizon,)
+    payments = np.zeros(shape)
+    balances = np.zeros(shape)
+    applied = np.zeros(shape)
+
+    boundaries = sorted({m for m in (deferral_months, *events) if 0 < m < horizon} | {horizon})
+    balance = principal
+    level = np.zeros_like(principal) if deferral_months else np.asarray(payment(rate, nper, principal))
+    pending = np.zeros_like(principal)
+    start = 0
+    for end in boundaries:
+        k = np.arange(1, end - start + 1)
+        growth = (1 + rate[..., None]) ** k
+        with np.errstate(divide="ignore", invalid="ignore"):
+            segment = np.where(
+                rate[..., None] == 0,
+                balance[..., None] - level[..., None] * k,
+                balance[..., None] * growth - level[..., None] * (growth - 1) / rate[..., None],
+            )
+        payments[..., start:end] = level[..., None]
+        balances[..., start:end] = segment
+        balance = segment[..., -1]
+
+        reamortize = np.full(principal.shape, end == deferral_months)
+        if end in events:
+            pending = pending + events[end]
+            accepted = (pending >= min_paydown) & (balance > 0)
+            amount = np.where(accepted, np.minimum(pending, balance), 0.0)
+            applied[..., end - 1] = amount
+            balance = balance - amount
+            balances[..., end - 1] = balance
+            pending = np.where(accepted, 0.0, pending)
+            reamortize |= accepted
+        remaining = nper - end
+        level = np.where(
+            reamortize,
+            np.where(remaining > 0, np.asarray(payment(rate, np.maximum(remaining, 1), balance)), 0.0),
+            level,
+        )
+        start = end
+
+    active = months <= nper[..., None]
+    balances = np.where(months >= nper[..., None], 0.0, balances)  # no rounding residue after the last payment
+    opening = np.concatenate([principal[..., None], balances[..., :-1]], axis=-1)
+    interest = np.where(active, opening * rate[..., None], 0.0)
+    return {
+        "month": np.broadcast_to(months, shape),
+        "payment": np.where(active, payments, 0.0),
+        "interest": interest,
+        "principal": np.where(active, opening - balances - applied, 0.0),
+        "paydown": applied,
+        "balance": balances,
+    }
+
+
+def period_payments(payments: np.ndarray, periods=OVERVIEW_PERIODS) -> np.ndarray:
+    """Payment at the start of each ``(first, last)`` month window.
+
+    Windows line up with the paydown months, so the payment is level within
+    each; the result has one column per window.
+    """
+    return np.stack([payments[..., first - 1] for first, _ in periods], axis=-1)
+
+
+def incentive_paydown_payments(
+    loan_amount, rate, nper, itc, nys_credit, nyc_abatement, deferral: bool = True
+) -> np.ndarray:
+    """Investment Overview payments for each :data:`OVERVIEW_SCENARIOS` row.
+
+    The ITC is paid down at :data:`ITC_MONTH`, the NYS credit at
+    :data:`NYS_MONTH` and the NYC abatement in equal installments on
+    :data:`NYC_ABATEMENT_MONTHS`. Arguments broadcast (pass arrays to price
+    every loan program at once); the result has their shape plus a scenario
+    axis and a :data:`OVERVIEW_PERIODS` axis.
+    """
+    itc, nys_credit, nyc_abatement = (np.asarray(a, dtype=float)[..., None] for a in (itc, nys_credit, nyc_abatement))
+    with_itc = np.array([0.0, 1.0, 1.0])
+    with_all = np.array([0.0, 0.0, 1.0])
+    nyc_installment = nyc_abatement * with_all / len(NYC_ABATEMENT_MONTHS)
+    paydowns = [
+        (ITC_MONTH, itc * with_itc),
+        (NYS_MONTH, nys_credit * with_all),
+        *((month, nyc_installment) for month in NYC_ABATEMENT_MONTHS),
+    ]
+    schedule = simulate_loan(
+        np.asarray(loan_amount, dtype=float)[..., None],
+        np.asarray(rate, dtype=float)[..., None],
+        np.asarray(nper)[..., None],
+        paydowns,
+        deferral_months=DEFERRAL_MONTHS if deferral else 0,
+    )
+    return period_payments(schedule["payment"])
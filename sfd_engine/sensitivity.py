@@ -0,0 +1,149 @@
+"""Sensitivity of a proposal's metrics to every numeric input.
+
+:func:`tornado` moves each input in :data:`SENSITIVITY_RANGES` to the low
+and high end of its range while holding the rest at the proposal's
+values, and flips ``include_incentives``. :func:`sensitivity_grid` sweeps
+two inputs against each other, e.g. discount x dealer fee ->
+``company_revenue``, for a heatmap. Either way all the perturbed
+proposals are stacked into arrays and priced with one
+:func:`~sfd_engine.batch.price_batch` call.
+
+As in :func:`~sfd_engine.batch.price_batch`, savings are the flat monthly
+bill (with the proposal's escalation and degradation), even when the
+proposal asks for hourly production.
+"""
+from __future__ import annotations
+
+from dataclasses import asdict
+
+import numpy as np
+import pandas as pd
+
+from .batch import price_batch
+from .pricing import ProposalInputs
+
+# Metrics the sensitivity views can show, with their display names
+SENSITIVITY_METRICS = {
+    "npv": "NPV (5% rate)",
+    "irr": "IRR",
+    "payback_year": "Payback (years)",
+    "monthly_payment": "Monthly Payment",
+    "company_revenue": "Company Revenue",
+}
+
+# How far each input moves: ("relative", 0.2) is +/-20% of its value,
+# ("absolute", 2.0) is +/-2 in its own units. Bounds clip the result.
+SENSITIVITY_RANGES = {
+    "system_size_kw": ("relative", 0.2, (0.5, None)),
+    "cost_per_watt": ("relative", 0.2, (0.5, None)),
+    "electric_bill": ("relative", 0.2, (0.0, None)),
+    "roof_cost": ("absolute", 5000.0, (0.0, None)),
+    "battery_cost": ("absolute", 5000.0, (0.0, None)),
+    "loan_apr": ("absolute", 2.0, (0.0, None)),
+    "dealer_fee": ("absolute", 10.0, (0.0, 60.0)),
+    "project_discount_pct": ("absolute", 10.0, (0.0, 100.0)),
+    "utility_escalation": ("absolute", 2.0, (0.0, None)),
+    "degradation": ("absolute", 0.5, (0.0, None)),
+}
+SENSITIVITY_LABELS = {
+    "system_size_kw": "System Size (kW)",
+    "cost_per_watt": "Cost per Watt ($)",
+    "electric_bill": "Monthly Electric Bill ($)",
+    "roof_cost": "Roof Cost ($)",
+    "battery_cost": "Battery Cost ($)",
+    "loan_apr": "Loan APR (%)",
+    "dealer_fee": "Dealer Fee (%)",
+    "project_discount_pct": "Project Discount (%)",
+    "utility_escalation": "Utility Escalation (%/yr)",
+    "degradation": "Panel Degradation (%/yr)",
+    "include_incentives": "Include Incentives",
+}
+GRID_POINTS = 11
+
+# price_batch arguments taken from ProposalInputs
+_BATCH_FIELDS = (
+    "system_size_kw", "cost_per_watt", "electric_bill", "loan_term", "loan_apr", "dealer_fee",
+    "roof_cost", "battery_cost", "state", "lease_eligible", "incentives_applied", "include_incentives",
+    "project_discount_pct", "utility_escalation", "degradation",
+)
+
+
+def input_range(name: str, value: float) -> tuple[float, float]:
+    """Low and high end of ``name``'s sensitivity range around ``value``."""
+    kind, step, (lower, upper) = SENSITIVITY_RANGES[name]
+    delta = abs(value) * step if kind == "relative" else step
+    low, high = value - delta, value + delta
+    if lower is not None:
+        low, high = max(low, lower), max(high, lower)
+    if upper is not None:
+        low, high = min(low, upper), min(high, upper)
+    return low, high
+
+
+def _price(inputs: ProposalInputs, overrides: dict[str, np.ndarray]) -> dict[str, np.ndarray]:
+    fields = asdict(inputs)
+    args = {name: fields[name] for name in _BATCH_FIELDS}
+    args.update(overrides)
+    return price_batch(**args)
+
+
+def tornado(inputs: ProposalInputs, metrics=tuple(SENSITIVITY_METRICS)) -> pd.DataFrame:
+    """Each input's low and high value and every metric at both, widest swing in ``metrics[0]`` first.
+
+    Row ``k`` of the stacked batch is the proposal with only input ``k``
+    changed: the base case comes first, then each input low, then high.
+    """
+    fields = asdict(inputs)
+    names = list(SENSITIVITY_RANGES)
+    n = len(names)
+    ranges = np.array([input_range(name, float(fields[name])) for name in names])
+    rows = 1 + 2 * n + 1  # base, lows, highs, incentives flipped
+
+    overrides: dict[str, np.ndarray] = {}
+    for k, name in enumerate(names):
+        column = np.full(rows, float(fields[name]))
+        column[1 + k] = ranges[k, 0]
+        column[1 + n + k] = ranges[k, 1]
+        overrides[name] = column
+    flipped = np.full(rows, bool(inputs.include_incentives))
+    flipped[-1] = not inputs.include_incentives
+    overrides["include_incentives"] = flipped
+    priced = _price(inputs, overrides)
+
+    low, high = np.r_[1:1 + n, 0], np.r_[1 + n:1 + 2 * n, 0]
+    # include_incentives: "low" is off and "high" is on, whichever the proposal uses
+    if inputs.include_incentives:
+        low[-1] = rows - 1
+    else:
+        high[-1] = rows - 1
+    frame = pd.DataFrame({
+        "input": names + ["include_incentives"],
+        "label": [SENSITIVITY_LABELS[name] for name in names + ["include_incentives"]],
+        "low_value": np.r_[ranges[:, 0], 0.0],
+        "base_value": np.r_[[float(fields[name]) for name in names], float(inputs.include_incentives)],
+        "high_value": np.r_[ranges[:, 1], 1.0],
+    })
+    for metric in metrics:
+        values = np.asarray(priced[metric], dtype=float)
+        frame[f"{metric}_base"] = values[0]
+        frame[f"{metric}_low"] = values[low]
+        frame[f"{metric}_high"] = values[high]
+        frame[f"{metric}_swing"] = np.abs(values[high] - values[low])
+    return frame.sort_values(f"{metrics[0]}_swing", ascending=False, ignore_index=True)
+
+
+def sensitivity_grid(
+    inputs: ProposalInputs, x: str, y: str, metric: str = "company_revenue", points: int = GRID_POINTS
+) -> pd.DataFrame:
+    """``metric`` over a ``points`` x ``points`` grid of inputs ``x`` and ``y``, one row per cell."""
+    if x == y:
+        raise ValueError("a sensitivity grid needs two different inputs")
+    fields = asdict(inputs)
+    xs = np.linspace(*input_range(x, float(fields[x])), points)
+    ys = np.linspace(*input_range(y, float(fields[y])), points)
+    priced = _price(inputs, {x: xs[:, None], y: ys[None, :]})
+    return pd.DataFrame({
+        x: np.repeat(xs, points),
+        y: np.tile(ys, points),
+        metric: np.asarray(priced[metric], dtype=float),
+    })
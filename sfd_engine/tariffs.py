@@ -0,0 +1,280 @@
+"""Residential utility tariffs and the bills they produce, before and after solar.
+
+The rate definitions live in ``data/tariffs.json``: per utility plan, a
+fixed monthly charge, energy rates by season and time-of-use window,
+monthly tier adders, and net-metering rules (export credit, dollar credit
+carried month to month, annual true-up). :func:`compile_tariff` turns a
+definition into a :class:`CompiledTariff` once per process: the 8,760
+hourly import and export rates and the per-month tier blocks as arrays.
+
+Billing is then array arithmetic. :meth:`CompiledTariff.monthly_bills`
+takes hourly load and production of any leading shape, e.g. ``(n, 8760)``
+for ``n`` customers or ``(years, 8760)`` for one customer over the loan,
+and returns bills by month. Only the credit carryover steps through the
+months in Python.
+
+Usage comes from the customer's average monthly bill: :func:`hourly_load`
+spreads a residential load shape over the year and scales it until the
+tariff bills that amount (see :func:`solar_savings`).
+"""
+from __future__ import annotations
+
+import json
+from dataclasses import dataclass, field
+from functools import cached_property, lru_cache
+
+import numpy as np
+import pandas as pd
+
+from .production import DATA_DIR, HOURS_PER_YEAR, MONTH_HOURS
+
+TARIFF_PATH = DATA_DIR / "tariffs.json"
+MONTH_STARTS = np.concatenate(([0], np.cumsum(MONTH_HOURS)[:-1]))
+
+# Residential load shape: share of usage by hour of day and by month.
+# Summer afternoons get an air-conditioning bump on top.
+HOURLY_LOAD = np.array([
+    0.60, 0.55, 0.50, 0.50, 0.50, 0.55, 0.75, 0.95, 0.90, 0.80, 0.75, 0.75,
+    0.75, 0.75, 0.80, 0.90, 1.05, 1.30, 1.45, 1.45, 1.35, 1.15, 0.90, 0.70,
+])
+MONTHLY_LOAD = np.array([1.05, 0.95, 0.90, 0.80, 0.85, 1.10, 1.35, 1.30, 1.05, 0.85, 0.90, 1.05])
+COOLING_MONTHS = (6, 7, 8, 9)
+COOLING_HOURS = (13, 20)
+COOLING_FACTOR = 1.2
+
+
+@lru_cache(maxsize=None)
+def _calendar() -> pd.DatetimeIndex:
+    # The non-leap year the bundled typical weather is laid out on
+    return pd.date_range("2023-01-01", periods=HOURS_PER_YEAR, freq="h")
+
+
+@lru_cache(maxsize=None)
+def load_shape() -> np.ndarray:
+    """Fraction of annual usage in each of the 8,760 hours; sums to 1."""
+    dates = _calendar()
+    month, hour = dates.month.to_numpy(), dates.hour.to_numpy()
+    shape = HOURLY_LOAD[hour] * MONTHLY_LOAD[month - 1]
+    cooling = np.isin(month, COOLING_MONTHS) & (hour >= COOLING_HOURS[0]) & (hour < COOLING_HOURS[1])
+    shape[cooling] *= COOLING_FACTOR
+    # MONTHLY_LOAD is each month's average hourly usage; the cooling bump only moves usage within the day
+    shape /= np.add.reduceat(shape, MONTH_STARTS)[month - 1] / (MONTHLY_LOAD * MONTH_HOURS)[month - 1]
+    shape /= shape.sum()
+    shape.flags.writeable = False
+    return shape
+
+
+@lru_cache(maxsize=None)
+def load_tariffs() -> dict:
+    """The bundled tariff definitions, read once per process."""
+    with open(TARIFF_PATH, encoding="utf-8") as fh:
+        return json.load(fh)
+
+
+def tariff_keys(state: str) -> list[str]:
+    """Tariffs defined for ``state``, the state's default first."""
+    document = load_tariffs()
+    default = document["defaults"].get(state)
+    keys = [key for key, tariff in document["tariffs"].items() if tariff["state"] == state]
+    return sorted(keys, key=lambda key: key != default)
+
+
+def tariff_label(key: str) -> str:
+    """Dropdown label for a tariff, e.g. ``"Con Edison SC1 Residential"``."""
+    tariff = load_tariffs()["tariffs"][key]
+    return f"{tariff['utility']} {tariff['name']}"
+
+
+@dataclass(frozen=True)
+class CompiledTariff:
+    """A tariff as arrays, ready to bill any number of load/production profiles.
+
+    ``import_rate`` and ``export_rate`` are $/kWh for each hour of the
+    year. ``tier_thresholds`` and ``tier_adders`` are ``(12, tiers)``:
+    net kWh in a month above a threshold pays the adder on top. Months a
+    tier does not apply to have an infinite threshold.
+    """
+
+    key: str
+    utility: str
+    name: str
+    state: str
+    fixed_monthly: float
+    import_rate: np.ndarray = field(repr=False)
+    export_rate: np.ndarray = field(repr=False)
+    tier_thresholds: np.ndarray = field(repr=False)
+    tier_adders: np.ndarray = field(repr=False)
+    true_up_month: int | None = None
+    true_up_payout: float = 0.0
+
+    @property
+    def label(self) -> str:
+        return f"{self.utility} {self.name}"
+
+    def energy_charges(self, load, production=0.0) -> np.ndarray:
+        """Energy charges less export credits by month, before any banked credit.
+
+        ``load`` and ``production`` are hourly kWh, 8,760 on the last axis,
+        and broadcast against each other. Imports pay the hour's rate,
+        exports earn the hour's export credit, and tiers apply to each
+        month's net kWh.
+        """
+        net = np.asarray(load, dtype=float) - np.asarray(production, dtype=float)
+        imports = np.clip(net, 0, None)
+        exports = imports - net
+        charges = np.add.reduceat(imports * self.import_rate - exports * self.export_rate, MONTH_STARTS, axis=-1)
+        if self.tier_adders.size:
+            net_kwh = np.add.reduceat(net, MONTH_STARTS, axis=-1)
+            over = np.clip(net_kwh[..., None] - self.tier_thresholds, 0, None)
+            charges += (over * self.tier_adders).sum(axis=-1)
+        return charges
+
+    def settle(self, charges: np.ndarray, consecutive_years: bool = False) -> np.ndarray:
+        """Amount due each month once net-metering credit is banked and drawn down.
+
+        A month's negative charge becomes credit against the months after
+        it. At the true-up the remaining credit is paid out at
+        ``true_up_payout`` of its value (a negative amount due) and the
+        bank is cleared. Rows of ``charges`` are billed independently,
+        unless ``consecutive_years``: then the second-to-last axis is
+        successive years and credit carries from one into the next.
+        """
+        months = charges.reshape(charges.shape[:-2] + (-1,)) if consecutive_years else charges
+        due = np.empty_like(months)
+        bank = np.zeros(months.shape[:-1])
+        for m in range(months.shape[-1]):
+            balance = months[..., m] - bank
+            bank = np.clip(-balance, 0, None)
+            due[..., m] = balance + bank
+            if m % 12 + 1 == self.true_up_month:
+                due[..., m] -= bank * self.true_up_payout
+                bank = np.zeros_like(bank)
+        return due.reshape(charges.shape)
+
+    def monthly_bills(self, load, production=0.0, consecutive_years: bool = False) -> np.ndarray:
+        """Bill for each month, fixed charge included; 12 on the last axis.
+
+        See :meth:`energy_charges` for the shapes and :meth:`settle` for
+        ``consecutive_years``.
+        """
+        charges = self.energy_charges(load, production)
+        return self.fixed_monthly + self.settle(charges, consecutive_years)
+
+    @cached_property
+    def _unit_charges(self) -> tuple[np.ndarray, np.ndarray]:
+        # Energy charge and kWh by month for one kWh a year of the load shape
+        shape = load_shape()
+        return np.add.reduceat(shape * self.import_rate, MONTH_STARTS), np.add.reduceat(shape, MONTH_STARTS)
+
+    def annual_usage(self, monthly_bill) -> np.ndarray:
+        """Annual kWh of the load shape whose bills average ``monthly_bill``.
+
+        The annual bill is convex and piecewise linear in usage (tiers only
+        add to the rate), so Newton's method from the flat-rate estimate
+        lands on it exactly in a few steps.
+        """
+        cost, kwh = self._unit_charges
+        target = np.clip((np.asarray(monthly_bill, dtype=float) - self.fixed_monthly) * 12, 0, None)
+        usage = target / cost.sum()
+        for _ in range(8):
+            over = np.clip(usage[..., None, None] * kwh[:, None] - self.tier_thresholds, 0, None)
+            energy = usage * cost.sum() + (over * self.tier_adders).sum(axis=(-2, -1))
+            slope = cost.sum() + ((over > 0) * kwh[:, None] * self.tier_adders).sum(axis=(-2, -1))
+            usage = usage - (energy - target) / slope
+        return usage
+
+
+def _window(rule: dict, month: np.ndarray, hour: np.ndarray, weekday: np.ndarray) -> np.ndarray:
+    selected = np.ones(HOURS_PER_YEAR, dtype=bool)
+    if "months" in rule:
+        selected &= np.isin(month, rule["months"])
+    if "hours" in rule:
+        start, end = rule["hours"]
+        selected &= (hour >= start) & (hour < end)
+    if rule.get("weekdays"):
+        selected &= weekday
+    return selected
+
+
+@lru_cache(maxsize=None)
+def compile_tariff(key: str) -> CompiledTariff:
+    """The tariff ``key`` from ``data/tariffs.json`` as arrays; built once per process."""
+    try:
+        tariff = load_tariffs()["tariffs"][key]
+    except KeyError:
+        raise ValueError(f"unknown tariff {key!r}") from None
+    dates = _calendar()
+    month, hour = dates.month.to_numpy(), dates.hour.to_numpy()
+    weekday = dates.dayofweek.to_numpy() < 5
+
+    import_rate = np.full(HOURS_PER_YEAR, np.nan)
+    for rule in tariff["energy"]:
+        unset = np.isnan(import_rate) & _window(rule, month, hour, weekday)
+        import_rate[unset] = rule["rate"]
+    if np.isnan(import_rate).any():
+        raise ValueError(f"tariff {key!r} leaves some hours without an energy rate")
+
+    net_metering = tariff["net_metering"]
+    credit = net_metering["export_credit"]
+    export_rate = import_rate.copy() if credit == "retail" else np.full(HOURS_PER_YEAR, float(credit))
+
+    tiers = tariff.get("tiers", [])
+    thresholds = np.full((12, len(tiers)), np.inf)
+    adders = np.zeros((12, len(tiers)))
+    for i, tier in enumerate(tiers):
+        months = np.array(tier.get("months", range(1, 13))) - 1
+        thresholds[months, i] = tier["above_kwh"]
+        adders[months, i] = tier["adder"]
+
+    for array in (import_rate, export_rate, thresholds, adders):
+        array.flags.writeable = False
+    return CompiledTariff(
+        key=key,
+        utility=tariff["utility"],
+        name=tariff["name"],
+        state=tariff["state"],
+        fixed_monthly=float(tariff["fixed_monthly"]),
+        import_rate=import_rate,
+        export_rate=export_rate,
+        tier_thresholds=thresholds,
+        tier_adders=adders,
+        true_up_month=net_metering.get("true_up_month"),
+        true_up_payout=float(net_metering.get("true_up_payout", 0.0)),
+    )
+
+
+def tariff_for(state: str, key: str = "") -> CompiledTariff:
+    """Tariff ``key``, or the state's default tariff when ``key`` is empty."""
+    if not key:
+        try:
+            key = load_tariffs()["defaults"][state]
+        except KeyError:
+            raise ValueError(f"no default tariff for state {state!r}") from None
+    return compile_tariff(key)
+
+
+def hourly_load(monthly_bill, tariff: CompiledTariff) -> np.ndarray:
+    """Hourly kWh of a customer whose bills under ``tariff`` average ``monthly_bill``.
+
+    Vectorized: an array of bills gives one 8,760-hour row per bill.
+    """
+    return np.asarray(tariff.annual_usage(monthly_bill))[..., None] * load_shape()
+
+
+def solar_bills(electric_bill: float, production: np.ndarray, tariff: CompiledTariff) -> tuple[np.ndarray, np.ndarray]:
+    """Monthly bills without and with solar for a customer averaging ``electric_bill``.
+
+    ``production`` is hourly kWh by ``[year, hour]``. Returns the bills
+    without solar (12 months, the same every year) and with solar by
+    ``[year, month]``, with credit carried from year to year.
+    """
+    load = hourly_load(electric_bill, tariff)
+    before = tariff.monthly_bills(load)
+    after = tariff.monthly_bills(load, production, consecutive_years=True)
+    return before, after
+
+
+def solar_savings(electric_bill: float, production: np.ndarray, tariff: CompiledTariff) -> np.ndarray:
+    """Bill savings by ``[year, month]``: the bill without solar less the bill with it."""
+    before, after = solar_bills(electric_bill, production, tariff)
+    return before - after
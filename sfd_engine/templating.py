@@ -0,0 +1,75 @@
+"""Precompiled text templates with named fields.
+
+A template is parsed once into the literal text between its
+``{{ field }}`` markers, so rendering is a single ``join`` with no parsing
+and no formatting of the fixed markup. :class:`IncrementalRenderer` goes
+one step further for the dashboards. A rerun usually changes only a few
+fields, so the renderer keeps the previous output in pieces and re-escapes
+just the fields whose value changed.
+"""
+from __future__ import annotations
+
+import html
+import re
+from dataclasses import dataclass
+from typing import Callable, Mapping
+
+_MARKER = re.compile(r"\{\{\s*(\w+)\s*\}\}")
+
+
+@dataclass(frozen=True)
+class Template:
+    """Literal ``chunks`` interleaved with field ``slots``.
+
+    ``len(chunks) == len(slots) + 1``; a field may appear in several slots.
+    """
+
+    chunks: tuple[str, ...]
+    slots: tuple[str, ...]
+
+    @classmethod
+    def parse(cls, text: str) -> "Template":
+        pieces = _MARKER.split(text)
+        return cls(chunks=tuple(pieces[0::2]), slots=tuple(pieces[1::2]))
+
+    @property
+    def fields(self) -> tuple[str, ...]:
+        return tuple(dict.fromkeys(self.slots))
+
+    def render(self, values: Mapping[str, str], escape: Callable[[str], str] = html.escape) -> str:
+        """The template with every field replaced by ``escape(values[name])``."""
+        escaped = {name: escape(values[name]) for name in self.fields}
+        parts = [self.chunks[0]]
+        for name, chunk in zip(self.slots, self.chunks[1:]):
+            parts.append(escaped[name])
+            parts.append(chunk)
+        return "".join(parts)
+
+
+class IncrementalRenderer:
+    """Renders a :class:`Template` repeatedly, re-escaping only the changed fields.
+
+    Every :meth:`render` still returns the whole document, because the
+    dashboard must emit its HTML on every rerun; what is saved is escaping
+    the fields that kept their value.
+    """
+
+    def __init__(self, template: Template, escape: Callable[[str], str] = html.escape):
+        self.template = template
+        self.escape = escape
+        self._values: dict[str, str] = {}
+        # Output pieces: chunk, slot, chunk, slot, ..., chunk
+        self._parts = [""] * (2 * len(template.slots) + 1)
+        self._parts[0::2] = template.chunks
+        self._positions: dict[str, list[int]] = {}
+        for index, name in enumerate(template.slots):
+            self._positions.setdefault(name, []).append(2 * index + 1)
+
+    def render(self, values: Mapping[str, str]) -> str:
+        changed = tuple(name for name in self._positions if self._values.get(name) != values[name])
+        for name in changed:
+            escaped = self.escape(values[name])
+            for position in self._positions[name]:
+                self._parts[position] = escaped
+            self._values[name] = values[name]
+        return "".join(self._parts)
@@ -0,0 +1,158 @@
+"""A small streaming XLSX writer.
+
+An ``.xlsx`` workbook is a ZIP of XML parts. This writes one worksheet per
+DataFrame, with strings stored inline, so there is no shared-string table
+to build up front. Rows are written in slices straight into the ZIP entry,
+so a long schedule never exists as one big string. Covers what the export
+bundle needs (numbers, text, booleans and blanks, no styles) without
+openpyxl or XlsxWriter.
+"""
+from __future__ import annotations
+
+import math
+import numbers
+import re
+import zipfile
+from typing import BinaryIO, Mapping
+from xml.sax.saxutils import escape
+
+import numpy as np
+import pandas as pd
+
+CHUNK_ROWS = 5_000
+_MAX_SHEET_NAME = 31
+_BAD_SHEET_CHARS = re.compile(r"[\[\]:*?/\\]")
+# Characters XML 1.0 cannot carry, even escaped
+_INVALID_XML_CHARS = re.compile("[\x00-\x08\x0b\x0c\x0e-\x1f\ufffe\uffff]")
+
+_CONTENT_TYPES = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+    '<Types xmlns="http://schemas.openxmlformats.org/package/2006/content-types">'
+    '<Default Extension="rels" ContentType="application/vnd.openxmlformats-package.relationships+xml"/>'
+    '<Default Extension="xml" ContentType="application/xml"/>'
+    '<Override PartName="/xl/workbook.xml" '
+    'ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet.main+xml"/>'
+    "{sheets}</Types>"
+)
+_SHEET_TYPE = (
+    '<Override PartName="/xl/worksheets/sheet{n}.xml" '
+    'ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.worksheet+xml"/>'
+)
+_ROOT_RELS = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+    '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+    '<Relationship Id="rId1" '
+    'Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/officeDocument" '
+    'Target="xl/workbook.xml"/></Relationships>'
+)
+_WORKBOOK = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+    '<workbook xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main" '
+    'xmlns:r="http://schemas.openxmlformats.org/officeDocument/2006/relationships">'
+    "<sheets>{sheets}</sheets></workbook>"
+)
+_WORKBOOK_RELS = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+    '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+    "{sheets}</Relationships>"
+)
+_SHEET_REL = (
+    '<Relationship Id="rId{n}" '
+    'Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/worksheet" '
+    'Target="worksheets/sheet{n}.xml"/>'
+)
+_SHEET_HEAD = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+    '<worksheet xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main"><sheetData>'
+)
+_SHEET_TAIL = "</sheetData></worksheet>"
+
+
+def _xml_text(value) -> str:
+    return escape(_INVALID_XML_CHARS.sub("", str(value)), {'"': "&quot;"})
+
+
+def sheet_name(name: str) -> str:
+    """``name`` cleaned up to a valid worksheet name."""
+    name = _INVALID_XML_CHARS.sub("", _BAD_SHEET_CHARS.sub("_", str(name)))
+    return name[:_MAX_SHEET_NAME] or "Sheet"
+
+
+def sheet_names(names) -> list[str]:
+    """Valid worksheet names for ``names``, made unique with a ``~2``, ``~3`` ... suffix.
+
+    Excel compares sheet names case-insensitively, and cleaning can make
+    two names equal, e.g. by truncating them to 31 characters.
+    """
+    unique, seen = [], set()
+    for name in map(sheet_name, names):
+        candidate, n = name, 1
+        while candidate.lower() in seen:
+            n += 1
+            suffix = f"~{n}"
+            candidate = name[:_MAX_SHEET_NAME - len(suffix)] + suffix
+        seen.add(candidate.lower())
+        unique.append(candidate)
+    return unique
+
+
+def _column_letters(n: int) -> str:
+    letters = ""
+    n += 1
+    while n:
+        n, rem = divmod(n - 1, 26)
+        letters = chr(65 + rem) + letters
+    return letters
+
+
+def _cell(ref: str, value) -> str:
+    if value is None or value is pd.NA or value is pd.NaT:
+        return ""
+    if isinstance(value, (bool, np.bool_)):
+        return f'<c r="{ref}" t="b"><v>{int(value)}</v></c>'
+    if isinstance(value, numbers.Number):
+        if isinstance(value, float) and not math.isfinite(value):
+            return ""
+        return f'<c r="{ref}"><v>{value}</v></c>'
+    return f'<c r="{ref}" t="inlineStr"><is><t xml:space="preserve">{_xml_text(value)}</t></is></c>'
+
+
+def _rows_xml(rows, columns: list[str], first_row: int) -> str:
+    parts = []
+    for r, row in enumerate(rows, start=first_row):
+        cells = "".join(_cell(f"{col}{r}", value) for col, value in zip(columns, row))
+        parts.append(f'<row r="{r}">{cells}</row>')
+    return "".join(parts)
+
+
+def write_sheet(out: BinaryIO, frame: pd.DataFrame, chunk_rows: int = CHUNK_ROWS) -> None:
+    """Write ``frame`` as worksheet XML, header row first, ``chunk_rows`` rows at a time."""
+    columns = [_column_letters(i) for i in range(frame.shape[1])]
+    out.write(_SHEET_HEAD.encode())
+    out.write(_rows_xml([list(map(str, frame.columns))], columns, 1).encode())
+    for start in range(0, len(frame), chunk_rows):
+        rows = frame.iloc[start:start + chunk_rows].itertuples(index=False, name=None)
+        out.write(_rows_xml(rows, columns, start + 2).encode())
+    out.write(_SHEET_TAIL.encode())
+
+
+def write_workbook(out: BinaryIO, sheets: Mapping[str, pd.DataFrame], chunk_rows: int = CHUNK_ROWS) -> None:
+    """Write ``sheets`` (name -> frame) to ``out`` as an XLSX workbook.
+
+    ``out`` may be unseekable, e.g. an entry of an enclosing ZIP.
+    """
+    names = sheet_names(sheets)
+    numbered = range(1, len(names) + 1)
+    with zipfile.ZipFile(out, "w", compression=zipfile.ZIP_DEFLATED) as book:
+        book.writestr("[Content_Types].xml", _CONTENT_TYPES.format(sheets="".join(_SHEET_TYPE.format(n=n) for n in numbered)))
+        book.writestr("_rels/.rels", _ROOT_RELS)
+        book.writestr(
+            "xl/workbook.xml",
+            _WORKBOOK.format(sheets="".join(
+                f'<sheet name="{_xml_text(name)}" sheetId="{n}" r:id="rId{n}"/>' for n, name in zip(numbered, names)
+            )),
+        )
+        book.writestr("xl/_rels/workbook.xml.rels", _WORKBOOK_RELS.format(sheets="".join(_SHEET_REL.format(n=n) for n in numbered)))
+        for n, frame in zip(numbered, sheets.values()):
+            with book.open(f"xl/worksheets/sheet{n}.xml", "w") as entry:
+                write_sheet(entry, frame, chunk_rows)
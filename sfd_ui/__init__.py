@@ -0,0 +1 @@
+"""Streamlit helpers shared by the Solar Finance dashboards."""
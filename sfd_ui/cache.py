@@ -0,0 +1,55 @@
+"""Memoized pricing for the dashboards.
+
+Streamlit reruns the whole script on every widget change, including edits to
+text-only inputs such as the customer name or scope of work. Wrapping the
+engine calls in ``st.cache_data`` keyed on :class:`ProposalInputs` means
+those reruns, and repeated scenarios from other sessions on the same server,
+are served from cache instead of re-pricing.
+"""
+from __future__ import annotations
+
+import streamlit as st
+
+from sfd_engine import (
+    compare_financing,
+    investment_overview,
+    loan_schedule,
+    overview_programs,
+    price_programs,
+    price_proposal,
+    program_schedules,
+    search_programs,
+    sensitivity_grid,
+    simulate_risk,
+    tornado,
+)
+from sfd_engine.proposal import render_overview_pdf
+
+# Every cached function is bounded in size and expires entries after the TTL
+# so a long-running shared server does not grow without limit.
+CACHE_MAX_ENTRIES = 512
+CACHE_TTL = "1h"
+
+
+def cache_data(func=None, **kwargs):
+    """``st.cache_data`` with the dashboard-wide size and TTL defaults."""
+    kwargs.setdefault("max_entries", CACHE_MAX_ENTRIES)
+    kwargs.setdefault("ttl", CACHE_TTL)
+    kwargs.setdefault("show_spinner", False)
+    if func is None:
+        return st.cache_data(**kwargs)
+    return st.cache_data(func, **kwargs)
+
+
+cached_price_proposal = cache_data(price_proposal)
+cached_price_programs = cache_data(price_programs)
+cached_investment_overview = cache_data(investment_overview)
+cached_overview_programs = cache_data(overview_programs)
+cached_loan_schedule = cache_data(loan_schedule)
+cached_program_schedules = cache_data(program_schedules)
+cached_simulate_risk = cache_data(simulate_risk)
+cached_search_programs = cache_data(search_programs)
+cached_overview_pdf = cache_data(render_overview_pdf)
+cached_compare_financing = cache_data(compare_financing)
+cached_tornado = cache_data(tornado)
+cached_sensitivity_grid = cache_data(sensitivity_grid)
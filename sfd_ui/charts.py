@@ -0,0 +1,269 @@
+"""Dashboard charts as Altair (Vega-Lite) specs rendered in the browser.
+
+Each function turns the numbers a chart depends on into a small data frame
+and an Altair spec; Streamlit ships the series to the client, which draws
+the chart with hover tooltips and zoom/pan. Nothing is rasterized on the
+server and no figure objects outlive the rerun that built them.
+"""
+from __future__ import annotations
+
+import altair as alt
+import numpy as np
+import pandas as pd
+
+from sfd_engine import ProposalResult
+
+_CURRENCY = "$,.2f"
+
+
+def payment_comparison_chart(labels: tuple[str, ...], values: tuple[float, ...]) -> alt.Chart:
+    data = pd.DataFrame({"Option": labels, "Payment": values})
+    return (
+        alt.Chart(data, title="Monthly Payment Comparison")
+        .mark_bar()
+        .encode(
+            x=alt.X("Option:N", sort=None, title=None, axis=alt.Axis(labelAngle=0)),
+            y=alt.Y("Payment:Q", title="USD / month"),
+            tooltip=["Option:N", alt.Tooltip("Payment:Q", format=_CURRENCY)],
+        )
+    )
+
+
+def _cumulative_chart(cash_flows: np.ndarray, period: str, title: str, points: bool) -> alt.Chart:
+    data = pd.DataFrame({period: np.arange(len(cash_flows)), "Cumulative Savings": np.cumsum(cash_flows)})
+    return (
+        alt.Chart(data, title=title)
+        .mark_line(point=points)
+        .encode(
+            x=alt.X(f"{period}:Q"),
+            y=alt.Y("Cumulative Savings:Q", title="$ Cumulative Savings"),
+            tooltip=[f"{period}:Q", alt.Tooltip("Cumulative Savings:Q", format=_CURRENCY)],
+        )
+        .interactive()
+    )
+
+
+def annual_cash_flow_chart(cash_flows: np.ndarray) -> alt.Chart:
+    return _cumulative_chart(cash_flows, "Year", "Cumulative Annual Cash Flow", points=True)
+
+
+def monthly_cash_flow_chart(monthly_cash_flows: np.ndarray, schedule: pd.DataFrame | None = None) -> alt.Chart:
+    """Cumulative monthly savings, with the loan balance from ``schedule`` overlaid when given."""
+    if schedule is None:
+        return _cumulative_chart(monthly_cash_flows, "Month", "Cumulative Monthly Cash Flow", points=False)
+    months = np.arange(len(monthly_cash_flows))
+    # Month 0 is the loan draw, before the first payment
+    balance = np.concatenate([[schedule["balance"].iloc[0] + schedule["principal"].iloc[0]], schedule["balance"]])
+    data = pd.DataFrame({
+        "Month": np.concatenate([months, np.arange(len(balance))]),
+        "Amount": np.concatenate([np.cumsum(monthly_cash_flows), balance]),
+        "Series": ["Cumulative Savings"] * len(months) + ["Loan Balance"] * len(balance),
+    })
+    return (
+        alt.Chart(data, title="Cumulative Monthly Cash Flow")
+        .mark_line()
+        .encode(
+            x=alt.X("Month:Q"),
+            y=alt.Y("Amount:Q", title="$"),
+            color=alt.Color("Series:N", legend=alt.Legend(orient="bottom", title=None)),
+            tooltip=["Series:N", "Month:Q", alt.Tooltip("Amount:Q", format=_CURRENCY)],
+        )
+        .interactive()
+    )
+
+
+def financing_comparison_chart(frame: pd.DataFrame, measure: str = "Cumulative Net Savings") -> alt.Chart:
+    """One line per financing option of ``measure`` by month, from :meth:`FinancingComparison.frame`."""
+    return (
+        alt.Chart(frame, title=f"{measure}: Cash vs. Loan vs. Lease")
+        .mark_line()
+        .encode(
+            x=alt.X("Month:Q"),
+            y=alt.Y(f"{measure}:Q", title="$"),
+            color=alt.Color("Option:N", sort=None, legend=alt.Legend(orient="bottom", title=None)),
+            tooltip=["Option:N", "Month:Q", alt.Tooltip(f"{measure}:Q", format=_CURRENCY)],
+        )
+        .interactive()
+    )
+
+
+def tornado_chart(frame: pd.DataFrame, metric: str, title: str) -> alt.Chart:
+    """Bars from the base value of ``metric`` to its value at each input's low and high end.
+
+    ``frame`` is :func:`~sfd_engine.sensitivity.tornado` output; the widest
+    swing is drawn on top.
+    """
+    frame = frame.sort_values(f"{metric}_swing", ascending=False)
+    data = pd.DataFrame({
+        "Input": np.tile(frame["label"].to_numpy(), 2),
+        "Case": np.repeat(["Low", "High"], len(frame)),
+        "Setting": np.concatenate([frame["low_value"], frame["high_value"]]),
+        "Base": np.tile(frame[f"{metric}_base"].to_numpy(), 2),
+        "Value": np.concatenate([frame[f"{metric}_low"], frame[f"{metric}_high"]]),
+    })
+    return (
+        alt.Chart(data, title=f"{title}: Sensitivity to Each Input")
+        .mark_bar()
+        .encode(
+            y=alt.Y("Input:N", sort=list(frame["label"]), title=None),
+            x=alt.X("Value:Q", title=title),
+            x2="Base:Q",
+            color=alt.Color("Case:N", sort=["Low", "High"], legend=alt.Legend(orient="bottom", title=None)),
+            tooltip=["Input:N", "Case:N", alt.Tooltip("Setting:Q", format=",.2f"), alt.Tooltip("Value:Q", format=",.2f")],
+        )
+    )
+
+
+def heatmap_chart(grid: pd.DataFrame, x: str, y: str, metric: str, labels: dict[str, str]) -> alt.Chart:
+    """``metric`` over a grid of two inputs, from :func:`~sfd_engine.sensitivity.sensitivity_grid`."""
+    data = grid.round({x: 2, y: 2})
+    return (
+        alt.Chart(data, title=f"{labels[metric]} by {labels[x]} and {labels[y]}")
+        .mark_rect()
+        .encode(
+            x=alt.X(f"{x}:O", title=labels[x]),
+            y=alt.Y(f"{y}:O", title=labels[y], sort="descending"),
+            color=alt.Color(f"{metric}:Q", title=labels[metric], scale=alt.Scale(scheme="viridis")),
+            tooltip=[
+                alt.Tooltip(f"{x}:O", title=labels[x]),
+                alt.Tooltip(f"{y}:O", title=labels[y]),
+                alt.Tooltip(f"{metric}:Q", title=labels[metric], format=",.2f"),
+            ],
+        )
+    )
+
+
+def risk_band_chart(bands: pd.DataFrame) -> alt.LayerChart:
+    """P10-P90 band and P50 line of simulated cumulative cash flow by year."""
+    base = alt.Chart(bands, title="Cumulative Cash Flow, P10 / P50 / P90").encode(x=alt.X("Year:Q"))
+    band = base.mark_area(opacity=0.3).encode(
+        y=alt.Y("P10:Q", title="$ Cumulative Savings"),
+        y2="P90:Q",
+        tooltip=["Year:Q", *(alt.Tooltip(f"P{p}:Q", format=_CURRENCY) for p in (10, 50, 90))],
+    )
+    median = base.mark_line().encode(y="P50:Q")
+    return (band + median).interactive()
+
+
+def pareto_chart(candidates: pd.DataFrame) -> alt.LayerChart:
+    """Customer payment vs company revenue for every candidate, frontier highlighted."""
+    tooltip = [
+        "program:N",
+        alt.Tooltip("project_discount_pct:Q", title="Discount (%)"),
+        alt.Tooltip("monthly_payment:Q", title="Monthly Payment", format=_CURRENCY),
+        alt.Tooltip("company_revenue:Q", title="Revenue", format=_CURRENCY),
+    ]
+    base = alt.Chart(candidates, title="Payment vs Revenue").encode(
+        x=alt.X("monthly_payment:Q", title="Customer Monthly Payment ($)"),
+        y=alt.Y("company_revenue:Q", title="Company Revenue ($)"),
+        tooltip=tooltip,
+    )
+    points = base.mark_circle(size=20, opacity=0.35, color="gray")
+    frontier = base.transform_filter("datum.pareto").mark_line(point=True, color="orange")
+    return (points + frontier).interactive()
+
+
+# Waterfall bar kinds: "step" moves the running total, "incentive" is a step
+# drawn in its own colour, "subtotal" is a bar from zero to the running total.
+_WATERFALL_COLORS = {"incentive": "orange", "subtotal": "steelblue"}
+_MAX_TICK_LABELS = 40
+
+
+def waterfall_layout(values: np.ndarray, subtotal: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    """Bar bottoms and heights for a waterfall, computed with cumulative sums.
+
+    Steps start at the running total before them; subtotal bars ignore their
+    value and span zero to the running total at that point.
+    """
+    values = np.where(subtotal, 0.0, values)
+    running = np.cumsum(values)
+    bottoms = np.where(subtotal, 0.0, running - values)
+    heights = np.where(subtotal, running, values)
+    return bottoms, heights
+
+
+def waterfall_steps(
+    upfront_cost: float,
+    incentives: dict[str, float],
+    savings: np.ndarray,
+    period: str = "Year",
+    subtotal_every: int = 0,
+) -> tuple[tuple[str, ...], np.ndarray, tuple[str, ...]]:
+    """Labels, values and kinds for a cash-flow waterfall.
+
+    The upfront cost comes first, then one incentive step per non-zero
+    incentive, then one step per savings period. With ``subtotal_every`` a
+    running subtotal is inserted after every that many periods (e.g. 12 for a
+    yearly subtotal on monthly savings); a final "Net" subtotal always closes
+    the chart.
+    """
+    savings = np.asarray(savings, dtype=float)
+    periods = np.arange(1, savings.size + 1)
+    labels = np.array([f"{period} {i}" for i in periods], dtype=object)
+    kinds = np.full(savings.size, "step", dtype=object)
+    if subtotal_every:
+        at = periods[subtotal_every - 1:-1:subtotal_every]  # the closing "Net" covers the last one
+        savings = np.insert(savings, at, 0.0)
+        labels = np.insert(labels, at, [f"Year {i // subtotal_every}" for i in at])
+        kinds = np.insert(kinds, at, "subtotal")
+
+    credits = {name: amount for name, amount in incentives.items() if amount}
+    values = np.concatenate([[-upfront_cost], list(credits.values()), savings, [0.0]])
+    labels = ("Upfront Cost", *credits, *labels, "Net")
+    kinds = ("step", *["incentive"] * len(credits), *kinds, "subtotal")
+    return labels, values, kinds
+
+
+def waterfall_chart(labels: tuple[str, ...], values: np.ndarray, kinds: tuple[str, ...]) -> alt.Chart:
+    kinds_arr = np.array(kinds)
+    bottoms, heights = waterfall_layout(values, kinds_arr == "subtotal")
+    colors = np.where(heights > 0, "green", "red").astype(object)
+    for kind, color in _WATERFALL_COLORS.items():
+        colors[kinds_arr == kind] = color
+
+    data = pd.DataFrame({
+        "Step": labels,
+        "Amount": heights,
+        "Start": bottoms,
+        "End": bottoms + heights,
+        "Color": colors,
+    })
+    # Long (monthly) charts only label the non-step bars
+    ticks = alt.Undefined
+    if len(labels) > _MAX_TICK_LABELS:
+        ticks = [label for label, kind in zip(labels, kinds) if kind != "step"]
+    return (
+        alt.Chart(data, title="Waterfall: Cash Flow Components")
+        .mark_bar()
+        .encode(
+            x=alt.X("Step:N", sort=None, title=None, axis=alt.Axis(values=ticks, labelAngle=-45)),
+            y=alt.Y("Start:Q", title=None),
+            y2="End:Q",
+            color=alt.Color("Color:N", scale=None),
+            tooltip=[
+                "Step:N",
+                alt.Tooltip("Amount:Q", format=_CURRENCY),
+                alt.Tooltip("End:Q", title="Running Total", format=_CURRENCY),
+            ],
+        )
+        .interactive(bind_x=False)
+    )
+
+
+def cash_flow_waterfall_chart(quote: ProposalResult, monthly: bool = False) -> alt.Chart:
+    """Waterfall of a priced proposal: gross cost, applied incentives, savings, net.
+
+    Annual mode has one bar per year; monthly mode one bar per month with a
+    subtotal at the end of each year.
+    """
+    credits_applied = quote.gross_cost != quote.adjusted_system_cost
+    incentives = {
+        "Federal Tax Credit": quote.federal_tax_credit,
+        "Battery Credit": quote.battery_credit,
+        "NY Solar Credit": quote.ny_solar_credit,
+    } if credits_applied else {}
+    if monthly:
+        steps = waterfall_steps(quote.gross_cost, incentives, quote.monthly_cash_flows[1:], "Month", subtotal_every=12)
+    else:
+        steps = waterfall_steps(quote.gross_cost, incentives, quote.cash_flows[1:])
+    return waterfall_chart(*steps)
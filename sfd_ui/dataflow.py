@@ -0,0 +1,40 @@
+"""Per-session incremental pricing and its recompute trace."""
+from __future__ import annotations
+
+import pandas as pd
+import streamlit as st
+
+from sfd_engine.pricing import ProposalModel
+
+from .memory import session_artifact
+
+
+def session_model(key: str = "pricing_model") -> ProposalModel:
+    """This session's :class:`ProposalModel`, created on first use (or after eviction)."""
+    return session_artifact(key, ProposalModel)
+
+
+def recompute_panel(model: ProposalModel) -> None:
+    """Which pricing nodes the last rerun recomputed, and how long each took."""
+    touched = {timing.name: timing for timing in model.trace}
+    recomputed = [timing for timing in touched.values() if timing.recomputed]
+    nodes = model.evaluator.flow.nodes
+    with st.expander("🔍 Recompute Trace", expanded=False):
+        st.caption(
+            f"{len(recomputed)} of {len(nodes)} nodes recomputed "
+            f"in {sum(timing.seconds for timing in recomputed) * 1000:.3f} ms"
+        )
+        st.dataframe(
+            pd.DataFrame({
+                "Node": list(nodes),
+                "Reads": [", ".join(node.deps) for node in nodes.values()],
+                "Status": [
+                    ("recomputed" if touched[name].recomputed else "verified") if name in touched else "reused"
+                    for name in nodes
+                ],
+                "Time (ms)": [touched[name].seconds * 1000 if name in touched else 0.0 for name in nodes],
+                "Recomputes": [model.evaluator.recomputed[name] for name in nodes],
+            }),
+            use_container_width=True,
+            hide_index=True,
+        )
@@ -0,0 +1,31 @@
+"""Export bundle download button: every table in one ZIP, built only on click."""
+from __future__ import annotations
+
+from functools import partial
+from typing import Mapping
+
+import streamlit as st
+
+from sfd_engine.export import TableSource, export_bundle
+
+
+def _bundle_bytes(tables: Mapping[str, TableSource]) -> bytes:
+    with export_bundle(tables) as bundle:
+        return bundle.read()
+
+
+def export_bundle_button(tables: Mapping[str, TableSource], file_name: str = "solar_proposal_export.zip") -> None:
+    """Download button for ``tables`` as CSV, Parquet and XLSX in one ZIP.
+
+    Nothing is serialized on a normal rerun. Streamlit calls the bundle
+    builder only when the button is clicked. Pass a callable instead of a
+    frame for tables the page does not otherwise build.
+    """
+    st.download_button(
+        "📦 Download Export Bundle (CSV, Parquet, XLSX)",
+        data=partial(_bundle_bytes, dict(tables)),
+        file_name=file_name,
+        mime="application/zip",
+        on_click="ignore",
+        key="export_bundle",
+    )
@@ -0,0 +1,26 @@
+"""Cash vs. loan vs. lease panel shared by the dashboards' customer sections."""
+from __future__ import annotations
+
+import streamlit as st
+
+from sfd_engine import ProposalInputs
+
+from .cache import cached_compare_financing
+from .charts import financing_comparison_chart
+
+MEASURES = ("Cumulative Net Savings", "Cumulative Cost")
+
+
+def financing_panel(inputs: ProposalInputs) -> None:
+    """Cash, loan and lease paths for ``inputs`` over the system life: summary table and cumulative chart."""
+    comparison = cached_compare_financing(inputs)
+    st.caption(f"All three options over {len(comparison.months) // 12} years, with the same utility savings.")
+    summary = comparison.summary()
+    money = [column for column in summary.columns if column not in ("Option", "Break-even Month")]
+    st.dataframe(
+        summary.style.format("${:,.0f}", subset=money).format("{:.0f}", subset=["Break-even Month"], na_rep="never"),
+        use_container_width=True,
+        hide_index=True,
+    )
+    measure = st.radio("Show", MEASURES, horizontal=True, key="financing_measure")
+    st.altair_chart(financing_comparison_chart(comparison.frame(), measure), use_container_width=True)
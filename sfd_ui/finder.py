@@ -0,0 +1,57 @@
+"""Program finder panel: the loans that meet a customer's payment and revenue targets."""
+from __future__ import annotations
+
+import streamlit as st
+
+from sfd_engine import ProposalInputs
+
+from .cache import cached_search_programs
+from .charts import pareto_chart
+
+_DISPLAY_COLUMNS = {
+    "program": "Program",
+    "project_discount_pct": "Discount (%)",
+    "monthly_payment": "Monthly Payment",
+    "company_revenue": "Company Revenue",
+    "savings_25yr": "25-Year Savings",
+    "npv": "NPV (5% rate)",
+}
+
+
+def program_finder(inputs: ProposalInputs, programs) -> None:
+    """Targets form plus the payment/revenue Pareto frontier over ``programs`` and every discount."""
+    with st.expander("Program Finder", expanded=False):
+        col1, col2, col3 = st.columns(3)
+        with col1:
+            max_payment = st.number_input(
+                "Max Monthly Payment ($)", value=0.0, step=10.0, help="0 for no limit", key="finder_max_payment"
+            )
+        with col2:
+            min_savings = st.number_input(
+                "Min 25-Year Savings ($)", value=0.0, step=1000.0, help="0 for no limit", key="finder_min_savings"
+            )
+        with col3:
+            min_revenue = st.number_input(
+                "Min Company Revenue ($)", value=0.0, step=1000.0, help="0 for no limit", key="finder_min_revenue"
+            )
+
+        if inputs.hourly_production:
+            st.caption("25-year savings and NPV here use the flat monthly bill, not hourly production.")
+        candidates = cached_search_programs(
+            inputs,
+            max_payment=max_payment or None,
+            min_savings=min_savings or None,
+            min_revenue=min_revenue or None,
+            programs=programs,
+        )
+        if candidates.empty:
+            st.warning("No program and discount meets these targets.")
+            return
+        frontier = candidates[candidates["pareto"]]
+        st.caption(f"{len(candidates):,} program/discount combinations meet the targets; {len(frontier)} are on the frontier.")
+        st.altair_chart(pareto_chart(candidates), use_container_width=True)
+        st.dataframe(
+            frontier[list(_DISPLAY_COLUMNS)].rename(columns=_DISPLAY_COLUMNS),
+            use_container_width=True,
+            hide_index=True,
+        )
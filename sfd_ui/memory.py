@@ -0,0 +1,171 @@
+"""Shared process resources and per-session memory budgets.
+
+One server hosts many sales reps, so anything every session needs
+(program catalog, payment factor table, compiled overview templates) is
+loaded once per process and shared. What a session keeps between reruns
+(its pricing model, overview renderer, ...) goes through
+:func:`session_artifact`. Artifacts are sized when stored and evicted
+least-recently-used first once the session exceeds
+:data:`SESSION_BUDGET_BYTES`; an evicted artifact is simply rebuilt the
+next time it is asked for. Every live session's store is registered so
+the Server Metrics page can report memory per session.
+"""
+from __future__ import annotations
+
+import os
+import sys
+import threading
+import time
+import weakref
+from collections import OrderedDict
+from typing import Any, Callable
+
+import numpy as np
+import pandas as pd
+import streamlit as st
+from streamlit.runtime.scriptrunner import get_script_run_ctx
+
+from sfd_engine import Dataflow, PaymentFactorTable, ProgramCatalog, load_catalog, payment_factor_table
+from sfd_engine.pdf import CompiledPage
+from sfd_engine.proposal import OVERVIEW_HTML, overview_template
+from sfd_engine.templating import Template
+
+SESSION_BUDGET_BYTES = 16 * 1024 * 1024
+
+# Process-wide objects: referenced by session artifacts but not charged to them.
+_SHARED_TYPES = (Dataflow, ProgramCatalog, PaymentFactorTable, CompiledPage, Template)
+
+
+def byte_size(obj: Any, count_shared: bool = False) -> int:
+    """Approximate memory held by ``obj``.
+
+    Shared process resources it references are not counted, unless
+    ``count_shared`` (used to size the shared resources themselves).
+    """
+    seen: set[int] = set()
+    total = 0
+    stack = [obj]
+    while stack:
+        item = stack.pop()
+        if id(item) in seen or callable(item) or (not count_shared and isinstance(item, _SHARED_TYPES)):
+            continue
+        seen.add(id(item))
+        if isinstance(item, pd.DataFrame):
+            total += int(item.memory_usage(deep=True).sum())
+        elif isinstance(item, pd.Series):
+            total += int(item.memory_usage(deep=True))
+        elif isinstance(item, np.ndarray):
+            total += item.nbytes
+        else:
+            total += sys.getsizeof(item)
+            if isinstance(item, dict):
+                stack.extend(item.keys())
+                stack.extend(item.values())
+            elif isinstance(item, (list, tuple, set, frozenset)):
+                stack.extend(item)
+            elif hasattr(item, "__dict__"):
+                stack.append(vars(item))
+    return total
+
+
+class SessionArtifacts:
+    """One session's artifacts, least recently used first, kept within ``budget`` bytes."""
+
+    def __init__(self, session_id: str, budget: int = SESSION_BUDGET_BYTES):
+        self.session_id = session_id
+        self.budget = budget
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.last_active = time.time()
+        self._items: OrderedDict[str, tuple[Any, int]] = OrderedDict()
+
+    @property
+    def total_bytes(self) -> int:
+        return sum(size for _, size in list(self._items.values()))
+
+    def sizes(self) -> dict[str, int]:
+        # Copied first: the metrics page reads other sessions' stores from its own thread
+        return {key: size for key, (_, size) in list(self._items.items())}
+
+    def get(self, key: str, build: Callable[[], Any]) -> Any:
+        """The artifact ``key``, built with ``build()`` if missing or evicted.
+
+        The artifact is re-sized on every access, since most of them (a
+        pricing model, a renderer) grow as they are used.
+        """
+        self.last_active = time.time()
+        if key in self._items:
+            self.hits += 1
+            value = self._items.pop(key)[0]
+        else:
+            self.misses += 1
+            value = build()
+        self._items[key] = (value, byte_size(value))
+        self._evict(keep=key)
+        return value
+
+    def _evict(self, keep: str) -> None:
+        while self.total_bytes > self.budget and len(self._items) > 1:
+            oldest = next(iter(self._items))
+            if oldest == keep:
+                break
+            del self._items[oldest]
+            self.evictions += 1
+
+
+@st.cache_resource(show_spinner=False)
+def _session_registry() -> tuple[weakref.WeakValueDictionary, threading.Lock]:
+    """Live sessions' artifact stores. A store disappears when its session ends."""
+    return weakref.WeakValueDictionary(), threading.Lock()
+
+
+def live_sessions() -> list[SessionArtifacts]:
+    registry, lock = _session_registry()
+    with lock:
+        return list(registry.values())
+
+
+def session_artifacts() -> SessionArtifacts:
+    """This session's artifact store, registered on first use."""
+    store = st.session_state.get("_artifacts")
+    if store is None:
+        shared_resources()
+        ctx = get_script_run_ctx()
+        store = st.session_state["_artifacts"] = SessionArtifacts(ctx.session_id if ctx else "local")
+        registry, lock = _session_registry()
+        with lock:
+            registry[store.session_id] = store
+    return store
+
+
+def session_artifact(key: str, build: Callable[[], Any]) -> Any:
+    """Per-session artifact ``key``; see :class:`SessionArtifacts`."""
+    return session_artifacts().get(key, build)
+
+
+@st.cache_resource(show_spinner=False)
+def shared_resources() -> dict[str, Any]:
+    """Everything sessions share, loaded once when the first session starts."""
+    return {
+        "program_catalog": load_catalog(),
+        "payment_factor_table": payment_factor_table(),
+        "overview_html_template": OVERVIEW_HTML,
+        "overview_pdf_template": overview_template(),
+    }
+
+
+def process_rss() -> int | None:
+    """Resident memory of this server process in bytes, where the OS reports it."""
+    try:
+        with open("/proc/self/statm") as fh:
+            return int(fh.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError):
+        pass
+    try:
+        import resource
+    except ImportError:
+        return None
+    # Peak rather than current RSS; kilobytes on Linux, bytes on macOS
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak if sys.platform == "darwin" else peak * 1024
@@ -0,0 +1,56 @@
+"""Monte Carlo risk mode panel shared by the dashboards' company sections."""
+from __future__ import annotations
+
+import streamlit as st
+
+from sfd_engine import ProposalResult, RiskAssumptions
+
+from .cache import cached_simulate_risk
+from .charts import risk_band_chart
+
+PATH_COUNTS = (1_000, 10_000, 50_000)
+
+
+def risk_panel(quote: ProposalResult) -> None:
+    """Toggleable P10/P50/P90 view of NPV, IRR and payback for ``quote``."""
+    if not st.toggle("Monte Carlo risk mode", value=False, key="risk_mode"):
+        return
+
+    hourly = quote.production_kwh is not None
+    with st.expander("Risk Assumptions", expanded=False):
+        if hourly:
+            st.caption(
+                "Savings come from hourly production, already degraded at the sidebar's Panel Degradation; "
+                "the degradation sliders do not apply."
+            )
+        col1, col2, col3 = st.columns(3)
+        with col1:
+            escalation_mean = st.slider("Utility Escalation (%/yr)", 0.0, 10.0, 4.0, 0.25, key="risk_escalation_mean")
+            escalation_sd = st.slider("Escalation Std Dev (%)", 0.0, 5.0, 1.5, 0.25, key="risk_escalation_sd")
+        with col2:
+            degradation_mean = st.slider("Panel Degradation (%/yr)", 0.0, 2.0, 0.5, 0.05, key="risk_degradation_mean", disabled=hourly)
+            degradation_sd = st.slider("Degradation Std Dev (%)", 0.0, 1.0, 0.2, 0.05, key="risk_degradation_sd", disabled=hourly)
+        with col3:
+            discount_mean = st.slider("Discount Rate (%)", 0.0, 15.0, 5.0, 0.25, key="risk_discount_mean")
+            discount_sd = st.slider("Discount Std Dev (%)", 0.0, 5.0, 1.0, 0.25, key="risk_discount_sd")
+        paths = st.select_slider("Paths", options=PATH_COUNTS, value=10_000, key="risk_paths")
+
+    assumptions = RiskAssumptions(
+        escalation_mean=escalation_mean / 100,
+        escalation_sd=escalation_sd / 100,
+        degradation_mean=degradation_mean / 100,
+        degradation_sd=degradation_sd / 100,
+        discount_mean=discount_mean / 100,
+        discount_sd=discount_sd / 100,
+    )
+    result = cached_simulate_risk(quote, assumptions, paths)
+
+    table = result.percentiles()
+    st.dataframe(
+        table.style.format("${:,.0f}", subset=(["NPV"], table.columns))
+        .format("{:.2%}", subset=(["IRR"], table.columns))
+        .format("{:.0f}", subset=(["Payback (years)"], table.columns)),
+        use_container_width=True,
+    )
+    st.metric("Probability of Payback", f"{result.probability_of_payback():.1%}")
+    st.altair_chart(risk_band_chart(result.bands()), use_container_width=True)
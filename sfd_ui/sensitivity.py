@@ -0,0 +1,52 @@
+"""Sensitivity mode panel shared by the dashboards' company sections."""
+from __future__ import annotations
+
+import streamlit as st
+
+from sfd_engine import SENSITIVITY_LABELS, SENSITIVITY_METRICS, SENSITIVITY_RANGES, ProposalInputs
+
+from .cache import cached_sensitivity_grid, cached_tornado
+from .charts import heatmap_chart, tornado_chart
+
+HEATMAP_DEFAULTS = ("project_discount_pct", "dealer_fee", "company_revenue")
+
+
+def sensitivity_panel(inputs: ProposalInputs) -> None:
+    """Toggleable tornado chart of every input for ``inputs``, and a heatmap of any two."""
+    if not st.toggle("Sensitivity mode", value=False, key="sensitivity_mode"):
+        return
+
+    if inputs.hourly_production:
+        st.caption("The sweeps value savings at the flat monthly bill, not hourly production.")
+    metrics = list(SENSITIVITY_METRICS)
+    metric = st.selectbox(
+        "Tornado Metric", metrics, format_func=SENSITIVITY_METRICS.get, key="sensitivity_metric"
+    )
+    frame = cached_tornado(inputs)
+    st.altair_chart(tornado_chart(frame, metric, SENSITIVITY_METRICS[metric]), use_container_width=True)
+
+    default_x, default_y, default_metric = HEATMAP_DEFAULTS
+    names = list(SENSITIVITY_RANGES)
+    col1, col2, col3 = st.columns(3)
+    with col1:
+        x = st.selectbox(
+            "Heatmap Columns", names, index=names.index(default_x), format_func=SENSITIVITY_LABELS.get, key="heatmap_x"
+        )
+    with col2:
+        y = st.selectbox(
+            "Heatmap Rows", names, index=names.index(default_y), format_func=SENSITIVITY_LABELS.get, key="heatmap_y"
+        )
+    with col3:
+        heatmap_metric = st.selectbox(
+            "Heatmap Metric",
+            metrics,
+            index=metrics.index(default_metric),
+            format_func=SENSITIVITY_METRICS.get,
+            key="heatmap_metric",
+        )
+    if x == y:
+        st.info("Pick two different inputs for the heatmap.")
+        return
+    grid = cached_sensitivity_grid(inputs, x, y, heatmap_metric)
+    labels = {**SENSITIVITY_LABELS, **SENSITIVITY_METRICS}
+    st.altair_chart(heatmap_chart(grid, x, y, heatmap_metric, labels), use_container_width=True)
@@ -0,0 +1,17 @@
+import pytest
+
+from sfd_engine import ProposalInputs
+
+
+@pytest.fixture
+def inputs() -> ProposalInputs:
+    """A typical NY proposal on the 25-year, 4.49% program."""
+    return ProposalInputs(
+        system_size_kw=7.5,
+        cost_per_watt=3.5,
+        electric_bill=300,
+        loan_term=25,
+        loan_apr=4.49,
+        dealer_fee=35.99,
+        roof_cost=5000,
+    )
@@ -0,0 +1,30 @@
+"""Closed-form amortization against numpy_financial's ipmt/ppmt."""
+import numpy as np
+import numpy_financial as npf
+import pytest
+
+from sfd_engine import amortize
+
+LOANS = [(40_000.0, 0.0599 / 12, 300), (25_000.0, 0.0449 / 12, 120), (12_000.0, 0.0, 60)]
+
+
+@pytest.mark.filterwarnings("ignore:invalid value:RuntimeWarning")  # numpy_financial at a 0% rate
+@pytest.mark.parametrize("principal, rate, nper", LOANS)
+def test_amortize_matches_ipmt_ppmt(principal, rate, nper):
+    schedule = amortize(principal, rate, nper)
+    months = np.arange(1, nper + 1)
+    np.testing.assert_allclose(schedule["interest"], -npf.ipmt(rate, months, nper, principal), atol=1e-8)
+    np.testing.assert_allclose(schedule["principal"], -npf.ppmt(rate, months, nper, principal), atol=1e-8)
+    np.testing.assert_allclose(schedule["payment"], -npf.pmt(rate, nper, principal), rtol=1e-12)
+    assert schedule["balance"][-1] == 0.0
+    assert schedule["principal"].sum() == pytest.approx(principal)
+
+
+def test_amortize_broadcasts_and_zero_pads():
+    principal, rate, nper = (np.array(column) for column in zip(*LOANS))
+    schedule = amortize(principal, rate, nper)
+    assert schedule["payment"].shape == (len(LOANS), 300)
+    for row, loan in enumerate(LOANS):
+        single = amortize(*loan)
+        np.testing.assert_allclose(schedule["balance"][row, : loan[2]], single["balance"], atol=1e-8)
+        assert not schedule["payment"][row, loan[2]:].any()
@@ -0,0 +1,67 @@
+"""Closed-form annuity solutions against numpy_financial and direct sums."""
+import numpy as np
+import numpy_financial as npf
+import pytest
+
+from sfd_engine import irr, npv, payment
+from sfd_engine.annuity import annuity_factor, annuity_irr, annuity_payback, as_annuity
+
+CASES = [
+    # cost, payment, periods, growth
+    (30_000.0, 3_600.0, 25, 0.0),
+    (30_000.0, 3_600.0, 25, 0.035),
+    (45_000.0, 2_000.0, 10, -0.005),
+    (10_000.0, 12_000.0, 1, 0.0),
+    (50_000.0, 1_000.0, 20, 0.0),  # negative IRR
+]
+
+
+def _series(cost, pay, n, growth):
+    return np.concatenate(([-cost], pay * (1 + growth) ** np.arange(n)))
+
+
+@pytest.mark.parametrize("cost, pay, n, growth", CASES)
+def test_annuity_irr_matches_numpy_financial(cost, pay, n, growth):
+    expected = npf.irr(_series(cost, pay, n, growth))
+    assert annuity_irr(cost, pay, n, growth) == pytest.approx(expected, rel=1e-8, abs=1e-10)
+
+
+def test_annuity_irr_vectorized_matches_scalar():
+    cost, pay, n, growth = (np.array(column) for column in zip(*CASES))
+    np.testing.assert_allclose(annuity_irr(cost, pay, n, growth), [annuity_irr(*case) for case in CASES], rtol=1e-9)
+
+
+def test_annuity_irr_without_sign_change_is_nan():
+    assert np.isnan(annuity_irr(-1_000.0, 100.0, 10))
+    assert np.isnan(annuity_irr([1_000.0, 0.0], [100.0, 100.0], [10, 10])).tolist() == [False, True]
+
+
+@pytest.mark.parametrize("cost, pay, n, growth", CASES + [(0.0, 100.0, 5, 0.0), (1_000.0, 100.0, 10, 0.0)])
+def test_annuity_payback_matches_cumulative_scan(cost, pay, n, growth):
+    hits = np.flatnonzero(np.cumsum(_series(cost, pay, n, growth)) >= 0)
+    expected = float(hits[0]) if hits.size else np.nan
+    np.testing.assert_equal(annuity_payback(cost, pay, n, growth), expected)
+
+
+@pytest.mark.parametrize("rate", [0.0, 0.05, 0.12])
+@pytest.mark.parametrize("growth", [0.0, 0.04, 0.05])
+def test_annuity_factor_matches_discounted_sum(rate, growth):
+    flows = (1 + growth) ** np.arange(25)
+    expected = (flows / (1 + rate) ** np.arange(1, 26)).sum()
+    assert annuity_factor(rate, 25, growth) == pytest.approx(expected, rel=1e-10)
+
+
+@pytest.mark.parametrize("rate, nper, principal", [(0.0599 / 12, 300, 40_000.0), (0.0, 120, 12_000.0), (0.1 / 12, 1, 500.0)])
+def test_payment_matches_pmt(rate, nper, principal):
+    assert payment(rate, nper, principal) == pytest.approx(abs(npf.pmt(rate, nper, principal)), rel=1e-12)
+
+
+def test_npv_matches_numpy_financial():
+    values = _series(30_000.0, 3_600.0, 25, 0.02)
+    assert npv(0.05, values) == pytest.approx(npf.npv(0.05, values), rel=1e-12)
+
+
+def test_irr_falls_back_for_irregular_flows():
+    values = [-10_000.0, 2_000.0, 5_000.0, 1_000.0, 4_000.0]
+    assert as_annuity(values) is None
+    assert irr(values) == pytest.approx(npf.irr(values), rel=1e-12)
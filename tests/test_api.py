@@ -0,0 +1,121 @@
+"""The pricing API: lead normalization, the quote cache and the endpoints."""
+import asyncio
+import json
+
+import pandas as pd
+import pytest
+
+from sfd_engine.bulk import price_frame
+
+api = pytest.importorskip("sfd_engine.api")
+
+PROGRAM = (25, 4.49, 35.99)
+LEAD = {"system_size_kw": 7.5, "cost_per_watt": 3.5, "electric_bill": 300}
+
+
+def _request(app, method: str, path: str, body=None) -> tuple[int, dict]:
+    """Call the ASGI app in-process; returns the status and decoded JSON body."""
+    content = body if isinstance(body, bytes) else json.dumps(body).encode() if body is not None else b""
+    scope = {
+        "type": "http",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "method": method,
+        "scheme": "http",
+        "path": path,
+        "raw_path": path.encode(),
+        "query_string": b"",
+        "root_path": "",
+        "headers": [(b"content-length", str(len(content)).encode())],
+        "client": ("127.0.0.1", 0),
+        "server": ("127.0.0.1", 8502),
+    }
+    sent = []
+
+    async def receive():
+        return {"type": "http.request", "body": content, "more_body": False}
+
+    async def send(message):
+        sent.append(message)
+
+    asyncio.run(app(scope, receive, send))
+    return sent[0]["status"], json.loads(b"".join(m.get("body", b"") for m in sent[1:]))
+
+
+@pytest.fixture
+def app():
+    return api.create_app()
+
+
+def test_null_fields_take_their_defaults():
+    assert api.normalize_lead({**LEAD, "lease_eligible": None, "state": None, "roof_cost": None}, PROGRAM) == (
+        api.normalize_lead(LEAD, PROGRAM)
+    )
+
+
+@pytest.mark.parametrize("term", [25.9, 0, -5])
+def test_rejects_bad_terms(term):
+    with pytest.raises(api.InvalidLead):
+        api.normalize_lead({**LEAD, "loan_term": term}, PROGRAM)
+
+
+@pytest.mark.parametrize("field, value", [("electric_bill", "lots"), ("cost_per_watt", True), ("system_size_kw", None)])
+def test_rejects_bad_numbers(field, value):
+    with pytest.raises(api.InvalidLead, match=field):
+        api.normalize_lead({**LEAD, field: value}, PROGRAM)
+
+
+def test_api_and_bulk_price_the_same_lead():
+    lead = {**LEAD, "state": "nj", "lease_eligible": "no", "roof_cost": 2500}
+    quote = api.price_leads([api.normalize_lead(lead, PROGRAM)])[0]
+    row = price_frame(pd.DataFrame([lead]), PROGRAM).iloc[0]
+    for name in api.QUOTE_FIELDS:
+        assert quote[name] == pytest.approx(row[name], nan_ok=True), name
+
+
+def test_cache_prices_only_misses_and_evicts_oldest():
+    cache = api.QuoteCache(max_entries=2)
+    first, second, third = (api.normalize_lead({**LEAD, "electric_bill": bill}, PROGRAM) for bill in (200, 250, 300))
+    cache.quote([first, second, first])
+    assert (cache.hits, cache.misses, len(cache)) == (1, 2, 2)
+    cache.quote([first])
+    cache.quote([third])
+    assert (cache.hits, cache.misses, len(cache)) == (2, 3, 2)
+    cache.quote([second])
+    assert cache.misses == 4
+
+
+def test_quote_single_lead(app):
+    status, body = _request(app, "POST", "/quote", {**LEAD, "loan_term": 25, "loan_apr": 4.49, "dealer_fee": 35.99})
+    assert status == 200
+    assert body == api.price_leads([api.normalize_lead(LEAD, PROGRAM)])[0]
+
+
+def test_quote_batch_keeps_order(app):
+    leads = [{**LEAD, "electric_bill": bill} for bill in (150, 300, 150)]
+    status, body = _request(app, "POST", "/quote", {"program": list(PROGRAM), "leads": leads})
+    assert status == 200
+    quotes = body["quotes"]
+    assert len(quotes) == 3 and quotes[0] == quotes[2] != quotes[1]
+    _, health = _request(app, "GET", "/health")
+    assert (health["cached_quotes"], health["cache_misses"], health["cache_hits"]) == (2, 2, 1)
+
+
+@pytest.mark.parametrize("body, error", [
+    (b"{not json", "body must be JSON"),
+    ({"leads": "x"}, "lead object"),
+    ({"program": [25], "leads": []}, "program must be"),
+    ({"program": list(PROGRAM), "leads": [LEAD, {**LEAD, "electric_bill": "x"}]}, "lead 1: electric_bill"),
+])
+def test_quote_rejects_bad_requests(app, body, error):
+    status, response = _request(app, "POST", "/quote", body)
+    assert status == 400
+    assert error in response["error"]
+
+
+def test_programs_lists_the_catalog(app):
+    status, body = _request(app, "GET", "/programs")
+    catalog = api.load_catalog()
+    assert status == 200
+    assert body["version"] == catalog.version
+    assert [tuple(p.values()) for p in body["programs"]] == [tuple(p) for p in catalog.programs]
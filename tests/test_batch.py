@@ -0,0 +1,60 @@
+"""price_batch and price_programs agree with price_proposal."""
+import itertools
+import math
+from dataclasses import asdict, replace
+
+import numpy as np
+import pytest
+
+from sfd_engine import BATCH_COLUMNS, price_batch, price_programs, price_proposal
+from sfd_engine.sensitivity import _BATCH_FIELDS
+
+VARIANTS = [
+    dict(zip(("state", "include_incentives", "project_discount_pct", "utility_escalation", "degradation"), values))
+    for values in itertools.product(("NY", "NJ"), (True, False), (0.0, 15.0), (0.0, 3.0), (0.0, 0.5))
+]
+PROGRAMS = [(10, 6.99, 15.0), (20, 5.99, 27.49), (25, 4.49, 35.99)]
+
+
+def _same(actual, expected):
+    if expected is None or (isinstance(expected, float) and math.isnan(expected)):
+        return math.isnan(actual)
+    return actual == pytest.approx(expected, rel=1e-9, abs=1e-6)
+
+
+def _batch_row(inputs):
+    fields = asdict(inputs)
+    priced = price_batch(**{name: fields[name] for name in _BATCH_FIELDS})
+    return {name: float(values[0]) for name, values in priced.items()}
+
+
+@pytest.mark.parametrize("variant", VARIANTS, ids=lambda v: "-".join(map(str, v.values())))
+def test_price_batch_matches_price_proposal(inputs, variant):
+    proposal = replace(inputs, **variant)
+    quote = price_proposal(proposal)
+    row = _batch_row(proposal)
+    for name in BATCH_COLUMNS:
+        expected = getattr(quote, name, getattr(proposal, name, None))
+        assert _same(row[name], expected), name
+
+
+@pytest.mark.parametrize("escalation, degradation", [(0.0, 0.0), (3.0, 0.5)])
+def test_price_programs_matches_price_proposal(inputs, escalation, degradation):
+    proposal = replace(inputs, utility_escalation=escalation, degradation=degradation)
+    grid = price_programs(proposal, PROGRAMS)
+    for (term, apr, fee), (_, row) in zip(PROGRAMS, grid.iterrows()):
+        quote = price_proposal(replace(proposal, loan_term=term, loan_apr=apr, dealer_fee=fee))
+        for name in ("monthly_payment", "company_revenue", "npv", "irr", "roi"):
+            assert _same(row[name], getattr(quote, name)), name
+        assert row["payback_year"] == quote.payback_year
+
+
+def test_price_batch_broadcasts(inputs):
+    priced = price_batch(7.5, 3.5, np.array([[200.0], [300.0]]), 25, 4.49, np.array([15.0, 27.49, 35.99]))
+    assert priced["npv"].shape == (6,)
+
+
+def test_price_programs_values_flat_savings_in_hourly_mode(inputs):
+    flat = price_programs(inputs, PROGRAMS)
+    hourly = price_programs(replace(inputs, hourly_production=True), PROGRAMS)
+    assert hourly["npv"].tolist() == flat["npv"].tolist()
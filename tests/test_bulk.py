@@ -0,0 +1,53 @@
+"""Lead parsing and chunked pricing in the bulk CLI."""
+import io
+from dataclasses import replace
+
+import pandas as pd
+import pytest
+
+from sfd_engine import price_proposal
+from sfd_engine.bulk import frame_arguments, price_frame, run
+
+PROGRAM = (25, 4.49, 35.99)
+LEAD = {"system_size_kw": 7.5, "cost_per_watt": 3.5, "electric_bill": 300}
+
+
+def test_blank_flags_take_their_defaults():
+    leads = pd.read_csv(io.StringIO(
+        "system_size_kw,cost_per_watt,electric_bill,lease_eligible,incentives_applied\n"
+        "7.5,3.5,300,,\n"
+        "7.5,3.5,300,no,yes\n"
+    ))
+    args = frame_arguments(leads, PROGRAM)
+    assert args["lease_eligible"].tolist() == [True, False]
+    assert args["incentives_applied"].tolist() == [True, True]
+
+
+def test_state_is_normalized(inputs):
+    leads = pd.DataFrame({**{k: [v, v] for k, v in LEAD.items()}, "state": [" ny", "NY"]})
+    priced = price_frame(leads, PROGRAM)
+    assert priced["npv"].iloc[0] == priced["npv"].iloc[1]
+    expected = price_proposal(replace(inputs, roof_cost=0.0, loan_term=25, loan_apr=4.49, dealer_fee=35.99))
+    assert priced["npv"].iloc[0] == pytest.approx(expected.npv)
+
+
+def test_bad_terms_are_reported_by_row():
+    leads = pd.DataFrame({**{k: [v] * 3 for k, v in LEAD.items()}, "loan_term": [25, 25.9, None]})
+    leads["loan_apr"], leads["dealer_fee"] = 4.49, 35.99
+    with pytest.raises(ValueError, match=r"bad rows: 1 \(25.9\), 2 \(nan\)"):
+        frame_arguments(leads)
+
+
+def test_fractional_program_term_is_rejected():
+    with pytest.raises(ValueError, match="loan_term"):
+        frame_arguments(pd.DataFrame([LEAD]), (25.5, 4.49, 35.99))
+
+
+def test_run_prices_every_chunk(tmp_path):
+    leads = pd.DataFrame({**{k: [v] * 5 for k, v in LEAD.items()}, "electric_bill": [150, 200, 250, 300, 350]})
+    source, target = tmp_path / "leads.csv", tmp_path / "priced.csv"
+    leads.to_csv(source, index=False)
+    assert run(source, target, chunksize=2, workers=0, program=PROGRAM) == 5
+    priced = pd.read_csv(target)
+    expected = price_frame(leads, PROGRAM)
+    assert priced["npv"].tolist() == pytest.approx(expected["npv"].tolist())
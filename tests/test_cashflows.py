@@ -0,0 +1,67 @@
+"""Cash flow columns agree with a month-by-month loop."""
+import numpy as np
+import pytest
+
+from sfd_engine.cashflows import CASH_FLOW_COLUMNS, CashFlowTable, cash_flow_columns
+
+FLOWS = dict(
+    utility_escalation=0.03,
+    degradation=0.005,
+    system_cost=30_000.0,
+    incentives={14: 9_000.0, 26: 5_000.0},
+    loan_payment=180.0,
+    loan_months=120,
+    lease_payment=110.0,
+    lease_escalation=0.028,
+)
+
+
+def _loop(monthly_savings, years):
+    net = [-FLOWS["system_cost"]]
+    for month in range(1, years * 12 + 1):
+        year = (month - 1) // 12
+        flow = monthly_savings * ((1 + FLOWS["utility_escalation"]) * (1 - FLOWS["degradation"])) ** year
+        flow += FLOWS["incentives"].get(month, 0.0)
+        flow -= FLOWS["loan_payment"] if month <= FLOWS["loan_months"] else 0.0
+        flow -= FLOWS["lease_payment"] * (1 + FLOWS["lease_escalation"]) ** year
+        net.append(flow)
+    return np.array(net)
+
+
+def test_columns_match_a_monthly_loop():
+    columns = cash_flow_columns(250.0, 20, **FLOWS)
+    np.testing.assert_allclose(columns["net"], _loop(250.0, 20))
+    np.testing.assert_allclose(columns["cumulative"], np.cumsum(_loop(250.0, 20)))
+    assert list(columns) == list(CASH_FLOW_COLUMNS)
+
+
+def test_only_given_flows_are_columns():
+    columns = cash_flow_columns(100.0, 2)
+    assert list(columns) == ["month", "year", "savings", "net", "cumulative"]
+    assert columns["savings"][0] == 0
+    np.testing.assert_allclose(columns["net"][1:], 100.0)
+
+
+def test_a_schedule_is_laid_out_by_month():
+    schedule = np.arange(24, dtype=float).reshape(2, 12)
+    columns = cash_flow_columns(schedule, 2, utility_escalation=0.1)
+    np.testing.assert_allclose(columns["savings"][1:13], schedule[0])
+    np.testing.assert_allclose(columns["savings"][13:], schedule[1] * 1.1)
+
+
+def test_annual_roll_up():
+    table = CashFlowTable.build(250.0, 20, **FLOWS)
+    monthly = _loop(250.0, 20)
+    assert table.years == 20
+    assert table.annual_net[0] == pytest.approx(monthly[0])
+    np.testing.assert_allclose(table.annual_net[1:], monthly[1:].reshape(20, 12).sum(axis=1))
+    assert table.annual["incentives"].tolist()[:4] == [0.0, 0.0, 9_000.0, 5_000.0]
+    assert len(table.monthly) == 20 * 12 + 1
+
+
+def test_columns_are_read_only():
+    table = CashFlowTable.build(250.0, 5, system_cost=1000.0)
+    with pytest.raises(ValueError):
+        table.net[0] = 0.0
+    with pytest.raises(ValueError):
+        table.annual_net[0] = 0.0
@@ -0,0 +1,63 @@
+"""Cash, loan and lease over a common horizon."""
+from dataclasses import replace
+
+import numpy as np
+import pytest
+
+from sfd_engine import price_proposal
+from sfd_engine.comparison import FINANCING_OPTIONS, SYSTEM_LIFE_YEARS, compare_financing
+
+
+def _brute_force_break_even(cumulative):
+    for month in range(len(cumulative)):
+        if (cumulative[month:] >= 0).all():
+            return month
+    return np.nan
+
+
+def test_short_loan_is_compared_over_the_system_life(inputs):
+    short = replace(inputs, loan_term=10)
+    quote = price_proposal(short)
+    comparison = compare_financing(short, quote)
+    assert comparison.cumulative_net.shape == (3, SYSTEM_LIFE_YEARS * 12 + 1)
+    loan_cost = comparison.cumulative_cost[FINANCING_OPTIONS.index("Loan")]
+    assert loan_cost[-1] == pytest.approx(quote.monthly_payment * 120 - quote.nys_incentive)
+    assert loan_cost[121:].tolist() == [loan_cost[120]] * (len(loan_cost) - 121)
+    assert not hasattr(comparison, "loan_balance")
+
+
+def test_long_loan_extends_the_horizon(inputs):
+    comparison = compare_financing(replace(inputs, loan_term=30))
+    assert comparison.months[-1] == 30 * 12
+
+
+def test_every_option_gets_the_same_savings(inputs):
+    comparison = compare_financing(replace(inputs, loan_term=15, utility_escalation=3.0, degradation=0.5))
+    savings = comparison.cumulative_net + comparison.cumulative_cost
+    np.testing.assert_allclose(savings[0], savings[1])
+    np.testing.assert_allclose(savings[0], savings[2])
+    horizon = price_proposal(replace(inputs, loan_term=25, utility_escalation=3.0, degradation=0.5))
+    assert savings[0, -1] == pytest.approx(horizon.cash_flow_table.columns["savings"].sum())
+
+
+def test_cash_and_lease_costs(inputs):
+    quote = price_proposal(inputs)
+    comparison = compare_financing(inputs, quote)
+    cash, _, lease = comparison.cumulative_cost
+    assert cash[-1] == pytest.approx(quote.discounted_project_cost - quote.nys_incentive)
+    yearly_lease = inputs.lease_base * (1 + inputs.lease_rate) ** np.arange(25) * 12
+    assert lease[-1] == pytest.approx(yearly_lease.sum())
+    assert comparison.monthly_payment.tolist() == [0.0, quote.monthly_payment, inputs.lease_base]
+
+
+def test_break_even_and_npv(inputs):
+    comparison = compare_financing(replace(inputs, loan_term=10), rate=0.06)
+    discount = 1.06 ** (-comparison.months / 12)
+    for row, cumulative in enumerate(comparison.cumulative_net):
+        expected = _brute_force_break_even(cumulative)
+        assert comparison.break_even_month[row] == pytest.approx(expected, nan_ok=True)
+        net = np.diff(cumulative, prepend=0.0)
+        assert comparison.npv[row] == pytest.approx(net @ discount)
+    summary = comparison.summary()
+    assert summary["Option"].tolist() == list(FINANCING_OPTIONS)
+    assert len(comparison.frame()) == 3 * len(comparison.months)
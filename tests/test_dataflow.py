@@ -0,0 +1,92 @@
+"""Dirty propagation, early cutoff and the proposal graph built on them."""
+from dataclasses import replace
+
+import pytest
+
+from sfd_engine import ProposalModel, price_proposal
+from sfd_engine.dataflow import Dataflow
+
+
+def _flow():
+    flow = Dataflow(["a", "b"])
+
+    @flow.node
+    def parity(a):
+        return a % 2
+
+    @flow.node
+    def c(parity):
+        return parity * 10
+
+    @flow.node
+    def d(b):
+        return b + 1
+
+    @flow.node
+    def total(c, d):
+        return c + d
+
+    return flow
+
+
+def _recomputed(evaluator):
+    return [timing.name for timing in evaluator.trace if timing.recomputed]
+
+
+def test_first_get_computes_only_what_it_needs():
+    evaluator = _flow().evaluator()
+    evaluator.set({"a": 1, "b": 2})
+    assert evaluator.get("d") == 3
+    assert _recomputed(evaluator) == ["d"]
+    assert evaluator.dirty == {"parity", "c", "total"}
+    assert evaluator.get("total") == 13
+
+
+def test_set_dirties_only_downstream_nodes():
+    evaluator = _flow().evaluator()
+    evaluator.set({"a": 1, "b": 2})
+    evaluator.get("total")
+    assert evaluator.set({"a": 1, "b": 5}) == ("b",)
+    assert evaluator.dirty == {"d", "total"}
+    assert evaluator.get("total") == 16
+    assert _recomputed(evaluator) == ["d", "total"]
+
+
+def test_unchanged_inputs_dirty_nothing():
+    evaluator = _flow().evaluator()
+    evaluator.set({"a": 1, "b": 2})
+    evaluator.get("total")
+    assert evaluator.set({"a": 1, "b": 2}) == ()
+    assert not evaluator.dirty
+
+
+def test_unchanged_node_cuts_off_its_dependents():
+    evaluator = _flow().evaluator()
+    evaluator.set({"a": 1, "b": 2})
+    evaluator.get("total")
+    evaluator.set({"a": 3})
+    assert evaluator.get("total") == 13
+    assert [(t.name, t.recomputed) for t in evaluator.trace] == [("parity", True), ("c", False), ("total", False)]
+    assert evaluator.recomputed == {"parity": 2, "c": 1, "d": 1, "total": 1}
+
+
+def test_graph_errors():
+    flow = _flow()
+    with pytest.raises(ValueError, match="duplicate"):
+        flow.node(lambda a: a, name="c")
+    with pytest.raises(ValueError, match="undefined"):
+        flow.node(lambda missing: missing, name="e")
+    with pytest.raises(KeyError):
+        flow.evaluator().set({"parity": 1})
+
+
+def test_proposal_model_reuses_the_customer_loan(inputs):
+    model = ProposalModel()
+    model.price(inputs)
+    quote = model.price(replace(inputs, battery_cost=2000))
+    recomputed = {t.name for t in model.trace if t.recomputed}
+    assert {"base_cost", "gross_cost", "battery_credit", "npv"} <= recomputed
+    assert not recomputed & {"monthly_payment", "lease_payments", "loan_amount_customer"}
+    fresh = price_proposal(replace(inputs, battery_cost=2000))
+    for name in ("monthly_payment", "gross_cost", "battery_credit", "npv", "irr"):
+        assert getattr(quote, name) == getattr(fresh, name), name
@@ -0,0 +1,34 @@
+"""The engine prices a proposal without Streamlit."""
+import subprocess
+import sys
+
+import numpy_financial as npf
+import pytest
+
+from sfd_engine import price_proposal
+
+
+def test_engine_imports_without_streamlit():
+    script = "import sys, sfd_engine, sfd_engine.bulk, sfd_engine.proposal; print('streamlit' in sys.modules)"
+    result = subprocess.run([sys.executable, "-c", script], capture_output=True, text=True, check=True)
+    assert result.stdout.strip() == "False"
+
+
+def test_company_figures(inputs):
+    quote = price_proposal(inputs)
+    assert quote.base_cost == pytest.approx(7.5 * 1000 * 3.5)
+    assert quote.gross_cost == pytest.approx(quote.base_cost / (1 - 0.3599))
+    assert quote.company_revenue == pytest.approx(quote.gross_cost - quote.base_cost)
+    assert quote.ny_solar_credit == 5000
+
+
+def test_customer_payment_matches_pmt(inputs):
+    quote = price_proposal(inputs)
+    expected = -npf.pmt(0.0449 / 12, 25 * 12, 7.5 * 1000 * 3.5 + 5000)
+    assert quote.monthly_payment == pytest.approx(expected)
+
+
+def test_payback_label(inputs):
+    quote = price_proposal(inputs)
+    assert quote.years == 25
+    assert quote.payback_label == str(quote.payback_year)
@@ -0,0 +1,40 @@
+"""Monte Carlo risk mode collapses to the deterministic figures without spread."""
+from dataclasses import replace
+
+import numpy as np
+import pytest
+
+from sfd_engine import RiskAssumptions, price_proposal, simulate_risk
+
+# No spread, incentives at install: every path is the same
+FIXED = RiskAssumptions(
+    escalation_mean=0.03,
+    escalation_sd=0.0,
+    degradation_mean=0.005,
+    degradation_sd=0.0,
+    discount_sd=0.0,
+    incentive_delay_years=(0,),
+    incentive_delay_weights=(1.0,),
+)
+
+
+def test_fixed_paths_match_price_proposal(inputs):
+    quote = price_proposal(replace(inputs, utility_escalation=3.0, degradation=0.5))
+    result = simulate_risk(quote, FIXED, paths=100)
+    np.testing.assert_allclose(result.npv, quote.npv, rtol=1e-9)
+    np.testing.assert_allclose(result.irr, quote.irr, rtol=1e-6)
+    assert (result.payback_year == quote.payback_year).all()
+
+
+def test_hourly_quotes_ignore_the_degradation_draw(inputs):
+    quote = price_proposal(replace(inputs, hourly_production=True))
+    low = simulate_risk(quote, replace(FIXED, degradation_mean=0.0), paths=100)
+    high = simulate_risk(quote, replace(FIXED, degradation_mean=0.02), paths=100)
+    np.testing.assert_array_equal(low.npv, high.npv)
+
+
+def test_workers_split_the_paths(inputs):
+    quote = price_proposal(inputs)
+    result = simulate_risk(quote, paths=1_001, workers=2)
+    assert result.paths == 1_001
+    assert result.percentiles().loc["NPV"].is_monotonic_increasing
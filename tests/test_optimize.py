@@ -0,0 +1,60 @@
+"""The program search meets its targets and marks the right frontier."""
+from dataclasses import replace
+
+import numpy as np
+import pytest
+
+from sfd_engine import price_proposal
+from sfd_engine.optimize import SEARCH_COLUMNS, pareto_mask, search_programs
+
+PROGRAMS = [(10, 6.99, 15.0), (20, 5.99, 27.49), (25, 4.49, 35.99)]
+DISCOUNTS = (0, 10, 20)
+
+
+def test_pareto_mask_matches_brute_force():
+    rng = np.random.default_rng(0)
+    payment, revenue = rng.random(200), rng.random(200)
+    dominated = [((payment <= p) & (revenue >= r)).sum() > 1 for p, r in zip(payment, revenue)]
+    assert (pareto_mask(payment, revenue) == ~np.array(dominated)).all()
+
+
+def test_rows_match_price_proposal(inputs):
+    frame = search_programs(inputs, programs=PROGRAMS, discounts=DISCOUNTS)
+    assert tuple(frame.columns) == SEARCH_COLUMNS
+    assert len(frame) == len(PROGRAMS) * len(DISCOUNTS)
+    for row in frame.itertuples(index=False):
+        quote = price_proposal(replace(
+            inputs,
+            loan_term=row.loan_term,
+            loan_apr=row.loan_apr,
+            dealer_fee=row.dealer_fee,
+            project_discount_pct=row.project_discount_pct,
+        ))
+        assert row.monthly_payment == pytest.approx(quote.monthly_payment)
+        assert row.company_revenue == pytest.approx(quote.company_revenue)
+        assert row.npv == pytest.approx(quote.npv)
+
+
+def test_targets_filter_rows(inputs):
+    every = search_programs(inputs, programs=PROGRAMS, discounts=DISCOUNTS)
+    max_payment = every["monthly_payment"].median()
+    min_revenue = every["company_revenue"].median()
+    frame = search_programs(
+        inputs, max_payment=max_payment, min_revenue=min_revenue, programs=PROGRAMS, discounts=DISCOUNTS
+    )
+    expected = every[(every["monthly_payment"] <= max_payment) & (every["company_revenue"] >= min_revenue)]
+    assert len(frame) == len(expected) > 0
+    assert frame["monthly_payment"].is_monotonic_increasing
+
+
+def test_savings_are_bill_savings_less_loan_payments(inputs):
+    frame = search_programs(inputs, programs=PROGRAMS, discounts=(0,))
+    for row in frame.itertuples(index=False):
+        expected = 300 * 12 * 25 - row.monthly_payment * row.loan_term * 12
+        assert row.savings_25yr == pytest.approx(expected)
+
+
+def test_no_program_meets_impossible_targets(inputs):
+    frame = search_programs(inputs, max_payment=1.0, programs=PROGRAMS, discounts=DISCOUNTS)
+    assert frame.empty
+    assert tuple(frame.columns) == SEARCH_COLUMNS
@@ -0,0 +1,68 @@
+"""The PDF writer and the server-side Investment Overview."""
+import datetime
+import re
+
+import pandas as pd
+import pytest
+
+from sfd_engine import investment_overview
+from sfd_engine.pdf import Field, PageLayout, build_pdf, text_width, wrap_text
+from sfd_engine.proposal import proposal_filename, render_batch, render_overview_pdf
+
+DATE = datetime.date(2026, 4, 1)
+
+
+def _objects(pdf: bytes) -> dict[int, int]:
+    return {int(m.group(1)): m.start() for m in re.finditer(rb"(\d+) 0 obj\n", pdf)}
+
+
+def test_text_width_uses_the_font_metrics():
+    assert text_width("ii", size=10) == pytest.approx(2 * 222 * 10 / 1000)
+    assert text_width("ii", "bold", 10) == pytest.approx(2 * 278 * 10 / 1000)
+
+
+def test_wrap_text_fits_the_width():
+    text = "Solar savings grow with the utility rate every single year of the loan term"
+    lines = wrap_text(text, 100)
+    assert " ".join(lines) == text
+    assert all(text_width(line) <= 100 for line in lines)
+
+
+def test_xref_points_at_each_object():
+    layout = PageLayout()
+    layout.text(72, 72, "Fixed (text)")
+    layout.text(72, 90, Field("name"))
+    page = layout.compile()
+    pdf = build_pdf([page.render({"name": "Jane"}), page.render({"name": "John"})], title="Test")
+    startxref = int(pdf.rsplit(b"startxref\n", 1)[1].split(b"\n")[0])
+    entries = pdf[startxref:].split(b"\n")[3:]
+    offsets = _objects(pdf)
+    assert [int(entry[:10]) for entry in entries[:len(offsets)]] == [offsets[n] for n in sorted(offsets)]
+    assert b"/Count 2" in pdf
+    assert b"(Fixed \\(text\\)) Tj" in pdf
+
+
+def test_overview_pdf_shows_the_customer(inputs):
+    pdf = render_overview_pdf(inputs, "Jane Doe", DATE)
+    assert pdf.startswith(b"%PDF-1.4") and pdf.endswith(b"%%EOF\n")
+    assert b"(Investment Overview prepared for Jane Doe on Apr 01, 2026) Tj" in pdf
+    payment = investment_overview(inputs).payment_after_incentives
+    assert f"(${payment:,.0f}/mo) Tj".encode() in pdf
+
+
+def test_proposal_filename():
+    assert proposal_filename(42, "Jane  O'Doe") == "00042_jane-o-doe.pdf"
+    assert proposal_filename(7, "") == "00007.pdf"
+
+
+def test_render_batch_writes_one_pdf_per_lead(tmp_path):
+    leads = pd.DataFrame({
+        "customer_name": ["Jane Doe", None, "John Roe"],
+        "system_size_kw": 7.5,
+        "cost_per_watt": 3.5,
+        "electric_bill": [200, 250, 300],
+    })
+    leads.to_csv(tmp_path / "leads.csv", index=False)
+    out = tmp_path / "proposals"
+    assert render_batch(tmp_path / "leads.csv", out, chunksize=2, workers=0, program=(25, 4.49, 35.99), date=DATE) == 3
+    assert sorted(p.name for p in out.iterdir()) == ["00000_jane-doe.pdf", "00001.pdf", "00002_john-roe.pdf"]
@@ -0,0 +1,53 @@
+"""The hourly production model and the savings it feeds."""
+from dataclasses import replace
+
+import numpy as np
+import pytest
+
+from sfd_engine import price_proposal
+from sfd_engine.production import (
+    HOURS_PER_YEAR,
+    hourly_production,
+    hourly_production_by_year,
+    monthly_production,
+)
+
+
+def test_typical_year_is_plausible():
+    hourly = hourly_production(1.0)
+    assert hourly.shape == (HOURS_PER_YEAR,)
+    assert (hourly >= 0).all()
+    by_hour = hourly.reshape(365, 24).sum(axis=0)
+    assert by_hour[:4].sum() == by_hour[21:].sum() == 0
+    assert by_hour.argmax() in (11, 12, 13)
+    # NYC panels yield roughly 1,100-1,400 kWh per kW a year
+    assert 1100 < hourly.sum() < 1400
+
+
+def test_output_scales_with_size_and_prefers_south():
+    assert hourly_production(7.5).sum() == pytest.approx(7.5 * hourly_production(1.0).sum())
+    assert hourly_production(1.0, azimuth=180).sum() > hourly_production(1.0, azimuth=0).sum()
+
+
+def test_monthly_rolls_up_hourly_and_degrades():
+    monthly = monthly_production(7.5, 3, degradation=0.01)
+    hourly = hourly_production_by_year(7.5, 3, degradation=0.01)
+    assert monthly.shape == (3, 12)
+    np.testing.assert_allclose(monthly.sum(axis=1), hourly.sum(axis=1))
+    np.testing.assert_allclose(monthly[2], monthly[0] * 0.99 ** 2)
+    assert monthly[0, 6] > monthly[0, 0]
+
+
+def test_unknown_state_is_rejected():
+    with pytest.raises(ValueError, match="no weather data"):
+        hourly_production(1.0, "CA")
+
+
+def test_hourly_savings_follow_the_degradation_input(inputs):
+    hourly = replace(inputs, hourly_production=True)
+    undegraded = price_proposal(hourly)
+    degraded = price_proposal(replace(hourly, degradation=0.5))
+    np.testing.assert_allclose(undegraded.production_kwh[1], undegraded.production_kwh[0])
+    np.testing.assert_allclose(degraded.production_kwh[1], degraded.production_kwh[0] * 0.995)
+    assert degraded.npv < undegraded.npv
+    assert price_proposal(inputs).production_kwh is None
@@ -0,0 +1,62 @@
+"""Event-driven loan simulation against a plain month-by-month loop."""
+import numpy as np
+import numpy_financial as npf
+import pytest
+
+from sfd_engine import MIN_PAYDOWN, simulate_loan
+
+
+def _reference(principal, rate, nper, paydowns=(), deferral_months=0, min_paydown=MIN_PAYDOWN):
+    events = {}
+    for month, amount in paydowns:
+        events[month] = events.get(month, 0.0) + amount
+    balance, pending = principal, 0.0
+    level = 0.0 if deferral_months else -npf.pmt(rate, nper, principal)
+    rows = []
+    for month in range(1, nper + 1):
+        interest = balance * rate
+        balance = balance + interest - level
+        paid = level
+        reamortize = month == deferral_months
+        applied = 0.0
+        if month in events:
+            pending += events[month]
+            if pending >= min_paydown and balance > 0:
+                applied = min(pending, balance)
+                balance -= applied
+                pending = 0.0
+                reamortize = True
+        if reamortize:
+            remaining = nper - month
+            level = -npf.pmt(rate, remaining, balance) if remaining > 0 else 0.0
+        rows.append((paid, interest, applied, balance))
+    return np.array(rows).T
+
+
+@pytest.mark.parametrize(
+    "paydowns, deferral_months",
+    [
+        ((), 0),
+        ((), 3),
+        (((18, 12_000.0),), 0),
+        (((18, 12_000.0), (18, 5_000.0), (24, 1_000.0), (36, 1_000.0), (48, 1_000.0)), 3),
+        (((24, 1_000.0), (36, 2_000.0)), 0),  # first paydown is carried into the second
+    ],
+)
+def test_simulate_loan_matches_monthly_loop(paydowns, deferral_months):
+    principal, rate, nper = 40_000.0, 0.0599 / 12, 300
+    loan = simulate_loan(principal, rate, nper, paydowns, deferral_months=deferral_months)
+    paid, interest, applied, balance = _reference(principal, rate, nper, paydowns, deferral_months)
+    np.testing.assert_allclose(loan["payment"], paid, rtol=1e-9, atol=1e-8)
+    np.testing.assert_allclose(loan["interest"], interest, rtol=1e-9, atol=1e-8)
+    np.testing.assert_allclose(loan["paydown"], applied, atol=1e-8)
+    np.testing.assert_allclose(loan["balance"][:-1], balance[:-1], rtol=1e-9, atol=1e-6)
+    assert loan["balance"][-1] == 0.0 and abs(balance[-1]) < 1e-6
+
+
+def test_simulate_loan_broadcasts_paydown_amounts():
+    amounts = np.array([1_000.0, 12_000.0])
+    loans = simulate_loan(40_000.0, 0.0599 / 12, 300, [(18, amounts)])
+    for row, amount in enumerate(amounts):
+        single = simulate_loan(40_000.0, 0.0599 / 12, 300, [(18, amount)])
+        np.testing.assert_allclose(loans["payment"][row], single["payment"])
@@ -0,0 +1,50 @@
+"""The sensitivity sweeps agree with price_proposal."""
+import math
+from dataclasses import replace
+
+import pytest
+
+from sfd_engine import price_proposal, sensitivity_grid, tornado
+
+
+def _same(actual, expected):
+    if expected is None or (isinstance(expected, float) and math.isnan(expected)):
+        return math.isnan(actual)
+    return actual == pytest.approx(expected, rel=1e-9, abs=1e-6)
+
+
+def test_tornado_rows_match_price_proposal(inputs):
+    frame = tornado(inputs).set_index("input")
+    base = price_proposal(inputs)
+    assert frame["npv_base"].eq(base.npv).all()
+    for name in ("dealer_fee", "cost_per_watt", "utility_escalation"):
+        for end in ("low", "high"):
+            quote = price_proposal(replace(inputs, **{name: frame.at[name, f"{end}_value"]}))
+            assert _same(frame.at[name, f"npv_{end}"], quote.npv), (name, end)
+
+
+def test_sensitivity_grid_matches_price_proposal(inputs):
+    grid = sensitivity_grid(inputs, "project_discount_pct", "dealer_fee", points=3)
+    assert len(grid) == 9
+    for row in grid.itertuples(index=False):
+        quote = price_proposal(replace(inputs, project_discount_pct=row.project_discount_pct, dealer_fee=row.dealer_fee))
+        assert _same(row.company_revenue, quote.company_revenue)
+
+
+def test_sensitivity_grid_needs_two_inputs(inputs):
+    with pytest.raises(ValueError):
+        sensitivity_grid(inputs, "dealer_fee", "dealer_fee")
+
+
+@pytest.mark.parametrize("include_incentives", [True, False])
+def test_tornado_flips_incentives_off_low_and_on_high(inputs, include_incentives):
+    proposal = replace(inputs, include_incentives=include_incentives)
+    row = tornado(proposal).set_index("input").loc["include_incentives"]
+    assert _same(row["npv_low"], price_proposal(replace(proposal, include_incentives=False)).npv)
+    assert _same(row["npv_high"], price_proposal(replace(proposal, include_incentives=True)).npv)
+
+
+def test_tornado_puts_the_widest_swing_first(inputs):
+    frame = tornado(inputs, metrics=("company_revenue", "npv"))
+    assert frame["company_revenue_swing"].is_monotonic_decreasing
+    assert {"npv_low", "npv_high"} <= set(frame.columns)
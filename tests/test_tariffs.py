@@ -0,0 +1,96 @@
+"""Tariff compilation, billing and net-metering settlement."""
+import numpy as np
+import pytest
+
+from sfd_engine.production import hourly_production_by_year
+from sfd_engine.tariffs import (
+    MONTH_STARTS,
+    compile_tariff,
+    hourly_load,
+    load_shape,
+    load_tariffs,
+    solar_savings,
+    tariff_for,
+    tariff_keys,
+)
+
+TARIFFS = list(load_tariffs()["tariffs"])
+CHARGES = np.array([-10.0, 4, 3, -2, 0, 1, 1, 1, 1, 1, 1, -8])
+
+
+def test_load_shape_sums_to_one():
+    shape = load_shape()
+    assert shape.shape == (8760,)
+    assert (shape > 0).all()
+    assert shape.sum() == pytest.approx(1.0)
+
+
+@pytest.mark.parametrize("key", TARIFFS)
+def test_usage_bills_the_customer_average(key):
+    tariff = compile_tariff(key)
+    bills = np.array([80.0, 300.0, 900.0])
+    monthly = tariff.monthly_bills(hourly_load(bills, tariff))
+    np.testing.assert_allclose(monthly.mean(axis=-1), bills)
+
+
+def test_flat_and_tiered_energy_charges():
+    tariff = compile_tariff("coned_sc1")
+    load = np.full(8760, 1.0)
+    charges = tariff.energy_charges(load)
+    hours = np.diff(np.append(MONTH_STARTS, 8760))
+    assert charges[0] == pytest.approx(hours[0] * 0.255)
+    # July: every kWh at the summer rate, plus the adder above 250 kWh
+    assert charges[6] == pytest.approx(hours[6] * 0.29 + (hours[6] - 250) * 0.02)
+
+
+def test_time_of_use_prices_weekday_peaks():
+    tariff = compile_tariff("coned_sc1_tou")
+    # 2023-01-02 was a Monday, 2023-01-01 a Sunday
+    monday_noon, sunday_noon, monday_night = 24 + 12, 12, 24 + 3
+    assert tariff.import_rate[monday_noon] == 0.28
+    assert tariff.import_rate[sunday_noon] == tariff.import_rate[monday_night] == 0.165
+
+
+def test_exports_earn_the_retail_rate():
+    tariff = compile_tariff("coned_sc1")
+    production = np.zeros(8760)
+    production[12] = 5.0
+    assert tariff.energy_charges(0.0, production)[0] == pytest.approx(-5 * 0.255)
+
+
+def test_credit_carries_forward_and_trues_up():
+    due = compile_tariff("pseg_rs").settle(CHARGES)
+    np.testing.assert_allclose(due, [0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 1, -8 * 0.25])
+
+
+def test_credit_carries_into_the_next_year_without_a_true_up():
+    charges = np.stack([CHARGES, np.ones(12)])
+    due = compile_tariff("coned_sc1").settle(charges, consecutive_years=True)
+    np.testing.assert_allclose(due[0, -1], 0)
+    np.testing.assert_allclose(due[1], [0] * 8 + [1] * 4)
+    # Billed independently, each year starts with an empty bank
+    np.testing.assert_allclose(compile_tariff("coned_sc1").settle(charges)[1], np.ones(12))
+
+
+def test_billing_is_vectorized():
+    tariff = compile_tariff("pseg_rs_tou")
+    loads = hourly_load(np.array([150.0, 400.0]), tariff)
+    production = hourly_production_by_year(7.5, 1, "NJ")[0]
+    together = tariff.monthly_bills(loads, production)
+    for row, load in zip(together, loads):
+        np.testing.assert_allclose(row, tariff.monthly_bills(load, production))
+
+
+def test_savings_are_positive_and_default_per_state():
+    production = hourly_production_by_year(7.5, 2)
+    savings = solar_savings(300.0, production, tariff_for("NY"))
+    assert savings.shape == (2, 12)
+    assert (savings > 0).all()
+    assert tariff_for("NJ").key == tariff_keys("NJ")[0] == "pseg_rs"
+
+
+def test_unknown_tariffs_are_rejected():
+    with pytest.raises(ValueError, match="unknown tariff"):
+        compile_tariff("nope")
+    with pytest.raises(ValueError, match="no default tariff"):
+        tariff_for("CA")
@@ -0,0 +1,54 @@
+"""Precompiled templates render the same text as filling the markers in by hand."""
+import datetime
+import html
+
+from sfd_engine import investment_overview
+from sfd_engine.proposal import OVERVIEW_HTML, overview_fields
+from sfd_engine.templating import IncrementalRenderer, Template
+
+TEXT = "<p>{{ name }} owes {{amount}}</p><p>Dear {{ name }}</p>"
+
+
+def test_parse_splits_chunks_and_slots():
+    template = Template.parse(TEXT)
+    assert template.slots == ("name", "amount", "name")
+    assert template.fields == ("name", "amount")
+    assert len(template.chunks) == len(template.slots) + 1
+
+
+def test_render_escapes_every_field():
+    rendered = Template.parse(TEXT).render({"name": "<Jo & Al>", "amount": "$5"})
+    assert rendered == "<p>&lt;Jo &amp; Al&gt; owes $5</p><p>Dear &lt;Jo &amp; Al&gt;</p>"
+
+
+def test_incremental_renderer_matches_a_full_render():
+    template = Template.parse(TEXT)
+    renderer = IncrementalRenderer(template)
+    for values in (
+        {"name": "Jane", "amount": "$5"},
+        {"name": "Jane", "amount": "$7"},
+        {"name": "<Jo>", "amount": "$7"},
+        {"name": "Jane", "amount": "$5"},
+    ):
+        assert renderer.render(values) == template.render(values)
+
+
+def test_incremental_renderer_escapes_only_changed_fields():
+    escaped = []
+
+    def escape(text):
+        escaped.append(text)
+        return html.escape(text)
+
+    renderer = IncrementalRenderer(Template.parse(TEXT), escape)
+    renderer.render({"name": "Jane", "amount": "$5"})
+    renderer.render({"name": "Jane", "amount": "$7"})
+    assert escaped == ["Jane", "$5", "$7"]
+
+
+def test_overview_template_fills_every_marker(inputs):
+    fields = overview_fields(inputs, investment_overview(inputs), "Jane Doe", datetime.date(2026, 4, 1))
+    assert set(OVERVIEW_HTML.fields) <= set(fields)
+    rendered = OVERVIEW_HTML.render(fields)
+    assert "{{" not in rendered
+    assert "Jane Doe" in rendered and "Apr 01, 2026" in rendered
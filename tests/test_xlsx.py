@@ -0,0 +1,29 @@
+"""The streaming XLSX writer produces well-formed, uniquely named sheets."""
+import io
+import zipfile
+from xml.dom import minidom
+
+import pandas as pd
+
+from sfd_engine.xlsx import sheet_names, write_workbook
+
+
+def test_sheet_names_are_unique_within_the_limit():
+    names = sheet_names(["a" * 40, "a" * 35, "A" * 31, "cash/flow", ""])
+    assert len({name.lower() for name in names}) == len(names)
+    assert all(len(name) <= 31 for name in names)
+    assert names[3] == "cash_flow" and names[4] == "Sheet"
+
+
+def test_workbook_parts_are_well_formed_xml():
+    out = io.BytesIO()
+    write_workbook(out, {
+        "a" * 40: pd.DataFrame({"text": ["ok\x01\x1f", 'q"&<'], "value": [1.5, float("nan")]}),
+        "a" * 35: pd.DataFrame({"flag": [True, False]}),
+    }, chunk_rows=1)
+    with zipfile.ZipFile(out) as book:
+        for name in book.namelist():
+            minidom.parseString(book.read(name))
+        workbook = minidom.parseString(book.read("xl/workbook.xml"))
+    sheets = [sheet.getAttribute("name") for sheet in workbook.getElementsByTagName("sheet")]
+    assert len(set(sheets)) == 2